@@ -0,0 +1,21 @@
+# data_pending_agent.py
+
+from app.graph.router import missing_cache_keys
+
+PLOT_LOADING_MESSAGE = "Plot data still loading. Please wait..."
+
+
+async def data_pending_agent(state: dict) -> dict:
+    """
+    Short-circuits a question whose cached data is still being fetched
+    by /initialize-plot. Other questions on the same plot keep working.
+    """
+
+    state["analysis"] = {
+        "pending": {
+            "missing_keys": missing_cache_keys(state)
+        }
+    }
+    state["final_response"] = PLOT_LOADING_MESSAGE
+
+    return state
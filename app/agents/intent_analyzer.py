@@ -2,13 +2,38 @@
 from app.prompts.intent_prompt import INTENT_PROMPT
 from app.utils.json_utils import safe_json
 from app.prompts.base_system_prompt import BASE_SYSTEM_PROMPT
-from app.config import llm
-from app.utils.lang_detect import detect_lang
+from app.config import ainvoke_llm
+from app.utils.lang_detect import adetect_lang
+from app.services.intent_classifier import classify_intent, maybe_shadow_check, record_llm_answer
+
+
+async def _llm_intent(user_message: str, history_text: str):
+    """(intent, entities) extracted by the LLM"""
+    prompt = ( BASE_SYSTEM_PROMPT +"Conversation history:\n" + history_text  + INTENT_PROMPT ).format(user_message=user_message)
+
+    response = await ainvoke_llm(prompt)
+
+    # Handle different response formats
+    content = ""
+    if hasattr(response, 'content'):
+        content = response.content
+    elif hasattr(response, 'text'):
+        content = response.text
+    elif isinstance(response, str):
+        content = response
+    else:
+        content = str(response)
+
+    print("RAW LLM RESPONSE:", content)
+
+    result = safe_json(content)
+    return result.get("intent"), result.get("entities")
+
+
+async def intent_analyzer(state: dict) -> dict:
 
-def intent_analyzer(state: dict) -> dict:
-    
     user_message = state.get("user_message", "")
-    state["user_language"] = detect_lang(user_message)
+    state["user_language"] = await adetect_lang(user_message)
     history = state.get("short_memory", []) or []
 
     # Build conversation context
@@ -20,31 +45,21 @@ def intent_analyzer(state: dict) -> dict:
         if h.get("intent"):
             last_intent = h["intent"]
 
-    prompt = ( BASE_SYSTEM_PROMPT +"Conversation history:\n" + history_text  + INTENT_PROMPT ).format(user_message=user_message)
-    
-    
+    # Routine messages are classified locally; the LLM decides the rest
+    fast = await classify_intent(user_message, history)
+    if fast["source"] != "llm":
+        print(f"INTENT ({fast['source']}):", fast["intent"], fast["entities"])
+        state["intent"] = fast["intent"]
+        state["entities"] = fast["entities"]
+        maybe_shadow_check(fast, lambda: _llm_intent(user_message, history_text))
+        return state
+
     try:
-        response = llm.invoke(prompt)
-        
-        # Handle different response formats
-        content = ""
-        if hasattr(response, 'content'):
-            content = response.content
-        elif hasattr(response, 'text'):
-            content = response.text
-        elif isinstance(response, str):
-            content = response
-        else:
-            content = str(response)
-            
-        print("RAW LLM RESPONSE:", content)
-
-        result = safe_json(content)        
-        intent = result.get("intent")
-        entities = result.get("entities")
+        intent, entities = await _llm_intent(user_message, history_text)
+        record_llm_answer(fast, intent, entities)
 
         if not intent:
-            intent = last_intent  
+            intent = last_intent
 
         state["intent"] = intent
         state["entities"] = entities if isinstance(entities, dict) else {}
@@ -55,4 +70,4 @@ def intent_analyzer(state: dict) -> dict:
         state["intent"] = last_intent  # reuse previous intent
         state["entities"] = {}
 
-    return state
\ No newline at end of file
+    return state
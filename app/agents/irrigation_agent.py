@@ -58,7 +58,9 @@ async def irrigation_agent(state: dict) -> dict:
 
     if query_type == "7_day_schedule" and plot_id:
         schedule = IrrigationSchedule(auth_token)
-        analysis["irrigation"]["schedule_7_day"] = await schedule.build( plot_id, lat, lon, cached)
+        analysis["irrigation"]["schedule_7_day"] = await schedule.build(
+            plot_id, lat, lon, cached, farm_context=state.get("farm_context")
+        )
 
     else:
         status = IrrigationStatus(auth_token)
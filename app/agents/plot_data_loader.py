@@ -0,0 +1,25 @@
+# plot_data_loader.py
+
+from app.graph.router import select_agent, required_cache_keys, missing_cache_keys
+from app.memory.redis_manager import redis_manager
+
+
+async def plot_data_loader(state: dict) -> dict:
+    """
+    Loads into context["cached_data"] only the plot sources the routed
+    agent declares (one HMGET), instead of the whole plot aggregate.
+    """
+
+    context = state.get("context") or {}
+
+    if context.get("cached_data") is not None or missing_cache_keys(state):
+        return state
+
+    agent = select_agent(state.get("intent", ""))
+    query_type = (state.get("entities") or {}).get("query_type")
+    keys = required_cache_keys(agent, query_type)
+
+    context["cached_data"] = await redis_manager.get_plot_fields(context.get("plot_id"), keys)
+    state["context"] = context
+
+    return state
@@ -1,6 +1,6 @@
 # response_generator.py
-from app.config import llm
-import json
+from app.config import ainvoke_llm, astream_llm
+from app.utils.prompt_budget import compact_json, fit_analysis, project_context, record_prompt
 from app.prompts.base_system_prompt import BASE_SYSTEM_PROMPT   #globle
 from app.prompts.response_prompt import RESPONSE_PROMPT         #globle
 
@@ -43,7 +43,7 @@ def _select_domain_prompt(intent: str) -> str:
  
     return ""
 
-def response_generator(state: dict) -> dict:
+def build_response_prompt(state: dict) -> str:
     
     intent = state.get("intent", "")
     language = state.get("user_language", "en")
@@ -59,22 +59,22 @@ def response_generator(state: dict) -> dict:
     # print("MEMORY TEXT", memory_text)
 
     analysis_str = "No analysis data available"
+    trimmed = False
     if analysis:
         try:
             if isinstance(analysis, dict):
-                analysis_str = json.dumps(analysis, indent=2, ensure_ascii=False)
+                analysis_str, trimmed = fit_analysis(analysis)
             else:
                 analysis_str = str(analysis)
         except Exception:
             analysis_str = str(analysis)
     
 
+    # only whitelisted farm fields; cached_data stays out of the prompt
     context_str = "No context available"
-    if context:
-        try:
-            context_str = json.dumps(context, indent=2, ensure_ascii=False)
-        except Exception:
-            context_str = str(context)
+    projected = project_context(context)
+    if projected:
+        context_str = compact_json(projected)
     
     domain_prompt = _select_domain_prompt(intent)
 
@@ -86,7 +86,36 @@ def response_generator(state: dict) -> dict:
         user_message=user_message
     )
 
-    response = llm.invoke(prompt)
+    record_prompt(intent, prompt, trimmed)
+    return prompt
+
+
+async def response_generator(state: dict) -> dict:
+
+    prompt = build_response_prompt(state)
+
+    if state.get("stream"):
+        # /chat/stream generates the answer itself, token by token
+        state["response_prompt"] = prompt
+        return state
+
+    response = await ainvoke_llm(prompt)
 
     state["final_response"] = response.content.strip()
     return state
+
+
+async def stream_response(state: dict):
+    """
+    Text chunks of the answer for a graph run with state["stream"] set.
+    Agents that answer without the LLM (data_pending) yield their
+    final_response in one piece.
+    """
+    prompt = state.get("response_prompt")
+    if not prompt:
+        if state.get("final_response"):
+            yield state["final_response"]
+        return
+
+    async for text in astream_llm(prompt):
+        yield text
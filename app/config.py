@@ -1,10 +1,12 @@
 # from langchain_ollama import ChatOllama
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+import asyncio
 import os
 from dotenv import load_dotenv
 import warnings
 
+from app.utils.lazy import LazyResource, timed_import
+
 load_dotenv()
 
 # llm = ChatOllama(
@@ -16,8 +18,108 @@ load_dotenv()
 # Validate API key before initializing LLM
 gemini_api_key = os.getenv("GEMINI_API_KEY")
 
-llm = ChatGoogleGenerativeAI(
-    model=os.getenv("GEMINI_MODEL", "gemini-2.5-flash"),
-    api_key=gemini_api_key,
-    temperature=float(os.getenv("GEMINI_TEMPERATURE", 0))
-)
\ No newline at end of file
+# concurrent Gemini calls per worker, and the budget for one call (seconds)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 30))
+
+
+def _build_llm():
+    # langchain_google_genai (and the google SDKs behind it) load on first use
+    genai = timed_import("langchain_google_genai")
+    return genai.ChatGoogleGenerativeAI(
+        model=os.getenv("GEMINI_MODEL", "gemini-2.5-flash"),
+        api_key=gemini_api_key,
+        temperature=float(os.getenv("GEMINI_TEMPERATURE", 0))
+    )
+
+
+llm_resource = LazyResource("llm", _build_llm)
+
+
+def get_llm():
+    return llm_resource.get()
+
+
+_llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+llm_stats = {"calls": 0, "timeouts": 0, "waiting": 0}
+
+
+async def ainvoke_llm(prompt, timeout: float = LLM_TIMEOUT):
+    """
+    llm.ainvoke without blocking the event loop: at most LLM_MAX_CONCURRENCY
+    calls in flight per worker, each cut off after `timeout` seconds
+    (raises asyncio.TimeoutError). Time spent waiting for a slot counts
+    towards the timeout.
+    """
+    await llm_resource.warm()
+    llm = llm_resource.get()
+
+    async def call():
+        llm_stats["waiting"] += 1
+        try:
+            await _llm_semaphore.acquire()
+        finally:
+            llm_stats["waiting"] -= 1
+        try:
+            llm_stats["calls"] += 1
+            return await llm.ainvoke(prompt)
+        finally:
+            _llm_semaphore.release()
+
+    try:
+        return await asyncio.wait_for(call(), timeout)
+    except asyncio.TimeoutError:
+        llm_stats["timeouts"] += 1
+        raise
+
+
+def _chunk_text(chunk) -> str:
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        # content parts: plain strings or {"type": "text", "text": ...}
+        return "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for part in content
+            if isinstance(part, (str, dict))
+        )
+    return str(content or "")
+
+
+async def astream_llm(prompt, timeout: float = LLM_TIMEOUT):
+    """
+    Text chunks from llm.astream, under the same concurrency limit as
+    ainvoke_llm. `timeout` bounds the wait for a slot and the gap between
+    two chunks, not the whole answer.
+    """
+    await llm_resource.warm()
+    llm = llm_resource.get()
+
+    llm_stats["waiting"] += 1
+    try:
+        await asyncio.wait_for(_llm_semaphore.acquire(), timeout)
+    except asyncio.TimeoutError:
+        llm_stats["timeouts"] += 1
+        raise
+    finally:
+        llm_stats["waiting"] -= 1
+
+    stream = llm.astream(prompt)
+    try:
+        llm_stats["calls"] += 1
+        while True:
+            try:
+                chunk = await asyncio.wait_for(stream.__anext__(), timeout)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                llm_stats["timeouts"] += 1
+                raise
+
+            text = _chunk_text(chunk)
+            if text:
+                yield text
+    finally:
+        _llm_semaphore.release()
+        await stream.aclose()
@@ -144,13 +144,15 @@ class IrrigationSchedule:
     # BUILD SCHEDULE
     # =====================================================
 
-    async def build(self, plot_id: str, lat, lon, cached):
+    async def build(self, plot_id: str, lat, lon, cached, farm_context=None):
 
         # ✅ SINGLE SOURCE OF TRUTH FOR KC
-        farm_context = await get_farm_context(
-            plot_name=plot_id,
-            auth_token=self.auth_token
-        )
+        # (reuses the turn's farm context when the caller already has it)
+        if not farm_context or farm_context.get("error"):
+            farm_context = await get_farm_context(
+                plot_name=plot_id,
+                auth_token=self.auth_token
+            )
 
         # if kc is missing, raise error
         if farm_context.get("error"):
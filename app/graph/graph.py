@@ -16,12 +16,15 @@ from app.agents.fertilizer_agent import fertilizer_agent
 from app.agents.dashboard_agent import dashboard_agent
 
 from app.agents.response_generator import response_generator
+from app.agents.data_pending_agent import data_pending_agent
+from app.agents.plot_data_loader import plot_data_loader
 
 def build_graph():
     graph = StateGraph(GraphState)
 
     # graph.add_node("language_detector", language_detector)
     graph.add_node("intent_analyzer", intent_analyzer)
+    graph.add_node("plot_data_loader", plot_data_loader)
 
     graph.add_node("soil_analysis_agent", soil_analysis_agent)
     graph.add_node("soil_moisture_agent", soil_moisture_agent)
@@ -32,6 +35,7 @@ def build_graph():
     graph.add_node("fertilizer_agent", fertilizer_agent)
     graph.add_node("dashboard_agent", dashboard_agent)
     graph.add_node("response_generator", response_generator)
+    graph.add_node("data_pending", data_pending_agent)
 
 
     # Set entry point
@@ -39,9 +43,10 @@ def build_graph():
 
     # graph.add_edge("language_detector", "intent_analyzer")
     graph.set_entry_point("intent_analyzer")
+    graph.add_edge("intent_analyzer", "plot_data_loader")
     
     graph.add_conditional_edges(
-        "intent_analyzer",
+        "plot_data_loader",
         router,
         {
             "soil_analysis_agent": "soil_analysis_agent",
@@ -52,7 +57,8 @@ def build_graph():
             "irrigation_agent": "irrigation_agent",
             "fertilizer_agent": "fertilizer_agent",
             "dashboard_agent": "dashboard_agent",
-            "response_generator": "response_generator"
+            "response_generator": "response_generator",
+            "data_pending": "data_pending"
         }
     )
     
@@ -65,5 +71,6 @@ def build_graph():
     graph.add_edge("fertilizer_agent", "response_generator")
     graph.add_edge("dashboard_agent", "response_generator")
     graph.add_edge("response_generator", END)
+    graph.add_edge("data_pending", END)
 
     return graph.compile()
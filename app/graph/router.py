@@ -31,15 +31,83 @@ DASHBOARD_INTENTS = {
     "biomass_check"
 }
 
+# Cached plot keys (context["cached_data"]) each agent reads
+AGENT_CACHE_KEYS = {
+    "soil_analysis_agent": ("soil_analysis", "npk_requirements"),
+    "soil_moisture_agent": ("soil_moisture_timeseries",),
+    "weather_agent": ("current_weather", "weather_forecast"),
+    "map_agent": (),
+    "pest_agent": ("current_weather", "pest_detection"),
+    "irrigation_agent": ("current_weather", "weather_forecast", "et", "soil_moisture_timeseries"),
+    "fertilizer_agent": ("npk_requirements",),
+    "dashboard_agent": (),
+    "response_generator": (),
+}
+
+# Agents that only need the key(s) matching entities.query_type
+QUERY_TYPE_CACHE_KEYS = {
+    "map_agent": {
+        "soil_moisture_map": ("soil_moisture_map",),
+        "water_uptake_map": ("water_uptake_map",),
+        "pest_map": ("pest_map",),
+        "growth_map": ("growth_map",),
+    },
+    "dashboard_agent": {
+        "crop_status_check": ("harvest", "agro"),
+        "biomass_check": ("agro",),
+        "yield_info": ("agro",),
+        "sugar_content_check": ("agro",),
+        "stress_check": ("stress",),
+    },
+    "fertilizer_agent": {
+        "video_request": (),
+        "video_resources": (),
+    },
+}
+
+
+def required_cache_keys(agent: str, query_type=None) -> tuple:
+    by_type = QUERY_TYPE_CACHE_KEYS.get(agent, {})
+    if query_type in by_type:
+        return by_type[query_type]
+    return AGENT_CACHE_KEYS.get(agent, ())
+
+
+def missing_cache_keys(state: dict) -> list:
+    """
+    Keys the routed agent needs that the plot initialization has not
+    produced yet. context["ready_keys"] is None once the plot is ready.
+    """
+    context = state.get("context") or {}
+    ready_keys = context.get("ready_keys")
+
+    if ready_keys is None:
+        return []
+
+    agent = select_agent(state.get("intent", ""))
+    query_type = (state.get("entities") or {}).get("query_type")
+
+    return [k for k in required_cache_keys(agent, query_type) if k not in ready_keys]
+
+
 def router(state: dict) -> str:
     """
     Decide next agent based on intent only.
     Chatbot-first routing (no forced context).
+    Plots still initializing are answered as soon as the agent's own keys are in.
     """
 
     intent = state.get("intent", "")
     print("🧭 ROUTER intent =", intent)
 
+    if missing_cache_keys(state):
+        return "data_pending"
+
+    return select_agent(intent)
+
+
+def select_agent(intent: str) -> str:
+
     if intent in MAP_INTENTS:
         return "map_agent"
         
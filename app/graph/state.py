@@ -7,8 +7,11 @@ class GraphState(TypedDict):
     intent: Optional[str]
     entities: Dict[str, Any]
     context: Optional[Dict[str, Any]]  
+    farm_context: Optional[Dict[str, Any]]  # built once per turn, reused by agents
     analysis: Optional[Dict[str, Any]]  # Agent analysis results
     user_id: Optional[int]  
     auth_token: Optional[str]  
     final_response: Optional[str]
+    stream: Optional[bool]  # set by /chat/stream: response_generator only builds the prompt
+    response_prompt: Optional[str]
     short_memory: Optional[List[Dict[str, Any]]] 
@@ -1,26 +1,59 @@
 # app/main.py
 
+import time
+_BOOT_STARTED = time.perf_counter()
+
 import base64
-from fastapi import FastAPI, Header, Depends
+import json
+import os
+from fastapi import FastAPI, Header, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional
-from app.graph.graph import build_graph
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 import logging
 from app.services.farm_context_service import get_farm_context
-from app.services.api_service import get_api_service
+from app.services.api_service import get_api_service, get_upstream_client, upstream_guard, upstream_hedger
+from app.services.http_client import close_http_client
+from app.services.plot_index import build_plot_index
+from app.services.plot_init_service import (
+    start_initialization,
+    wait_for_initialization,
+    get_initialization_progress,
+)
+from app.services.refresh_scheduler import (
+    REFRESH_SCHEDULER_ENABLED,
+    start_scheduler,
+    stop_scheduler,
+)
+from app.services.warmup_service import (
+    WARMUP_ON_STARTUP,
+    start_warm_up,
+    get_warm_up_status,
+)
 
 from app.memory.redis_manager import redis_manager
+from app.utils.upstream_cache import conditional_stats
+from app.config import llm_stats
+from app.services.intent_classifier import intent_stats_snapshot
+from app.agents.response_generator import stream_response
+from app.utils.prompt_budget import prompt_stats_snapshot
+from app.utils.chat_payload import chat_payload, stream_metadata, wants_debug
+from app.utils.cache_audit import CACHE_AUDIT_ENABLED, recent_cache_writes, stop_cache_audit
 
 # from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.services.voice_service import (
-    transcribe_audio_base64,
-    text_to_speech,
+    atranscribe_audio_base64,
+    atext_to_speech,
     get_tts_lang,
 )
+from app.utils.lazy import LazyResource, import_cost_report, record_cost, timed_import
 from datetime import datetime
 import asyncio
 
+record_cost("app.main (eager imports)", "import", time.perf_counter() - _BOOT_STARTED)
+
 # ---------------- LOGGING CONFIG ----------------
 logging.basicConfig(
     level=logging.INFO,
@@ -39,7 +72,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-graph = build_graph()
+# responses over this size are compressed (br when brotli-asgi is installed)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1000))
+
+try:
+    from brotli_asgi import BrotliMiddleware
+    # gzip for clients without br; SSE must not be buffered by the compressor
+    app.add_middleware(
+        BrotliMiddleware,
+        minimum_size=COMPRESSION_MIN_SIZE,
+        gzip_fallback=True,
+        excluded_handlers=[r"^/chat/stream$"],
+    )
+except ImportError:
+    # starlette's gzip already skips text/event-stream
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
+# langgraph, the agents and the LLM client load on first use (or warm-up)
+graph_resource = LazyResource("graph", lambda: timed_import("app.graph.graph").build_graph())
+
+# resources built in the background right after startup; voice workers
+# can add whisper_model / gtts, and workers with INTENT_EMBEDDINGS_ENABLED
+# intent_embeddings (torch + sentence-transformers, so never by default)
+LAZY_WARMUP = [
+    name.strip()
+    for name in os.getenv("LAZY_WARMUP", "graph,llm,language_detector").split(",")
+    if name.strip()
+]
+
+
+async def get_graph():
+    await graph_resource.warm()
+    return graph_resource.get()
+
+
+def _lazy_resources():
+    from app.config import llm_resource
+    from app.utils.lang_detect import detector_resource
+    from app.services.voice_service import whisper_resource, gtts_resource
+    from app.services.intent_classifier import embedder_resource
+    return {
+        "graph": graph_resource,
+        "llm": llm_resource,
+        "language_detector": detector_resource,
+        "whisper_model": whisper_resource,
+        "gtts": gtts_resource,
+        "intent_embeddings": embedder_resource,
+    }
 # security = HTTPBearer()
 
 
@@ -59,8 +138,37 @@ class VoiceChatRequest(BaseModel):
     include_audio: Optional[bool] = True  # if True, return TTS as base64 
 
 
+async def _warm_lazy_resources():
+    resources = _lazy_resources()
+    for name in LAZY_WARMUP:
+        resource = resources.get(name)
+        if not resource:
+            logger.warning(f"Unknown LAZY_WARMUP resource: {name}")
+            continue
+        try:
+            await resource.warm()
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed: {e}")
+
+    for item in import_cost_report():
+        logger.info(f"[IMPORT COST] {item['name']}: {item['seconds']}s ({item['kind']})")
+
+
+@app.on_event("startup")
+async def warm_lazy_resources():
+    # serve immediately; heavy stacks load in the background
+    app.state.lazy_warmup = asyncio.create_task(_warm_lazy_resources())
+
+
+@app.on_event("startup")
+async def open_http_client():
+    get_upstream_client()
+
+
 @app.on_event("startup")
 async def preload_public_plots():
+    await redis_manager.ping()
+
     print("\n🚀 Preloading public plots into cache...\n")
 
     api = get_api_service(None)
@@ -69,121 +177,90 @@ async def preload_public_plots():
         data = await api.get_public_plots()
 
         if "error" not in data:
-            redis_manager.set("public_plots", data, ttl=86400)
+            # the getter keeps public_plots servable for a day (stale-while-revalidate)
+            await build_plot_index(data)
             print("✅ Public plots cached successfully")
         else:
             print("❌ Failed to preload plots:", data)
 
     except Exception as e:
         print("❌ Startup preload failed:", str(e))
-        
 
-async def run_initialization(plot_id, token):
 
-    api = get_api_service(token)
+@app.on_event("startup")
+async def start_l1_invalidation():
+    redis_manager.start_invalidation_listener()
 
-    try:
-        # profile = await api.get_farmer_profile()
-        # lat, lon = None, None
-
-        # for farm in profile.get("results", []):
-        #     plot = farm.get("plot", {})
-        #     pid = f"{plot.get('gat_number')}_{plot.get('plot_number')}"
-
-        #     if str(pid) == str(plot_id):
-        #         coords = plot.get("location", {}).get("coordinates", [])
-        #         if len(coords) >= 2:
-        #             lon = coords[0]
-        #             lat = coords[1]
-        #         break
-
-        plots = await api.get_public_plots()
-        lat, lon = None, None
-
-        for plot in plots.get("results", []):
-            pid = plot.get("fastapi_plot_id")
-
-            if str(pid) == str(plot_id):
-                loc = plot.get("location", {})
-                lat = loc.get("latitude")
-                lon = loc.get("longitude")
-                break
-
-        if lat is None or lon is None:
-            redis_manager.set_plot_status(plot_id, "failed")
-            return
-       
-        today = datetime.now().strftime("%Y-%m-%d")
-
-        tasks = {
-        # ---------- SOIL ANALYSIS AGENT ----------
-        "soil_analysis": lambda: api.get_soil_analysis(plot_id, today),
-        "npk_requirements": lambda: api.get_npk_requirements(plot_id, today),
-
-        # ---------- PEST ----------
-        "pest_detection": lambda: api.get_pest_detection(plot_id, today),
-
-        # ---------- IRRIGATION ----------
-        "et": lambda: api.get_evapotranspiration(plot_id),
-        "soil_moisture_timeseries": lambda: api.get_soil_moisture_timeseries(plot_id),
-
-        # ---------- WEATHER ----------
-        "current_weather": lambda: api.get_current_weather(plot_id, lat, lon),
-        "weather_forecast": lambda: api.get_weather_forecast(plot_id, lat, lon),
-
-        # ---------- MAPS ----------
-        "growth_map": lambda: api.get_growth_map(plot_id, today),
-        "soil_moisture_map": lambda: api.get_soil_moisture_map(plot_id, today),
-        "water_uptake_map": lambda: api.get_water_uptake_map(plot_id, today),
-        "pest_map": lambda: api.get_pest_map(plot_id, today),
-
-        # ---------- DASHBOARD ----------
-        "agro": lambda: api.get_agro_stats(plot_id, today),
-        "harvest": lambda: api.get_harvest_status(plot_id),
-        "stress":  lambda: api.get_stress_events(plot_id),
-    }
 
-        results = {}
+@app.on_event("startup")
+async def warm_up_on_startup():
+    if WARMUP_ON_STARTUP:
+        start_warm_up()
+
 
-        # -------------------------------
-        # RETRY LOGIC
-        # -------------------------------
-        for name, task in tasks.items():
+@app.on_event("startup")
+async def start_refresh_scheduler():
+    if REFRESH_SCHEDULER_ENABLED:
+        start_scheduler()
 
-            for attempt in range(3):
-                try:
-                    start = datetime.now()
-                    # data = await task
-                    # results[name] = data
-                    data = await task()
 
-                    # treat API error response as failure
-                    if isinstance(data, dict) and data.get("error"):
-                        raise Exception(data["error"])
+@app.on_event("shutdown")
+async def stop_refresh_scheduler():
+    await stop_scheduler()
 
-                    results[name] = data
-                    break
-                    
-                    end = datetime.now()
-                    duration = (end - start).total_seconds()
 
-                    print(f"✅ {name} completed in {duration:.2f}s at {end.strftime('%H:%M:%S')}")
-                    break
+@app.on_event("shutdown")
+async def close_upstream_client():
+    await close_http_client()
 
-                except Exception as e:
 
-                    if attempt == 2:
-                        results[name] = {"error": str(e)}
+@app.on_event("shutdown")
+async def close_redis():
+    await redis_manager.close()
+    stop_cache_audit()
 
-                    await asyncio.sleep(2)
 
-        redis_manager.set_plot(plot_id, results)
-        print(f"\n🎉 ALL API DATA FETCHED FOR PLOT {plot_id} AT {datetime.now().strftime('%H:%M:%S')}\n")
-        redis_manager.set_plot_status(plot_id, "ready")
+def _check_admin_token(x_admin_token: Optional[str]):
+    expected = os.getenv("ADMIN_TOKEN")
+    if expected and x_admin_token != expected:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
 
-    except Exception as e:
-        logger.exception("Initialization failed")
-        redis_manager.set_plot_status(plot_id, "failed")
+
+@app.post("/admin/warmup")
+async def admin_warmup(
+    limit: Optional[int] = None,
+    parallelism: Optional[int] = None,
+    force: bool = False,
+    x_admin_token: Optional[str] = Header(None),
+):
+    _check_admin_token(x_admin_token)
+
+    started = start_warm_up(limit=limit, parallelism=parallelism, force=force)
+    return {
+        "status": "started" if started else "already_running",
+        **await get_warm_up_status()
+    }
+
+
+@app.get("/admin/warmup")
+async def admin_warmup_status(x_admin_token: Optional[str] = Header(None)):
+    _check_admin_token(x_admin_token)
+    return await get_warm_up_status()
+
+
+async def load_plot_state(plot_id):
+    """
+    Returns (status, initialized, ready_keys) for a plot.
+    While initialization is running, ready_keys lists the sources fetched
+    so far; once ready it is None. Agents load their own sources later.
+    """
+    status = await redis_manager.get_plot_status(plot_id)
+
+    if status == "processing":
+        ready_keys = list((await redis_manager.get_plot_keys(plot_id)).keys())
+        return status, True, ready_keys
+
+    return status, await redis_manager.plot_exists(plot_id), None
 
 
 @app.get("/")
@@ -193,11 +270,36 @@ def root():
         "version": "1.0.0"
     }
 
+@app.get("/health/upstreams")
+def upstreams_health():
+    upstreams = upstream_guard.snapshot()
+    degraded = [host for host, s in upstreams.items() if s["breaker"]["state"] != "closed"]
+    return {
+        "status": "degraded" if degraded else "ok",
+        "degraded": degraded,
+        "upstreams": upstreams,
+        "conditional_requests": conditional_stats,
+        "hedging": upstream_hedger.snapshot(),
+        "llm": llm_stats,
+    }
+
+
+@app.get("/health/intent-classifier")
+def intent_classifier_health():
+    return intent_stats_snapshot()
+
+
+@app.get("/health/prompts")
+def prompts_health():
+    # estimated response-prompt tokens per intent
+    return prompt_stats_snapshot()
+
+
 @app.get("/health/redis")
-def redis_health():
+async def redis_health():
     try:
-        redis_manager.client.ping()
-        return {"status": "ok", "redis": "connected"}
+        await redis_manager.client.ping()
+        return {"status": "ok", "redis": "connected", "l1": redis_manager.l1.stats()}
     except:
         return {"status": "fail", "redis": "down"}
 
@@ -305,35 +407,45 @@ def redis_health():
 # async def initialize_plot(plot_id: str, credentials: HTTPAuthorizationCredentials = Depends(security)):
 
 @app.post("/initialize-plot")
-async def initialize_plot(plot_id: str):
-    redis_manager.set_plot_status(plot_id, "processing")
+async def initialize_plot(plot_id: str, wait: bool = False):
+    # job = start_initialization(plot_id, credentials.credentials)
+    job = await start_initialization(plot_id, None)
+    await redis_manager.touch_plot_activity(plot_id)
 
-    # asyncio.create_task(run_initialization(plot_id, credentials.credentials))
-    asyncio.create_task(run_initialization(plot_id, None))
+    if wait:
+        result = await wait_for_initialization(plot_id)
+        return {
+            "status": result.get("status"),
+            "job": job,
+            "result": result
+        }
 
     return {
         "status": "initializing",
-        "message": "All APIs are being fetched in background"
+        "message": (
+            "Joined the initialization already in progress"
+            if job.get("joined")
+            else "All APIs are being fetched in background"
+        ),
+        "job": job
     }
 
 
-@app.post("/chat")
-# async def chat(
-#     request: ChatRequest,
-#     credentials: HTTPAuthorizationCredentials = Depends(security)
-# ):
-async def chat(request: ChatRequest):
-    auth_token = None
-    # auth_token = credentials.credentials
+@app.get("/plot-status")
+async def plot_status(plot_id: str):
+    return await get_initialization_progress(plot_id)
 
-    # logger.info("Authentication token received.")
-    # logger.info("Authentication successful.")
 
-    user_id = request.user_id 
+async def _prepare_chat_state(request: ChatRequest, auth_token: Optional[str] = None):
+    """
+    (graph state, None) for a chat turn, or (None, payload) when the
+    plot cannot be answered yet
+    """
+    user_id = request.user_id
     plot_id = request.plot_id 
     plot_id = str(plot_id)
 
-    short_memory = redis_manager.get_memory(user_id, plot_id)
+    short_memory = await redis_manager.get_memory(user_id, plot_id)
 
     # ---------- INITIAL GRAPH STATE ----------
     state = {
@@ -360,6 +472,7 @@ async def chat(request: ChatRequest):
     )
 
     state["context"].update(farm_context)
+    state["farm_context"] = farm_context
 
     logger.info(f"PLOT DEBUG → plot_id={state['context'].get('plot_id')} "
             f"lat={state['context'].get('lat')} "
@@ -367,7 +480,7 @@ async def chat(request: ChatRequest):
 
 
     if state["context"].get("lat") is None:
-        return {"error": "Plot location missing"}
+        return None, {"error": "Plot location missing"}
 
     # farm_context = await get_farm_context(
     # plot_name=state["context"]["plot_id"],
@@ -391,39 +504,119 @@ async def chat(request: ChatRequest):
     #     return {"error": "Plot location missing"}
 
     try:
-        status = redis_manager.get_plot_status(plot_id)
+        status, initialized, ready_keys = await load_plot_state(plot_id)
 
-        if status != "ready":
-            return {
+        if status not in ("ready", "processing"):
+            return None, {
                 "status": status,
                 "message": "Plot data still loading. Please wait..."
             }
-
-        cached = redis_manager.get_plot(plot_id)
     except:
-        cached = None
+        initialized = False
 
-    if not cached:
-        return {
+    if not initialized:
+        return None, {
             "error": "Plot not initialized. Please call /initialize-plot first."
         }
-    state["context"]["cached_data"] = cached
+    state["context"]["ready_keys"] = ready_keys
+    await redis_manager.touch_plot_activity(plot_id)
+
+    return state, None
 
-    result = await graph.ainvoke(state)
+
+@app.post("/chat")
+# async def chat(
+#     request: ChatRequest,
+#     credentials: HTTPAuthorizationCredentials = Depends(security)
+# ):
+async def chat(
+    request: ChatRequest,
+    debug: bool = Query(False),
+    x_debug: Optional[str] = Header(None),
+):
+    auth_token = None
+    # auth_token = credentials.credentials
+
+    # logger.info("Authentication token received.")
+    # logger.info("Authentication successful.")
+
+    state, error = await _prepare_chat_state(request, auth_token)
+    if error:
+        return error
+
+    user_id = request.user_id
+    plot_id = str(request.plot_id)
+
+    result = await (await get_graph()).ainvoke(state)
     # print("FINAL GRAPH STATE", result)
 
-    redis_manager.save_message(user_id, plot_id, "user", request.message)
-    if result.get("final_response"):
-        redis_manager.save_message(user_id, plot_id, "bot", result["final_response"])
+    await redis_manager.save_exchange(
+        user_id, plot_id, request.message, result.get("final_response")
+    )
 
-    return {
-        "language": result.get("user_language"),
-        "intent": result.get("intent"),
-        "entities": result.get("entities"),
-        "context": result.get("context"),
-        "analysis": result.get("analysis"),
-        "response": result.get("final_response")
-    }
+    return chat_payload(result, wants_debug(debug, x_debug))
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    debug: bool = Query(False),
+    x_debug: Optional[str] = Header(None),
+):
+    """
+    /chat as server-sent events:
+    - metadata: language, intent, entities, analysis (as soon as the agent is done;
+                lean like /chat unless ?debug=true / X-Debug: true)
+    - token:    {"text": ...} chunks of the answer, as Gemini produces them
+    - done:     {"response": full answer}
+    - error:    {"error": ...} (payloads /chat would return as JSON, or a failure)
+    """
+    auth_token = None
+
+    state, error = await _prepare_chat_state(request, auth_token)
+
+    user_id = request.user_id
+    plot_id = str(request.plot_id)
+
+    async def events():
+        if error:
+            yield _sse("error", error)
+            return
+
+        state["stream"] = True
+        try:
+            result = await (await get_graph()).ainvoke(state)
+        except Exception as e:
+            logger.error(f"Chat stream failed: {e}")
+            yield _sse("error", {"error": "chatbot_error"})
+            return
+
+        yield _sse("metadata", stream_metadata(result, wants_debug(debug, x_debug)))
+
+        parts = []
+        try:
+            async for text in stream_response(result):
+                parts.append(text)
+                yield _sse("token", {"text": text})
+        except Exception as e:
+            logger.error(f"Chat stream generation failed: {e}")
+            yield _sse("error", {"error": "chatbot_error", "partial": "".join(parts)})
+            return
+
+        response = "".join(parts).strip()
+        await redis_manager.save_exchange(user_id, plot_id, request.message, response)
+        yield _sse("done", {"response": response})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # no proxy buffering, or the tokens arrive all at once
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # # ---------- CropEye VoiceBot: same chatbot via voice (STT -> chat -> TTS) ----------
@@ -436,7 +629,11 @@ VOICE_ERROR_CHATBOT = "I'm having trouble right now. Please try again shortly."
 #     request: VoiceChatRequest,
 #     credentials: HTTPAuthorizationCredentials = Depends(security)
 # ):
-async def voice_chat(request: VoiceChatRequest):
+async def voice_chat(
+    request: VoiceChatRequest,
+    debug: bool = Query(False),
+    x_debug: Optional[str] = Header(None),
+):
     auth_token = None
     """
     CropEye VoiceBot: accept voice (audio) or text; pass to existing chatbot unchanged;
@@ -454,7 +651,7 @@ async def voice_chat(request: VoiceChatRequest):
     # Resolve user message: from text or from voice (STT)
     user_message = (request.message or "").strip()
     if not user_message and request.audio_base64:
-        transcribed, _detected_lang = transcribe_audio_base64(
+        transcribed, _detected_lang = await atranscribe_audio_base64(
             request.audio_base64, request.content_type
         )
         print("🎤 RAW TRANSCRIBED TEXT:", transcribed)
@@ -468,7 +665,7 @@ async def voice_chat(request: VoiceChatRequest):
         speak_text = VOICE_ERROR_COULDNT_HEAR
         audio_base64_out = None
         if include_audio:
-            audio_bytes = text_to_speech(speak_text, tts_lang)
+            audio_bytes = await atext_to_speech(speak_text, tts_lang)
             audio_base64_out = base64.b64encode(audio_bytes).decode("utf-8") if audio_bytes else None
         return {
             "language": tts_lang,
@@ -480,7 +677,7 @@ async def voice_chat(request: VoiceChatRequest):
         }
 
     # Run same chatbot logic as /chat (no modification of intent or response)
-    short_memory = redis_manager.get_memory(user_id, plot_id)
+    short_memory = await redis_manager.get_memory(user_id, plot_id)
     state = {
         "user_message": user_message,
         "user_language": None,
@@ -491,26 +688,28 @@ async def voice_chat(request: VoiceChatRequest):
             "user_id": request.user_id,
             "auth_token": auth_token,
         },
+        "farm_context": None,
         "short_memory": short_memory,
         "analysis": None,
         "final_response": None,
     }
 
-    cached = redis_manager.get_plot(plot_id)
-    if not cached:
+    status, initialized, ready_keys = await load_plot_state(plot_id)
+    if not initialized:
         return {
             "error": "Plot not initialized. Please call /initialize-plot first."
         }
-    state["context"]["cached_data"] = cached
+    state["context"]["ready_keys"] = ready_keys
+    await redis_manager.touch_plot_activity(plot_id)
 
     try:
-        result = await graph.ainvoke(state)
+        result = await (await get_graph()).ainvoke(state)
     except Exception:
         speak_text = VOICE_ERROR_CHATBOT
         tts_lang = "en"
         audio_base64_out = None
         if include_audio:
-            audio_bytes = text_to_speech(speak_text, tts_lang)
+            audio_bytes = await atext_to_speech(speak_text, tts_lang)
             audio_base64_out = base64.b64encode(audio_bytes).decode("utf-8") if audio_bytes else None
         return {
             "language": tts_lang,
@@ -521,10 +720,9 @@ async def voice_chat(request: VoiceChatRequest):
             "error": "chatbot_error",
         }
 
-    # save_message(user_id, plot_id, "user", user_message)
-    redis_manager.save_message(user_id, plot_id, "user", user_message)
-    if result.get("final_response"):
-        redis_manager.save_message(user_id, plot_id, "bot", result["final_response"])
+    await redis_manager.save_exchange(
+        user_id, plot_id, user_message, result.get("final_response")
+    )
 
     # Use chatbot response as-is for TTS (no extra explanation or formatting)
     final_response = result.get("final_response") or ""
@@ -533,15 +731,11 @@ async def voice_chat(request: VoiceChatRequest):
     speak_text = final_response
     audio_base64_out = None
     if include_audio and speak_text:
-        audio_bytes = text_to_speech(speak_text, tts_lang)
+        audio_bytes = await atext_to_speech(speak_text, tts_lang)
         audio_base64_out = base64.b64encode(audio_bytes).decode("utf-8") if audio_bytes else None
 
     return {
-        "language": result.get("user_language"),
-        "intent": result.get("intent"),
-        "entities": result.get("entities"),
-        "context": result.get("context"),
-        "analysis": result.get("analysis"),
+        **chat_payload(result, wants_debug(debug, x_debug)),
         "response": final_response,
         "speak_text": speak_text,
         "audio_base64": audio_base64_out,
@@ -552,8 +746,8 @@ async def voice_chat(request: VoiceChatRequest):
 @app.post("/refresh-plot")
 # async def refresh_plot(plot_id:str, credentials: HTTPAuthorizationCredentials = Depends(security)):
 #     return await initialize_plot(plot_id, credentials)
-async def refresh_plot(plot_id:str):
-    return await initialize_plot(plot_id)
+async def refresh_plot(plot_id:str, wait: bool = False):
+    return await initialize_plot(plot_id, wait)
 
 @app.get("/health")
 def health_check():
@@ -566,7 +760,25 @@ def health_check():
 # if __name__ == "__main__":
 #     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=False)
 
+@app.get("/debug/import-cost")
+def import_cost(x_admin_token: Optional[str] = Header(None)):
+    _check_admin_token(x_admin_token)
+    return {
+        "loaded": {name: r.loaded for name, r in _lazy_resources().items()},
+        "costs": import_cost_report(),
+    }
+
+
+@app.get("/debug/cache-audit")
+def cache_audit(x_admin_token: Optional[str] = Header(None)):
+    _check_admin_token(x_admin_token)
+    return {
+        "enabled": CACHE_AUDIT_ENABLED,
+        "writes": recent_cache_writes()
+    }
+
+
 @app.get("/debug/clear-cache")
 async def clear_cache():
-    redis_manager.client.flushdb()
+    await redis_manager.client.flushdb()
     return {"status": "cache cleared"}
@@ -0,0 +1,110 @@
+# app/memory/codec.py
+
+"""
+Binary codec for values stored in Redis.
+
+Layout: MAGIC (3 bytes) | VERSION (1 byte) | FLAGS (1 byte) | body
+- FLAGS low nibble  → serializer (1 = JSON via orjson, 2 = MessagePack)
+- FLAGS bit 0x10    → body is zstd-compressed
+Values written before this codec (plain JSON text) carry no header and
+are still decoded as JSON.
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to stdlib json
+    orjson = None
+
+try:
+    import ormsgpack
+except ImportError:  # optional: JSON is used instead
+    ormsgpack = None
+
+try:
+    import zstandard
+except ImportError:  # optional: values are stored uncompressed
+    zstandard = None
+
+
+MAGIC = b"\x00CE"
+VERSION = 1
+
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+FLAG_ZSTD = 0x10
+
+REDIS_CODEC = os.getenv("REDIS_CODEC", "msgpack").lower()
+# payloads smaller than this are not worth a compression frame
+REDIS_COMPRESS_MIN_BYTES = int(os.getenv("REDIS_COMPRESS_MIN_BYTES", 1024))
+REDIS_COMPRESS_LEVEL = int(os.getenv("REDIS_COMPRESS_LEVEL", 3))
+
+_HEADER_LEN = len(MAGIC) + 2
+
+_compressor = zstandard.ZstdCompressor(level=REDIS_COMPRESS_LEVEL) if zstandard else None
+_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def _default_format() -> int:
+    if REDIS_CODEC == "msgpack" and ormsgpack:
+        return FORMAT_MSGPACK
+    return FORMAT_JSON
+
+
+def _dumps(value, fmt: int) -> bytes:
+    if fmt == FORMAT_MSGPACK:
+        return ormsgpack.packb(value, option=ormsgpack.OPT_NON_STR_KEYS)
+    if orjson:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(body: bytes, fmt: int):
+    if fmt == FORMAT_MSGPACK:
+        if not ormsgpack:
+            raise ValueError("ormsgpack is required to decode this value")
+        return ormsgpack.unpackb(body)
+    if orjson:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def encode(value) -> bytes:
+    fmt = _default_format()
+    body = _dumps(value, fmt)
+    flags = fmt
+
+    if _compressor and len(body) >= REDIS_COMPRESS_MIN_BYTES:
+        compressed = _compressor.compress(body)
+        if len(compressed) < len(body):
+            body = compressed
+            flags |= FLAG_ZSTD
+
+    return MAGIC + bytes((VERSION, flags)) + body
+
+
+def decode(data):
+    if not data:
+        return None
+
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    # legacy value: plain JSON text
+    if not data.startswith(MAGIC):
+        return _loads(data, FORMAT_JSON)
+
+    version, flags = data[len(MAGIC)], data[len(MAGIC) + 1]
+    if version != VERSION:
+        raise ValueError(f"Unsupported cache codec version {version}")
+
+    body = data[_HEADER_LEN:]
+
+    if flags & FLAG_ZSTD:
+        if not _decompressor:
+            raise ValueError("zstandard is required to decode this value")
+        body = _decompressor.decompress(body)
+
+    return _loads(body, flags & 0x0F)
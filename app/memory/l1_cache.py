@@ -0,0 +1,125 @@
+# app/memory/l1_cache.py
+
+"""
+In-process L1 cache in front of Redis.
+Holds decoded values for a short time so hot keys skip the Redis round
+trip and the deserialization. It only serves reads while `active`, i.e.
+while the worker is subscribed to the invalidation channel; values are
+shared between requests and must be treated as read-only.
+The cache is bounded by the serialized size of its values, and values
+above L1_MAX_ITEM_BYTES (GeoJSON maps) are left to Redis.
+"""
+
+import os
+import time
+from typing import Any, Optional, Tuple
+
+from cachetools import TLRUCache
+
+L1_ENABLED = os.getenv("L1_CACHE_ENABLED", "true").lower() == "true"
+L1_MAX_BYTES = int(os.getenv("L1_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+L1_MAX_ITEM_BYTES = int(os.getenv("L1_CACHE_MAX_ITEM_BYTES", 256 * 1024))
+L1_TTL = float(os.getenv("L1_CACHE_TTL", 300))
+L1_INVALIDATION_CHANNEL = os.getenv("L1_INVALIDATION_CHANNEL", "cache:invalidate")
+# keys rewritten on nearly every request gain nothing from L1
+L1_EXCLUDE_PREFIXES = ("chatmemory:", "lock:")
+
+# bookkeeping cost of an entry on top of its payload, so that many tiny
+# values are bounded as well
+L1_ENTRY_OVERHEAD = 256
+
+# field keys of a plot hash are cached as "plot:{id}#{field}"
+FIELD_SEPARATOR = "#"
+
+_MISSING = object()
+
+
+def _time_to_use(key, item, now):
+    _, ttl, _ = item
+    return now + min(L1_TTL, ttl or L1_TTL)
+
+
+def _item_size(item) -> int:
+    return item[2] + L1_ENTRY_OVERHEAD
+
+
+class L1Cache:
+
+    def __init__(self, max_bytes: int = L1_MAX_BYTES, max_item_bytes: int = L1_MAX_ITEM_BYTES):
+        self._cache = TLRUCache(
+            maxsize=max_bytes, ttu=_time_to_use, timer=time.monotonic, getsizeof=_item_size
+        )
+        self.max_item_bytes = max_item_bytes
+        self.oversized = 0
+        self.active = False
+        # bumped on every invalidation; a read that raced one is not cached
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cacheable(key: str) -> bool:
+        return L1_ENABLED and not key.startswith(L1_EXCLUDE_PREFIXES)
+
+    @staticmethod
+    def field_key(key: str, field: str) -> str:
+        return f"{key}{FIELD_SEPARATOR}{field}"
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        if not (self.active and self.cacheable(key)):
+            return False, None
+
+        item = self._cache.get(key, _MISSING)
+        if item is _MISSING:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        return True, item[0]
+
+    def store(
+        self,
+        key: str,
+        value: Any,
+        size: int,
+        ttl: Optional[float] = None,
+        generation: Optional[int] = None
+    ):
+        """Cache value; `size` is the length of its serialized payload"""
+        if generation is not None and generation != self.generation:
+            return
+        if not (self.active and self.cacheable(key) and value is not None):
+            return
+        if size > self.max_item_bytes:
+            # an older, smaller value of the key must not outlive this write
+            self._cache.pop(key, None)
+            self.oversized += 1
+            return
+        self._cache[key] = (value, ttl, size)
+
+    def invalidate(self, key: str):
+        """Drop key, and every field of it when key is a hash"""
+        self.generation += 1
+        self._cache.pop(key, None)
+
+        prefix = key + FIELD_SEPARATOR
+        for cached_key in [k for k in self._cache.keys() if k.startswith(prefix)]:
+            self._cache.pop(cached_key, None)
+
+    def clear(self):
+        self.generation += 1
+        self._cache.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "active": self.active,
+            "size": len(self._cache),
+            "bytes": self._cache.currsize,
+            "max_bytes": self._cache.maxsize,
+            "max_item_bytes": self.max_item_bytes,
+            "oversized": self.oversized,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
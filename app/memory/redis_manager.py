@@ -1,10 +1,15 @@
-
+import asyncio
 import redis
-import json
+import redis.asyncio as aioredis
 import os
 import logging
+import time
+import uuid
 from datetime import datetime
 from dotenv import load_dotenv
+from app.utils.cache_audit import record_cache_write
+from app.memory import codec
+from app.memory.l1_cache import L1Cache, L1_ENABLED, L1_INVALIDATION_CHANNEL
 
 load_dotenv()
 
@@ -19,67 +24,151 @@ REDIS_URL = os.getenv("REDIS_URL")
 if not REDIS_URL:
     raise ValueError("REDIS_URL not set in environment variables")
 
-class RedisManager:
+# Async pool tuning: one pool per worker, shared by every request
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 10))
 
-    def __init__(self):
-        try:
-            self.client = redis.from_url(
-                REDIS_URL,
-                decode_responses=True,
-                socket_connect_timeout=15,
-                socket_timeout=30,
-                retry_on_timeout=True,
-                health_check_interval=30
-            )
+# conversation memory: last N messages, expiring after inactivity
+CHAT_MEMORY_TTL = 900
+CHAT_MEMORY_MAX = 5
 
-            self.client.ping()
-            logger.info("✅ Redis connected")
+# plots used by chat or initialization, kept well past the longest
+# background refresh cadence (12h) so the scheduler still sees them
+PLOT_ACTIVITY_TTL = int(os.getenv("PLOT_ACTIVITY_TTL", 86400))
 
-        except Exception as e:
-            logger.error("❌ Redis connection failed")
-            raise e
 
+class _RedisBase:
+    """Key layout and serialization shared by the sync and async managers"""
 
     # =========================================================
     # INTERNAL UTILS
     # =========================================================
 
+    # values go through app.memory.codec (msgpack/JSON + zstd above a
+    # size threshold), so the clients run with decode_responses=False
+
     def _serialize(self, value):
-        return json.dumps(value)
+        return codec.encode(value)
 
     def _deserialize(self, value):
-        return json.loads(value) if value else None
+        return codec.decode(value) if value else None
+
+    @staticmethod
+    def _text(value):
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def _serialize_fields(self, data):
+        return {field: self._serialize(value) for field, value in (data or {}).items()}
+
+    def _deserialize_fields(self, raw):
+        """Decode hash fields, dropping the ones that are missing"""
+        return {
+            self._text(field): self._deserialize(value)
+            for field, value in raw.items()
+            if value is not None
+        }
+
+    @staticmethod
+    def _pick(data, fields):
+        data = data or {}
+        return {f: data[f] for f in fields if f in data}
+
+    @staticmethod
+    def _is_wrongtype(error):
+        # plot aggregates written before the hash layout are JSON strings
+        return "WRONGTYPE" in str(error)
+
+    def _invalidation_message(self, key):
+        return f"{self.instance_id}|{key}"
+
+    @staticmethod
+    def _audit_fields(key, data, mapping, ttl):
+        for field, payload in mapping.items():
+            record_cache_write(f"{key}#{field}", data[field], ttl, len(payload))
 
-    
     # =========================================================
-    # DEBUG LOGGING
+    # KEYS
     # =========================================================
-    def _debug_log_cache(self, key, value, ttl):
-        try:
-            record = {
-                "key": key,
-                "value": value,
-                "ttl": ttl,
-                "time": datetime.now().isoformat()
-            }
 
-            file = "cache_debug.json"
+    # delete the lock only if we still own it
+    _RELEASE_LOCK_SCRIPT = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return redis.call("del", KEYS[1])
+    end
+    return 0
+    """
 
-            if os.path.exists(file):
-                with open(file, "r") as f:
-                    data = json.load(f) 
-            else:
-                data = []
+    def _plot_key(self, plot_id):
+        return f"plot:{plot_id}"
+
+    def _plot_keys_key(self, plot_id):
+        return f"plot_keys:{plot_id}"
+
+    def _plot_index_key(self, plot_id):
+        return f"plot_index:{plot_id}"
+
+    def _chat_key(self, user_id, plot_id):
+        return f"chatmemory:{user_id}:{plot_id}"
+
+    # sorted set: plot id → epoch of its last chat turn or initialization
+    def _plot_activity_key(self):
+        return "plot_activity"
 
-            data = {r["key"]: r for r in data} if isinstance(data, list) else data
-            data[key] = record
+    @staticmethod
+    def _chat_entry(role, message):
+        return {"role": role, "message": message}
 
+    def _exchange(self, user_message, bot_message):
+        messages = [self._chat_entry("user", user_message)]
+        if bot_message:
+            messages.append(self._chat_entry("bot", bot_message))
+        return messages
 
-            with open(file, "w") as f:
-                json.dump(data, f, indent=2)
+    @staticmethod
+    def _new_lock_token():
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def _key_record(ok):
+        return {"ok": bool(ok), "at": datetime.now().timestamp()}
+
+    @staticmethod
+    def _order_by_ttl(recent, limit):
+        ordered = sorted(recent, key=recent.get, reverse=True)
+        return ordered[:limit] if limit else ordered
+
+    @staticmethod
+    def _range_args(limit):
+        return {"start": 0, "num": limit} if limit else {}
+
+
+class RedisManager(_RedisBase):
+    """
+    Synchronous manager for scripts and one-off jobs.
+    Request handlers use the async `redis_manager` singleton instead.
+    """
+
+    def __init__(self):
+        try:
+            self.client = redis.from_url(
+                REDIS_URL,
+                decode_responses=False,
+                socket_connect_timeout=15,
+                socket_timeout=30,
+                retry_on_timeout=True,
+                health_check_interval=30
+            )
+
+            self.client.ping()
+            logger.info("✅ Redis connected")
 
         except Exception as e:
-            logger.warning(f"Debug file write failed: {e}")
+            logger.error("❌ Redis connection failed")
+            raise e
+
+        # writes from scripts must reach the L1 of every running worker
+        self.instance_id = uuid.uuid4().hex
 
     # =========================================================
     # GENERIC CACHE
@@ -87,23 +176,20 @@ class RedisManager:
 
     def set(self, key, value, ttl=None):
         try:
+            payload = self._serialize(value)
+            pipe = self.client.pipeline(transaction=False)
             if ttl:
-                self.client.setex(key, ttl, self._serialize(value))
+                pipe.setex(key, ttl, payload)
             else:
-                self.client.set(key, self._serialize(value))            
-            self._debug_log_cache(key, value, ttl)
+                pipe.set(key, payload)
+            if L1Cache.cacheable(key):
+                pipe.publish(L1_INVALIDATION_CHANNEL, self._invalidation_message(key))
+            pipe.execute()
+            record_cache_write(key, value, ttl, len(payload))
 
         except Exception as e:
             logger.warning(f"Redis SET failed: {e}")
 
-
-    # def get(self, key):
-    #     try:
-    #         return self._deserialize(self.client.get(key))
-    #     except Exception as e:
-    #         logger.warning(f"Redis GET failed: {e}")
-    #         return None
-
     def get(self, key):
         try:
             data = self.client.get(key)
@@ -120,7 +206,11 @@ class RedisManager:
 
     def delete(self, key):
         try:
-            self.client.delete(key)
+            pipe = self.client.pipeline(transaction=False)
+            pipe.delete(key)
+            if L1Cache.cacheable(key):
+                pipe.publish(L1_INVALIDATION_CHANNEL, self._invalidation_message(key))
+            pipe.execute()
         except Exception as e:
             logger.warning(f"Redis DELETE failed: {e}")
 
@@ -131,61 +221,723 @@ class RedisManager:
         except:
             return False
 
+    # =========================================================
+    # DISTRIBUTED LOCK
+    # =========================================================
+
+    def acquire_lock(self, name, ttl):
+        """Returns an owner token, or None if the lock is already held"""
+        token = self._new_lock_token()
+        try:
+            if self.client.set(name, token, nx=True, ex=ttl):
+                return token
+            return None
+        except Exception as e:
+            logger.warning(f"Redis lock acquire failed: {e}")
+            return None
+
+    def release_lock(self, name, token):
+        try:
+            self.client.eval(self._RELEASE_LOCK_SCRIPT, 1, name, token)
+        except Exception as e:
+            logger.warning(f"Redis lock release failed: {e}")
 
     # =========================================================
     # PLOT CACHE
     # =========================================================
 
-    def set_plot(self, plot_id, data, ttl=86400):
-        self.set(f"plot:{plot_id}", data, ttl)
+    # plot:{id} is a hash with one field per upstream source
 
+    def set_plot(self, plot_id, data, ttl=86400):
+        key = self._plot_key(plot_id)
+        try:
+            mapping = self._serialize_fields(data)
+            pipe = self.client.pipeline()
+            pipe.delete(key)
+            if mapping:
+                pipe.hset(key, mapping=mapping)
+                pipe.expire(key, ttl)
+            pipe.publish(L1_INVALIDATION_CHANNEL, self._invalidation_message(key))
+            pipe.execute()
+            self._audit_fields(key, data, mapping, ttl)
+        except Exception as e:
+            logger.warning(f"Redis HSET failed: {e}")
 
     def get_plot(self, plot_id):
-        return self.get(f"plot:{plot_id}")
+        key = self._plot_key(plot_id)
+        try:
+            raw = self.client.hgetall(key)
+            return self._deserialize_fields(raw) if raw else None
+        except redis.ResponseError as e:
+            if self._is_wrongtype(e):
+                return self.get(key)
+            logger.warning(f"Redis HGETALL failed: {e}")
+        except Exception as e:
+            logger.warning(f"Redis HGETALL failed: {e}")
+        return None
+
+    def get_plot_fields(self, plot_id, fields):
+        """Only the requested sources of the plot aggregate"""
+        fields = list(fields)
+        if not fields:
+            return {}
+        key = self._plot_key(plot_id)
+        try:
+            values = self.client.hmget(key, fields)
+            return self._deserialize_fields(dict(zip(fields, values)))
+        except redis.ResponseError as e:
+            if self._is_wrongtype(e):
+                return self._pick(self.get(key), fields)
+            logger.warning(f"Redis HMGET failed: {e}")
+        except Exception as e:
+            logger.warning(f"Redis HMGET failed: {e}")
+        return {}
+
+    def set_plot_field(self, plot_id, field, value, ttl=86400):
+        """Update a single source inside the plot aggregate"""
+        key = self._plot_key(plot_id)
+        try:
+            payload = self._serialize(value)
+            field_key = L1Cache.field_key(key, field)
+            pipe = self.client.pipeline()
+            pipe.hset(key, field, payload)
+            pipe.expire(key, ttl)
+            pipe.publish(L1_INVALIDATION_CHANNEL, self._invalidation_message(field_key))
+            pipe.execute()
+            record_cache_write(field_key, value, ttl, len(payload))
+        except redis.ResponseError as e:
+            if not self._is_wrongtype(e):
+                logger.warning(f"Redis HSET failed: {e}")
+                return
+            # legacy JSON string aggregate → rewrite it as a hash
+            data = self.get(key) or {}
+            data[field] = value
+            self.set_plot(plot_id, data, ttl)
+        except Exception as e:
+            logger.warning(f"Redis HSET failed: {e}")
+
+    def plot_exists(self, plot_id):
+        return self.exists(self._plot_key(plot_id))
 
     # =========================================================
-    # PLOT STATUS
+    # PLOT KEY READINESS (one hash field per cached source)
     # =========================================================
+
+    def mark_plot_key(self, plot_id, field, ok, ttl=86400):
+        try:
+            key = self._plot_keys_key(plot_id)
+            self.client.hset(key, field, self._serialize(self._key_record(ok)))
+            self.client.expire(key, ttl)
+        except Exception as e:
+            logger.warning(f"Redis HSET failed: {e}")
+
+    def get_plot_keys(self, plot_id):
+        """{field: {"ok": bool, "at": epoch}} for every source fetched so far"""
+        try:
+            raw = self.client.hgetall(self._plot_keys_key(plot_id))
+            return {self._text(k): self._deserialize(v) for k, v in raw.items()}
+        except Exception as e:
+            logger.warning(f"Redis HGETALL failed: {e}")
+            return {}
+
+    # =========================================================
+    # PLOT INDEX (plot_index:{id} → the few catalogue fields chat needs)
+    # =========================================================
+
+    def set_plot_index(self, entries, ttl=3600):
+        """entries: {plot_id: {field: value}}, written in one pipeline"""
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for plot_id, entry in entries.items():
+                key = self._plot_index_key(plot_id)
+                pipe.delete(key)
+                pipe.hset(key, mapping=self._serialize_fields(entry))
+                pipe.expire(key, ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis HSET failed: {e}")
+
+    def get_plot_index(self, plot_id):
+        try:
+            raw = self.client.hgetall(self._plot_index_key(plot_id))
+            return self._deserialize_fields(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"Redis HGETALL failed: {e}")
+            return None
+
+    # =========================================================
+    # PLOT STATUS / REPORT / JOB
+    # =========================================================
+
     def set_plot_status(self, plot_id, status):
         self.set(f"plot_status:{plot_id}", status)
 
     def get_plot_status(self, plot_id):
         return self.get(f"plot_status:{plot_id}")
 
+    def set_plot_report(self, plot_id, report, ttl=86400):
+        self.set(f"plot_report:{plot_id}", report, ttl)
+
+    def get_plot_report(self, plot_id):
+        return self.get(f"plot_report:{plot_id}")
+
+    def set_plot_job(self, plot_id, job, ttl=86400):
+        self.set(f"plot_job:{plot_id}", job, ttl)
+
+    def get_plot_job(self, plot_id):
+        return self.get(f"plot_job:{plot_id}")
+
     # =========================================================
     # CHAT MEMORY - Conversation
     # =========================================================
 
-    def _chat_key(self, user_id, plot_id):
-        return f"chatmemory:{user_id}:{plot_id}"
-
+    # chatmemory:{user}:{plot} is a Redis list of encoded messages, oldest
+    # first; appends are RPUSH + LTRIM + EXPIRE in one round trip
 
     def get_memory(self, user_id, plot_id):
-        data = self.get(self._chat_key(user_id, plot_id))
-        return data if data else []
+        key = self._chat_key(user_id, plot_id)
+        try:
+            return [self._deserialize(item) for item in self.client.lrange(key, 0, -1)]
+        except redis.ResponseError as e:
+            if self._is_wrongtype(e):
+                return self.get(key) or []
+            logger.warning(f"Redis LRANGE failed: {e}")
+        except Exception as e:
+            logger.warning(f"Redis LRANGE failed: {e}")
+        return []
+
+    def touch_plot_activity(self, plot_id, ttl=PLOT_ACTIVITY_TTL):
+        now = time.time()
+        try:
+            key = self._plot_activity_key()
+            pipe = self.client.pipeline(transaction=False)
+            pipe.zadd(key, {str(plot_id): now})
+            pipe.zremrangebyscore(key, "-inf", now - ttl)
+            pipe.expire(key, ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis ZADD failed: {e}")
 
+    def get_active_plot_ids(self, limit=None, window=PLOT_ACTIVITY_TTL):
+        """Plot ids used within `window` seconds, most recently active first"""
+        try:
+            ids = self.client.zrevrangebyscore(
+                self._plot_activity_key(), "+inf", time.time() - window, **self._range_args(limit)
+            )
+            return [self._text(plot_id) for plot_id in ids]
+        except Exception as e:
+            logger.warning(f"Redis ZREVRANGEBYSCORE failed: {e}")
+            return []
+
+    def get_recent_plot_ids(self, limit=None):
+        """Plot ids with live chat memory, most recently active first"""
+        recent = {}
+        try:
+            for key in self.client.scan_iter(match="chatmemory:*", count=500):
+                plot_id = self._text(key).rsplit(":", 1)[-1]
+                ttl = self.client.ttl(key)
+                if ttl and ttl > recent.get(plot_id, -1):
+                    recent[plot_id] = ttl
+        except Exception as e:
+            logger.warning(f"Redis SCAN failed: {e}")
+
+        return self._order_by_ttl(recent, limit)
+
+    def append_messages(self, user_id, plot_id, messages,
+                        ttl=CHAT_MEMORY_TTL, max_msg=CHAT_MEMORY_MAX):
+        key = self._chat_key(user_id, plot_id)
+        try:
+            with self.client.pipeline(transaction=True) as pipe:
+                pipe.rpush(key, *[self._serialize(m) for m in messages])
+                pipe.ltrim(key, -max_msg, -1)
+                pipe.expire(key, ttl)
+                pipe.execute()
+        except redis.ResponseError as e:
+            if not self._is_wrongtype(e):
+                logger.warning(f"Redis RPUSH failed: {e}")
+                return
+            # legacy JSON string memory → rewrite it as a list
+            legacy = self.get(key) or []
+            self.delete(key)
+            self.append_messages(user_id, plot_id, legacy + list(messages), ttl, max_msg)
+        except Exception as e:
+            logger.warning(f"Redis RPUSH failed: {e}")
 
     def save_message(self, user_id, plot_id, role, message,
-                     ttl=900, max_msg=5):
+                     ttl=CHAT_MEMORY_TTL, max_msg=CHAT_MEMORY_MAX):
+        self.append_messages(
+            user_id, plot_id, [self._chat_entry(role, message)], ttl, max_msg
+        )
+
+    def save_exchange(self, user_id, plot_id, user_message, bot_message=None,
+                      ttl=CHAT_MEMORY_TTL, max_msg=CHAT_MEMORY_MAX):
+        """Records the user turn and the bot reply in one round trip"""
+        self.append_messages(
+            user_id, plot_id, self._exchange(user_message, bot_message), ttl, max_msg
+        )
+
+
+class AsyncRedisManager(_RedisBase):
+    """
+    asyncio-native manager used by the FastAPI app.
+    Same API as RedisManager, every call is awaitable and
+    runs on a shared, bounded connection pool.
+    """
 
-        memory = self.get_memory(user_id, plot_id)
+    def __init__(self):
+        # blocking pool: callers wait for a free connection (up to
+        # REDIS_POOL_TIMEOUT) instead of opening unbounded sockets
+        self.pool = aioredis.BlockingConnectionPool.from_url(
+            REDIS_URL,
+            decode_responses=False,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT,
+            socket_connect_timeout=5,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_keepalive=True,
+            retry_on_timeout=True,
+            health_check_interval=30
+        )
+        self.client = aioredis.Redis(connection_pool=self.pool)
+
+        # in-process tier, kept coherent across workers through pub/sub
+        self.l1 = L1Cache()
+        self.instance_id = uuid.uuid4().hex
+        self._listener_task = None
+
+    async def ping(self):
+        try:
+            await self.client.ping()
+            logger.info("✅ Redis connected")
+            return True
+        except Exception:
+            logger.error("❌ Redis connection failed")
+            return False
+
+    async def close(self):
+        await self.stop_invalidation_listener()
+        await self.client.aclose()
+        await self.pool.disconnect()
+
+    # =========================================================
+    # L1 INVALIDATION
+    # =========================================================
+
+    # Every write publishes "{instance_id}|{key}". Other workers drop the
+    # key (and its hash fields) from their L1; the writer has already
+    # updated its own copy. L1 only serves reads while subscribed, and is
+    # flushed whenever the subscription is (re)established, so a worker
+    # never serves a value it could have missed an invalidation for.
+
+    def start_invalidation_listener(self):
+        if L1_ENABLED and (self._listener_task is None or self._listener_task.done()):
+            self._listener_task = asyncio.create_task(self._invalidation_loop())
+
+    async def stop_invalidation_listener(self):
+        task, self._listener_task = self._listener_task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.l1.active = False
+        self.l1.clear()
+
+    async def _invalidation_loop(self):
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(L1_INVALIDATION_CHANNEL)
+                self.l1.clear()
+                self.l1.active = True
+                logger.info("L1 cache invalidation listener subscribed")
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    origin, _, key = self._text(message["data"]).partition("|")
+                    if origin != self.instance_id:
+                        self.l1.invalidate(key)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"L1 invalidation listener failed: {e}")
+            finally:
+                self.l1.active = False
+                self.l1.clear()
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(1)
+
+    # =========================================================
+    # GENERIC CACHE
+    # =========================================================
+
+    async def set(self, key, value, ttl=None):
+        try:
+            payload = self._serialize(value)
+            async with self.client.pipeline(transaction=False) as pipe:
+                if ttl:
+                    pipe.setex(key, ttl, payload)
+                else:
+                    pipe.set(key, payload)
+                if self.l1.cacheable(key):
+                    pipe.publish(L1_INVALIDATION_CHANNEL, self._invalidation_message(key))
+                await pipe.execute()
+            self.l1.store(key, value, len(payload), ttl)
+            record_cache_write(key, value, ttl, len(payload))
+
+        except Exception as e:
+            self.l1.invalidate(key)
+            logger.warning(f"Redis SET failed: {e}")
+
+    async def get(self, key):
+        hit, value = self.l1.lookup(key)
+        if hit:
+            return value
+
+        generation = self.l1.generation
+        try:
+            data = await self.client.get(key)
+
+            if data:
+                print(f"[REDIS] Returning cached data for {key}")
+                value = self._deserialize(data)
+                self.l1.store(key, value, len(data), generation=generation)
+                return value
+
+            return None
+
+        except Exception as e:
+            logger.warning(f"Redis GET failed: {e}")
+            return None
+
+    async def delete(self, key):
+        self.l1.invalidate(key)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.delete(key)
+                if self.l1.cacheable(key):
+                    pipe.publish(L1_INVALIDATION_CHANNEL, self._invalidation_message(key))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis DELETE failed: {e}")
 
-        memory.append({
-            "role": role,
-            "message": message
-        })
+    async def exists(self, key):
+        try:
+            return await self.client.exists(key) == 1
+        except:
+            return False
 
-        memory = memory[-max_msg:]
+    # =========================================================
+    # DISTRIBUTED LOCK
+    # =========================================================
 
-        self.set(
-            self._chat_key(user_id, plot_id),
-            memory,
-            ttl
+    async def acquire_lock(self, name, ttl):
+        """Returns an owner token, or None if the lock is already held"""
+        token = self._new_lock_token()
+        try:
+            if await self.client.set(name, token, nx=True, ex=ttl):
+                return token
+            return None
+        except Exception as e:
+            logger.warning(f"Redis lock acquire failed: {e}")
+            return None
+
+    async def release_lock(self, name, token):
+        try:
+            await self.client.eval(self._RELEASE_LOCK_SCRIPT, 1, name, token)
+        except Exception as e:
+            logger.warning(f"Redis lock release failed: {e}")
+
+    # =========================================================
+    # PLOT CACHE
+    # =========================================================
+
+    # plot:{id} is a hash with one field per upstream source, so agents
+    # fetch (and deserialize) only the sources they declare
+
+    async def set_plot(self, plot_id, data, ttl=86400):
+        key = self._plot_key(plot_id)
+        try:
+            mapping = self._serialize_fields(data)
+            self.l1.invalidate(key)
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                if mapping:
+                    pipe.hset(key, mapping=mapping)
+                    pipe.expire(key, ttl)
+                pipe.publish(L1_INVALIDATION_CHANNEL, self._invalidation_message(key))
+                await pipe.execute()
+            self._audit_fields(key, data, mapping, ttl)
+        except Exception as e:
+            logger.warning(f"Redis HSET failed: {e}")
+
+    async def get_plot(self, plot_id):
+        key = self._plot_key(plot_id)
+        try:
+            raw = await self.client.hgetall(key)
+            return self._deserialize_fields(raw) if raw else None
+        except redis.ResponseError as e:
+            if self._is_wrongtype(e):
+                return await self.get(key)
+            logger.warning(f"Redis HGETALL failed: {e}")
+        except Exception as e:
+            logger.warning(f"Redis HGETALL failed: {e}")
+        return None
+
+    async def get_plot_fields(self, plot_id, fields):
+        """Only the requested sources of the plot aggregate (one HMGET)"""
+        fields = list(fields)
+        if not fields:
+            return {}
+        key = self._plot_key(plot_id)
+
+        result = {}
+        for field in fields:
+            hit, value = self.l1.lookup(self.l1.field_key(key, field))
+            if hit:
+                result[field] = value
+        missing = [field for field in fields if field not in result]
+        if not missing:
+            return result
+
+        generation = self.l1.generation
+        try:
+            raw = dict(zip(missing, await self.client.hmget(key, missing)))
+            loaded = self._deserialize_fields(raw)
+            for field, value in loaded.items():
+                self.l1.store(
+                    self.l1.field_key(key, field), value, len(raw[field]), generation=generation
+                )
+            result.update(loaded)
+            return result
+        except redis.ResponseError as e:
+            if self._is_wrongtype(e):
+                return self._pick(await self.get(key), fields)
+            logger.warning(f"Redis HMGET failed: {e}")
+        except Exception as e:
+            logger.warning(f"Redis HMGET failed: {e}")
+        return result
+
+    async def set_plot_field(self, plot_id, field, value, ttl=86400):
+        """Update a single source inside the plot aggregate"""
+        key = self._plot_key(plot_id)
+        try:
+            payload = self._serialize(value)
+            field_key = self.l1.field_key(key, field)
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, field, payload)
+                pipe.expire(key, ttl)
+                pipe.publish(L1_INVALIDATION_CHANNEL, self._invalidation_message(field_key))
+                await pipe.execute()
+            self.l1.store(field_key, value, len(payload), ttl)
+            record_cache_write(field_key, value, ttl, len(payload))
+        except redis.ResponseError as e:
+            if not self._is_wrongtype(e):
+                logger.warning(f"Redis HSET failed: {e}")
+                return
+            # legacy JSON string aggregate → rewrite it as a hash; get() may
+            # return the shared L1 value, which must not be mutated in place
+            data = dict(await self.get(key) or {})
+            data[field] = value
+            await self.set_plot(plot_id, data, ttl)
+        except Exception as e:
+            logger.warning(f"Redis HSET failed: {e}")
+
+    async def plot_exists(self, plot_id):
+        return await self.exists(self._plot_key(plot_id))
+
+    # =========================================================
+    # PLOT KEY READINESS (one hash field per cached source)
+    # =========================================================
+
+    async def mark_plot_key(self, plot_id, field, ok, ttl=86400):
+        try:
+            key = self._plot_keys_key(plot_id)
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, field, self._serialize(self._key_record(ok)))
+                pipe.expire(key, ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis HSET failed: {e}")
+
+    async def get_plot_keys(self, plot_id):
+        """{field: {"ok": bool, "at": epoch}} for every source fetched so far"""
+        try:
+            raw = await self.client.hgetall(self._plot_keys_key(plot_id))
+            return {self._text(k): self._deserialize(v) for k, v in raw.items()}
+        except Exception as e:
+            logger.warning(f"Redis HGETALL failed: {e}")
+            return {}
+
+    # =========================================================
+    # PLOT INDEX (plot_index:{id} → the few catalogue fields chat needs)
+    # =========================================================
+
+    async def set_plot_index(self, entries, ttl=3600):
+        """entries: {plot_id: {field: value}}, written in one pipeline"""
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for plot_id, entry in entries.items():
+                    key = self._plot_index_key(plot_id)
+                    pipe.delete(key)
+                    pipe.hset(key, mapping=self._serialize_fields(entry))
+                    pipe.expire(key, ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis HSET failed: {e}")
+
+    async def get_plot_index(self, plot_id):
+        try:
+            raw = await self.client.hgetall(self._plot_index_key(plot_id))
+            return self._deserialize_fields(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"Redis HGETALL failed: {e}")
+            return None
+
+    # =========================================================
+    # PLOT STATUS / REPORT / JOB
+    # =========================================================
+
+    async def set_plot_status(self, plot_id, status):
+        await self.set(f"plot_status:{plot_id}", status)
+
+    async def get_plot_status(self, plot_id):
+        return await self.get(f"plot_status:{plot_id}")
+
+    async def set_plot_report(self, plot_id, report, ttl=86400):
+        await self.set(f"plot_report:{plot_id}", report, ttl)
+
+    async def get_plot_report(self, plot_id):
+        return await self.get(f"plot_report:{plot_id}")
+
+    async def set_plot_job(self, plot_id, job, ttl=86400):
+        await self.set(f"plot_job:{plot_id}", job, ttl)
+
+    async def get_plot_job(self, plot_id):
+        return await self.get(f"plot_job:{plot_id}")
+
+    # =========================================================
+    # CHAT MEMORY - Conversation
+    # =========================================================
+
+    async def get_memory(self, user_id, plot_id):
+        key = self._chat_key(user_id, plot_id)
+        try:
+            return [self._deserialize(item) for item in await self.client.lrange(key, 0, -1)]
+        except redis.ResponseError as e:
+            if self._is_wrongtype(e):
+                return await self.get(key) or []
+            logger.warning(f"Redis LRANGE failed: {e}")
+        except Exception as e:
+            logger.warning(f"Redis LRANGE failed: {e}")
+        return []
+
+    async def touch_plot_activity(self, plot_id, ttl=PLOT_ACTIVITY_TTL):
+        """Marks the plot as in use now; chat memory expires far too soon for that"""
+        now = time.time()
+        try:
+            key = self._plot_activity_key()
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.zadd(key, {str(plot_id): now})
+                pipe.zremrangebyscore(key, "-inf", now - ttl)
+                pipe.expire(key, ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis ZADD failed: {e}")
+
+    async def get_active_plot_ids(self, limit=None, window=PLOT_ACTIVITY_TTL):
+        """Plot ids used within `window` seconds, most recently active first"""
+        try:
+            ids = await self.client.zrevrangebyscore(
+                self._plot_activity_key(), "+inf", time.time() - window, **self._range_args(limit)
+            )
+            return [self._text(plot_id) for plot_id in ids]
+        except Exception as e:
+            logger.warning(f"Redis ZREVRANGEBYSCORE failed: {e}")
+            return []
+
+    async def get_recent_plot_ids(self, limit=None):
+        """
+        Plot ids with live chat memory, most recently active first.
+        Memory TTL is refreshed on every message, so a higher remaining
+        TTL means a more recent conversation.
+        """
+        recent = {}
+        try:
+            keys = [k async for k in self.client.scan_iter(match="chatmemory:*", count=500)]
+
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.ttl(key)
+                ttls = await pipe.execute()
+
+            for key, ttl in zip(keys, ttls):
+                plot_id = self._text(key).rsplit(":", 1)[-1]
+                if ttl and ttl > recent.get(plot_id, -1):
+                    recent[plot_id] = ttl
+        except Exception as e:
+            logger.warning(f"Redis SCAN failed: {e}")
+
+        return self._order_by_ttl(recent, limit)
+
+    async def append_messages(self, user_id, plot_id, messages,
+                              ttl=CHAT_MEMORY_TTL, max_msg=CHAT_MEMORY_MAX):
+        """
+        Appends messages and keeps only the last max_msg, atomically,
+        so concurrent turns of the same conversation cannot drop messages
+        """
+        key = self._chat_key(user_id, plot_id)
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.rpush(key, *[self._serialize(m) for m in messages])
+                pipe.ltrim(key, -max_msg, -1)
+                pipe.expire(key, ttl)
+                await pipe.execute()
+        except redis.ResponseError as e:
+            if not self._is_wrongtype(e):
+                logger.warning(f"Redis RPUSH failed: {e}")
+                return
+            # legacy JSON string memory → rewrite it as a list
+            legacy = await self.get(key) or []
+            await self.delete(key)
+            await self.append_messages(user_id, plot_id, legacy + list(messages), ttl, max_msg)
+        except Exception as e:
+            logger.warning(f"Redis RPUSH failed: {e}")
+
+    async def save_message(self, user_id, plot_id, role, message,
+                           ttl=CHAT_MEMORY_TTL, max_msg=CHAT_MEMORY_MAX):
+        await self.append_messages(
+            user_id, plot_id, [self._chat_entry(role, message)], ttl, max_msg
+        )
+
+    async def save_exchange(self, user_id, plot_id, user_message, bot_message=None,
+                            ttl=CHAT_MEMORY_TTL, max_msg=CHAT_MEMORY_MAX):
+        """Records the user turn and the bot reply in one round trip"""
+        await self.append_messages(
+            user_id, plot_id, self._exchange(user_message, bot_message), ttl, max_msg
         )
 
 
 # =========================================================
-# SINGLETON INSTANCE
+# SINGLETON INSTANCES
 # =========================================================
 
-redis_manager = RedisManager()
+# async manager for the app (connections are opened lazily on first use)
+redis_manager = AsyncRedisManager()
+
+_sync_redis_manager = None
+
+
+def get_sync_redis_manager() -> RedisManager:
+    """Blocking manager for scripts, created on first use"""
+    global _sync_redis_manager
+    if _sync_redis_manager is None:
+        _sync_redis_manager = RedisManager()
+    return _sync_redis_manager
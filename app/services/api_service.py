@@ -7,11 +7,19 @@ Handles all backend API calls with caching and error handling
 
 import httpx
 import os
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from cachetools import TTLCache
 from dotenv import load_dotenv
 from app.memory.redis_manager import redis_manager
+from app.utils.rate_limit import UpstreamRateBudget
+from app.utils.resilience import UpstreamGuard
+from app.utils.hedging import HedgeBudget, Hedger, LatencyTracker
+from app.utils.upstream_cache import NotModified, cached_upstream, conditional_stats, current_exchange, today
+from app.services.plot_index import build_plot_index
+from app.services.http_client import get_http_client
 
 
 load_dotenv()
@@ -24,6 +32,16 @@ EVENTS_API_URL = os.getenv("EVENTS_API_URL", "https://events-cropeye.up.railway.
 FIELD_API_URL = os.getenv("FIELD_API_URL", "https://sef-cropeye.up.railway.app")
 WEATHER_API_URL = os.getenv("WEATHER_API_URL", "https://weather-cropeye.up.railway.app")
 
+# every host gets its own connection pool on the shared client
+UPSTREAM_URLS = (
+    BASE_URL,
+    SOIL_API_URL,
+    PLOT_API_URL,
+    EVENTS_API_URL,
+    FIELD_API_URL,
+    WEATHER_API_URL,
+)
+
 
 
 # # Cache configuration
@@ -36,14 +54,115 @@ WEATHER_API_URL = os.getenv("WEATHER_API_URL", "https://weather-cropeye.up.railw
 # yield_cache = TTLCache(maxsize=500, ttl=1800)  # 30 minutes
 
 
+# Breaker + bulkhead per upstream host, shared by every APIService
+upstream_guard = UpstreamGuard(
+    failure_threshold=int(os.getenv("UPSTREAM_BREAKER_FAILURES", 5)),
+    recovery_timeout=float(os.getenv("UPSTREAM_BREAKER_RECOVERY", 30)),
+    max_concurrent=int(os.getenv("UPSTREAM_BULKHEAD_SIZE", 10)),
+    max_wait=float(os.getenv("UPSTREAM_BULKHEAD_WAIT", 5)),
+)
+
+
+# Hedging for idempotent GETs with a long latency tail: a second attempt
+# after the endpoint's p95, for at most UPSTREAM_HEDGE_RATIO of calls
+UPSTREAM_HEDGING_ENABLED = os.getenv("UPSTREAM_HEDGING_ENABLED", "true").lower() == "true"
+
+upstream_hedger = Hedger(
+    LatencyTracker(
+        window=int(os.getenv("UPSTREAM_HEDGE_WINDOW", 200)),
+        min_samples=int(os.getenv("UPSTREAM_HEDGE_MIN_SAMPLES", 20)),
+    ),
+    HedgeBudget(
+        ratio=float(os.getenv("UPSTREAM_HEDGE_RATIO", 0.1)),
+        burst=int(os.getenv("UPSTREAM_HEDGE_BURST", 5)),
+    ),
+)
+
+
+# Per-upstream rate budget for the current task tree (None → unlimited).
+# Set by background jobs such as the bulk warm-up so they cannot
+# starve interactive traffic on any single upstream.
+_rate_budget: ContextVar[Optional[UpstreamRateBudget]] = ContextVar("upstream_rate_budget", default=None)
+
+
+@contextmanager
+def upstream_rate_budget(budget: Optional[UpstreamRateBudget]):
+    """Apply `budget` to every upstream call made inside this context (and tasks it spawns)"""
+    reset_token = _rate_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _rate_budget.reset(reset_token)
+
+
+def current_rate_budget() -> Optional[UpstreamRateBudget]:
+    """Rate budget of the current task tree; set only for background jobs"""
+    return _rate_budget.get()
+
+
+def _days_ago(days: int) -> str:
+    return (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+# Satellite products change only with a new scene: their cache entries stay
+# servable (and are revalidated in the background) for days, not hours
+SATELLITE_STALE_TTL = int(os.getenv("SATELLITE_STALE_TTL", 3 * 86400))
+
+_ACQUISITION_FIELDS = ("latest_image_date", "image_date", "acquisition_date", "sensing_date")
+
+
+def satellite_acquisition_date(data: Any) -> Optional[str]:
+    """Scene date (YYYY-MM-DD) reported by a satellite product, if any"""
+    if not isinstance(data, dict):
+        return None
+
+    features = data.get("features") or [{}]
+    candidates = [
+        data.get("pixel_summary"),
+        data,
+        data.get("metadata"),
+        features[0].get("properties") if isinstance(features[0], dict) else None,
+    ]
+
+    for source in candidates:
+        if not isinstance(source, dict):
+            continue
+        for field in _ACQUISITION_FIELDS:
+            value = str(source.get(field) or "")[:10]
+            try:
+                return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+
+    return None
+
+
+def _with_soil_metadata(data: Dict[str, Any], cache_key: str, from_cache: bool) -> Dict[str, Any]:
+    """Soil analysis callers expect where the answer came from"""
+    data = dict(data)
+    data["_from_cache"] = from_cache
+    data["_api_called"] = not from_cache
+    data["_cache_key"] = cache_key
+    return data
+
+
+def get_upstream_client() -> httpx.AsyncClient:
+    return get_http_client(UPSTREAM_URLS)
+
+
 class APIService:
-    """Centralized API service for chatbot"""
+    """
+    Centralized API service for chatbot.
+    Cheap to create: holds only the caller's token, every request
+    goes through the shared upstream client.
+    """
     
     def __init__(self, auth_token: Optional[str] = None):
         self.auth_token = auth_token
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            follow_redirects=True)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return get_upstream_client()
     
     # def _get_headers(self) -> Dict[str, str]:
     #     """Get headers with authentication if available"""
@@ -57,6 +176,65 @@ class APIService:
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """One attempt, guarded by the host's breaker and bulkhead"""
+        async with upstream_guard.guard(url) as breaker:
+            response = await self.client.request(method, url, **kwargs)
+
+            # 5xx means the host is struggling; 4xx is the caller's problem
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return response
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        hedge: Optional[str] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Single choke point for every upstream call.
+        Fails fast with CircuitOpenError / BulkheadFullError (both
+        httpx.HTTPError) while the host is unhealthy or saturated.
+        Inside a conditional getter, a GET carries the cached validators
+        and raises NotModified on a 304 so the body is never read; a 412
+        drops the validators and the call is repeated unconditionally.
+        `hedge` names the endpoint of an idempotent GET that may be hedged.
+        """
+        budget = _rate_budget.get()
+        if budget:
+            await budget.acquire(url)
+
+        exchange = current_exchange()
+        conditional = exchange.request_headers(method) if exchange else {}
+        headers = kwargs.pop("headers", None) or {}
+
+        response = await self._dispatch(method, url, hedge, headers={**headers, **conditional}, **kwargs)
+
+        if conditional and response.status_code == 412:
+            conditional_stats["precondition_failed"] += 1
+            print(f"[API SERVICE] {url} rejected cached validators (412), refetching")
+            exchange.validators = {}
+            response = await self._dispatch(method, url, hedge, headers=headers, **kwargs)
+
+        if exchange:
+            exchange.record(response)
+            if response.status_code == 304:
+                raise NotModified(url)
+
+        return response
+
+    async def _dispatch(self, method: str, url: str, hedge: Optional[str], **kwargs) -> httpx.Response:
+        if hedge and method == "GET" and UPSTREAM_HEDGING_ENABLED:
+            return await upstream_hedger.run(
+                hedge, lambda: self._send(method, url, **kwargs)
+            )
+        return await self._send(method, url, **kwargs)
+
     # ----------------------------------------------------------------
 
     # async def get_farmer_profile(self, user_id: Optional[int] = None) -> Dict[str, Any]:
@@ -83,24 +261,19 @@ class APIService:
     #         return {"error": f"Failed to fetch farmer profile: {str(e)}"}
     
 
+    @cached_upstream("public_plots", ttl=3600, stale_ttl=82800)
     async def get_public_plots(self) -> Dict[str, Any]:
         """
         Get public plots (no auth required)
         API: GET /plots/public/
         """
-        cache_key = "public_plots"
-
-        cached = redis_manager.get(cache_key)
-        if cached:
-            return cached
-
         try:
             url = f"{BASE_URL}/plots/public/"
-            response = await self.client.get(url)  # ❌ no headers
+            response = await self._request("GET", url)  # ❌ no headers
             response.raise_for_status()
             data = response.json()
 
-            redis_manager.set(cache_key, data, ttl=3600)
+            await build_plot_index(data)
             return data
 
         except httpx.HTTPError as e:
@@ -110,27 +283,22 @@ class APIService:
     # DASHBOARD APIs
     # ==================================================
 
+    @cached_upstream("stress_{plot_id}", ttl=3600)
     async def get_stress_events(self, plot_id: str) -> Dict[str, Any]:
 
-        cache_key = f"stress_{plot_id}"
-
-        cached = redis_manager.get(cache_key)
-        if cached:
-            return cached
         try:
             url = f"{EVENTS_API_URL}/plots/{plot_id}/stress"
 
-            response = await self.client.get(
+            response = await self._request(
+                "GET",
                 url,
+                hedge="events:stress",
                 params={"index_type": "NDRE", "threshold": 0.15},
                 headers=self._get_headers()
             )
 
             response.raise_for_status()
-            data = response.json()
-            # # # data["_source"] = "api"
-            redis_manager.set(cache_key, data, ttl=3600)
-            return data
+            return response.json()
 
         except httpx.HTTPError as e:
             return {"error": f"Stress fetch failed: {str(e)}"}
@@ -138,48 +306,39 @@ class APIService:
 
     # ----------------------------------------------------------------
 
+    @cached_upstream("harvest_status_{plot_id}", ttl=3600)
     async def get_harvest_status(self, plot_id: str) -> Dict[str, Any]:
 
-        cache_key = f"harvest_status_{plot_id}"
-
-        cached = redis_manager.get(cache_key)
-        if cached:
-
-            return cached
-
         try:
             url = f"{EVENTS_API_URL}/sugarcane-harvest"
-            response = await self.client.post(
+            response = await self._request(
+                "POST",
                 url,
                 params={"plot_name": plot_id},
                 headers=self._get_headers()
             )
             response.raise_for_status()
-            data = response.json()
-            # # # # data["_source"] = "api"
-            redis_manager.set(cache_key, data, ttl=3600)
-            return data
+            return response.json()
 
         except httpx.HTTPError as e:
             return {"error": f"Harvest status fetch failed: {str(e)}"}
 
     # ----------------------------------------------------------------
+    @cached_upstream(
+        "agro_stats_{plot_id}_{end_date}",
+        ttl=3600,
+        date_args=("end_date",),
+        conditional=True
+    )
     async def get_agro_stats( self, plot_id: str, end_date: Optional[str] = None) -> Dict[str, Any]:
 
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-
-        cache_key = f"agro_stats_{plot_id}_{end_date}"
-
-        cached = redis_manager.get(cache_key)
-        if cached:
-            return cached
-
         try:
             url = f"{EVENTS_API_URL}/plots/agroStats"
 
-            response = await self.client.get(
+            response = await self._request(
+                "GET",
                 url,
+                hedge="events:agroStats",
                 params={
                     "plot_name": plot_id,
                     "end_date": end_date
@@ -188,15 +347,11 @@ class APIService:
             )
             response.raise_for_status()
             data = response.json()
-            # # # data["_source"] = "api"
             # Filter only requested plot
             if plot_id in data:
-                data = data[plot_id]
-            else:
-                return {"error": "Plot not found in agro stats"}
+                return data[plot_id]
 
-            redis_manager.set(cache_key, data, ttl=3600)
-            return data
+            return {"error": "Plot not found in agro stats"}
 
         except httpx.HTTPError as e:
             return {"error": f"Agro stats fetch failed: {str(e)}"}
@@ -204,6 +359,15 @@ class APIService:
 
     # ----------------------------------------------------------------
 
+    @cached_upstream(
+        "soil_analysis_{plot_name}_{date}",
+        ttl=43200,
+        stale_ttl=SATELLITE_STALE_TTL,
+        date_args=("date",),
+        annotate=_with_soil_metadata,
+        latest="soil_analysis_{plot_name}_{fe_days_back}",
+        acquired_at=satellite_acquisition_date
+    )
     async def get_soil_analysis(self, plot_name: str, date: Optional[str] = None, fe_days_back: int = 30 ) -> Dict[str, Any]:
         """
         Get complete soil analysis for a plot
@@ -211,20 +375,6 @@ class APIService:
         Returns: N, P, K, pH, CEC, OC, BD, Fe, SOC
         Includes metadata: _from_cache, _api_called, _cache_key
         """
-        if date is None:
-            date = datetime.now().strftime("%Y-%m-%d")
-        
-        cache_key = f"soil_analysis_{plot_name}_{date}"
-        cached_data = redis_manager.get(cache_key)
-
-        if cached_data:
-            cached_data = cached_data.copy()
-            cached_data["_from_cache"] = True
-            cached_data["_api_called"] = False
-            cached_data["_cache_key"] = cache_key
-            print(f"[API SERVICE] Returning cached soil data for {plot_name} (cache_key: {cache_key})")
-            return cached_data
-        
         try:
             url = f"{SOIL_API_URL}/analyze"
             params = {
@@ -233,51 +383,31 @@ class APIService:
                 "fe_days_back": fe_days_back
             }
             print(f"[API SERVICE] Making API call to {url} with params: {params}")
-            response = await self.client.post(url, params=params, headers=self._get_headers())
+            response = await self._request("POST", url, params=params, headers=self._get_headers())
             response.raise_for_status()
             data = response.json()
-            
-            # Add metadata
-            data["_from_cache"] = False
-            data["_api_called"] = True
-            data["_cache_key"] = cache_key
-            
-            # Store in cache (without metadata to keep cache clean)
-            cache_data = {k: v for k, v in data.items() if not k.startswith("_")}
-            redis_manager.set(cache_key, cache_data, ttl=43200)
-            
-            print(f"[API SERVICE] API call successful for {plot_name}, data cached (cache_key: {cache_key})")
-            return data
+
+            print(f"[API SERVICE] API call successful for {plot_name}")
+            # cached without metadata; it is added per call
+            return {k: v for k, v in data.items() if not k.startswith("_")}
 
         except httpx.HTTPStatusError as e:
             print(f"[API SERVICE] HTTP error for {plot_name}: {e.response.status_code} - {e.response.text}")
-            return {
-                "error": f"HTTP {e.response.status_code}: Failed to fetch soil analysis",
-                "_from_cache": False,
-                "_api_called": True,
-                "_cache_key": cache_key
-            }
+            return {"error": f"HTTP {e.response.status_code}: Failed to fetch soil analysis"}
         except httpx.RequestError as e:
             print(f"[API SERVICE] Request error for {plot_name}: {str(e)}")
-            return {
-                "error": f"Request failed: {str(e)}",
-                "_from_cache": False,
-                "_api_called": True,
-                "_cache_key": cache_key
-            }
+            return {"error": f"Request failed: {str(e)}"}
+        except NotModified:
+            raise
         except Exception as e:
             print(f"[API SERVICE] Unexpected error for {plot_name}: {str(e)}")
             import traceback
             traceback.print_exc()
-            return {
-                "error": f"Unexpected error: {str(e)}",
-                "_from_cache": False,
-                "_api_called": True,
-                "_cache_key": cache_key
-            }
+            return {"error": f"Unexpected error: {str(e)}"}
 
     # ----------------------------------------------------------------
 
+    @cached_upstream("npk_requirements_{plot_name}_{end_date}", ttl=43200, date_args=("end_date",))
     async def get_npk_requirements(
         self,
         plot_name: str,
@@ -287,44 +417,23 @@ class APIService:
         Get NPK requirements and fertilizer recommendations
         API: POST /required-n/{plot_name}?end_date={date}
         """
-        if end_date is None:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        
-        cache_key = f"npk_requirements_{plot_name}_{end_date}"
-        
-        cached = redis_manager.get(cache_key)
-        if cached:
-            return cached
-
-        
         try:
             url = f"{SOIL_API_URL}/required-n/{plot_name}"
             params = {"end_date": end_date}
-            response = await self.client.post(url, params=params, headers=self._get_headers())
+            response = await self._request("POST", url, params=params, headers=self._get_headers())
 
             response.raise_for_status()
-            data = response.json()
-            # # # data["_source"] = "api"
-        #     soil_cache[cache_key] = data
-        #     return data
-        # except httpx.HTTPStatusError as e:
-        #     return {"error": f"HTTP {e.response.status_code}: Failed to fetch NPK requirements"}
-        # except httpx.RequestError as e:
-        #     print(f"[API SERVICE] Request error for NPK requirements {plot_name}: {str(e)}")
-        #     return {"error": f"Request failed: {str(e)}"}
-        # except Exception as e:
-        #     print(f"[API SERVICE] Unexpected error for NPK requirements {plot_name}: {str(e)}")
-        #     import traceback
-        #     traceback.print_exc()
-        #     return {"error": f"Unexpected error: {str(e)}"}
-            
-            redis_manager.set(cache_key, data, ttl=43200)
-            return data
+            return response.json()
 
         except httpx.HTTPError as e:
             return {"error": f"Failed to fetch NPK requirements: {str(e)}"}
     # ----------------------------------------------------------------
 
+    @cached_upstream(
+        "npk_analysis_{plot_name}_{end_date}_{days_back}",
+        ttl=43200,
+        date_args=("end_date",)
+    )
     async def get_npk_analysis(
         self,
         plot_name: str,
@@ -335,29 +444,16 @@ class APIService:
         Get NPK analysis with time series data
         API: POST /analyze-npk/{plot_name}?end_date={date}&days_back=7
         """
-        if end_date is None:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        
-        cache_key = f"npk_analysis_{plot_name}_{end_date}_{days_back}"
-        
-        cached = redis_manager.get(cache_key)
-        if cached:
-            return cached
-
-        
         try:
             url = f"{SOIL_API_URL}/analyze-npk/{plot_name}"
             params = {
                 "end_date": end_date,
                 "days_back": days_back
             }
-            response = await self.client.post(url, params=params, headers=self._get_headers())
+            response = await self._request("POST", url, params=params, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
-            # # # data["_source"] = "api"
-            redis_manager.set(cache_key, data, ttl=43200)
+            return response.json()
 
-            return data
         except httpx.HTTPError as e:
             return {"error": f"Failed to fetch NPK analysis: {str(e)}"}
     
@@ -366,21 +462,19 @@ class APIService:
     # MAP APIs (Spatial Intelligence)
     # ==================================================
 
+    @cached_upstream(
+        "soil_moisture_map_{plot_name}_{end_date}",
+        ttl=43200,
+        stale_ttl=SATELLITE_STALE_TTL,
+        date_args=("end_date",),
+        latest="soil_moisture_map_{plot_name}",
+        acquired_at=satellite_acquisition_date
+    )
     async def get_soil_moisture_map(self, plot_name: str, end_date: str = None) -> dict:
         """
         Get satellite soil moisture map (GeoJSON / raster)
         API: POST /SoilMoisture
         """
-        end_date = end_date or datetime.now().strftime("%Y-%m-%d")
-        # if end_date is None:
-        #     end_date = datetime.now().strftime("%Y-%m-%d")
-
-        cache_key = f"soil_moisture_map_{plot_name}_{end_date}"
-
-        cached = redis_manager.get(cache_key)
-        if cached:
-            return cached
-
         print(f"[SOIL MAP] plot_name={plot_name}, end_date={end_date}")
 
         try:
@@ -389,93 +483,87 @@ class APIService:
                 "plot_name": plot_name,
                 "end_date": end_date
             }
-            print("API data")
-            response = await self.client.post(url, params=params, headers=self._get_headers())
+            response = await self._request("POST", url, params=params, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
-
-            # # # data["_source"] = "api"
-
-            redis_manager.set(cache_key, data, ttl=43200)
-            return data
+            return response.json()
 
         except httpx.HTTPError as e:
             return {"error": f"Failed to fetch soil moisture map: {str(e)}"}
 
     # ----------------------------------------------------------------
     
+    @cached_upstream(
+        "water_uptake_map_{plot_id}_{end_date}",
+        ttl=43200,
+        stale_ttl=SATELLITE_STALE_TTL,
+        date_args=("end_date",),
+        latest="water_uptake_map_{plot_id}",
+        acquired_at=satellite_acquisition_date
+    )
     async def get_water_uptake_map(self, plot_id: str, end_date: Optional[str] = None) -> dict:
         """
         Satellite water uptake map
         API: POST /wateruptake
         """
-        end_date = end_date or datetime.now().strftime("%Y-%m-%d")
-        cache_key = f"water_uptake_map_{plot_id}_{end_date}"
-
-        cached = redis_manager.get(cache_key)
-        if cached:
-            return cached
-
         try:
-            response = await self.client.post(
+            response = await self._request(
+                "POST",
                 f"{PLOT_API_URL}/wateruptake",
                 params={"plot_name": plot_id, "end_date": end_date},
                 headers=self._get_headers()
             )
             response.raise_for_status()
-            data = response.json()
-            # # # data["_source"] = "api"
-            redis_manager.set(cache_key, data, ttl=43200)
-            return data
+            return response.json()
 
         except httpx.HTTPError as e:
             return {"error": f"Water uptake map fetch failed: {str(e)}"}
    
     # ----------------------------------------------------------------
     
+    @cached_upstream(
+        "pest_map_{plot_id}_{end_date}",
+        ttl=43200,
+        stale_ttl=SATELLITE_STALE_TTL,
+        date_args=("end_date",),
+        latest="pest_map_{plot_id}",
+        acquired_at=satellite_acquisition_date
+    )
     async def get_pest_map(self, plot_id: str, end_date: Optional[str] = None) -> dict:
         """
         Get pest satellite map layer
         API: POST /pest-map
         """
-        end_date = end_date or datetime.now().strftime("%Y-%m-%d")
-        cache_key = f"pest_map_{plot_id}_{end_date}"
-
-        cached = redis_manager.get(cache_key)
-        if cached:
-            return cached
-
         try:
-            response = await self.client.post(
+            response = await self._request(
+                "POST",
                 f"{PLOT_API_URL}/pest-detection",
                 params={"plot_name": plot_id, "end_date": end_date},
                 headers=self._get_headers()
             )
             response.raise_for_status()
-            data = response.json()
-            # # # data["_source"] = "api"
-            redis_manager.set(cache_key, data, ttl=43200)
-            return data
+            return response.json()
 
         except httpx.HTTPError as e:
             return {"error": f"Pest map fetch failed: {str(e)}"}
 
     # ----------------------------------------------------------------
     
+    @cached_upstream(
+        "growth_map_{plot_id}_{end_date}",
+        ttl=43200,
+        stale_ttl=SATELLITE_STALE_TTL,
+        date_args=("end_date",),
+        latest="growth_map_{plot_id}",
+        acquired_at=satellite_acquisition_date
+    )
     async def get_growth_map(self, plot_id: str, end_date: Optional[str] = None) -> dict:
         """
         Satellite crop growth map
         API: POST /analyze_Growth
         """
-        end_date = end_date or datetime.now().strftime("%Y-%m-%d")
-        cache_key = f"growth_map_{plot_id}_{end_date}"
-
-        cached = redis_manager.get(cache_key)
-        if cached:
-            return cached
-
         try:
-            response = await self.client.post(
+            response = await self._request(
+                "POST",
                 f"{PLOT_API_URL}/analyze_Growth",
                 params={
                     "plot_name": plot_id,
@@ -483,31 +571,27 @@ class APIService:
                 },
                 headers=self._get_headers()
             )
-            response.raise_for_status()            
-            data = response.json()
-            # # # data["_source"] = "api"
-            redis_manager.set(cache_key, data, ttl=43200)
-            return data
+            response.raise_for_status()
+            return response.json()
 
         except httpx.HTTPError as e:
             return {"error": f"Growth map fetch failed: {str(e)}"}
 
     # ----------------------------------------------------------------
     
+    @cached_upstream(
+        "pest_detection_{plot_id}_{end_date}_{days_back}",
+        ttl=43200,
+        stale_ttl=SATELLITE_STALE_TTL,
+        date_args=("end_date",),
+        latest="pest_detection_{plot_id}_{days_back}",
+        acquired_at=satellite_acquisition_date
+    )
     async def get_pest_detection(self, plot_id: str, end_date: Optional[str] = None, days_back: int = 7) -> dict:
         """
         Get pest detection data from API
         API: POST /pest-detection?plot_name={plot_id}&end_date={end_date}&days_back={days_back}
         """
-        if end_date is None:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-        
-        cache_key = f"pest_detection_{plot_id}_{end_date}_{days_back}"
-        
-        cached = redis_manager.get(cache_key)
-        if cached:  
-            return cached
-        
         try:
             # Use PLOT_API_URL for pest detection (same as other map endpoints)
             url = f"{PLOT_API_URL}/pest-detection"
@@ -517,110 +601,79 @@ class APIService:
                 "days_back": days_back
             }
             
-            response = await self.client.post(
+            response = await self._request(
+                "POST",
                 url,
                 params=params,
                 headers=self._get_headers()
             )
             response.raise_for_status()
-            data = response.json()
-            # # # data["_source"] = "api"
-            redis_manager.set(cache_key, data, ttl=43200)
-            return data
+            return response.json()
             
         except httpx.HTTPError as e:
             return {"error": f"Pest detection fetch failed: {str(e)}"}
 
     # ----------------------------------------------------------------
 
+    # ✅ cache ONLY success (the service answers failures with a non-list body)
+    @cached_upstream(
+        "field_soil_moisture_{plot_name}",
+        ttl=43200,
+        cache_if=lambda data: isinstance(data, list)
+    )
     async def get_soil_moisture_timeseries(self, plot_name: str) -> dict:
         """
         Get soil moisture timeseries from field service
         API: GET /soil-moisture/{plot_name}
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-        cache_key = f"field_soil_moisture_{plot_name}"
-
-        cached = redis_manager.get(cache_key)
-        if cached:  
-            return cached
-
         url = f"{FIELD_API_URL}/soil-moisture/{plot_name}"  
-        headers = self._get_headers()
 
         try:          
-            response = await self.client.post(url, headers=self._get_headers())
+            response = await self._request("POST", url, headers=self._get_headers())
             response.raise_for_status()
-            data = response.json()
-            # # # data["_source"] = "api"
-            #  ✅ cache ONLY success
-            if isinstance(data, list):
-                redis_manager.set(cache_key, data, ttl=43200)
-
-            return data
+            return response.json()
 
         except httpx.HTTPError as e:
             return {"error": f"Failed to fetch field soil moisture: {str(e)}"}
 
     # ----------------------------------------------------------------
 
+    @cached_upstream(
+        lambda args: f"et_{args['plot_id']}_{_days_ago(7)}_{today()}",
+        ttl=43200
+    )
     async def get_evapotranspiration(self, plot_id: str) -> Dict[str, Any]:
         """
         Evapotranspiration (ET) for irrigation logic
         API: GET /plots/{plot_id}/compute-et/
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-        cache_key = f"et_{plot_id}_{start_date}_{today}"
-
-        cached = redis_manager.get(cache_key)
-        if cached:
-            return cached
-
-        url = f"{FIELD_API_URL}/plots/{plot_id}/compute-et/"
-
-        # print("\n========== ET API REQUEST ==========")
-        # print("METHOD = POST")
-        # print("URL =", url)
-        # print("HEADERS =", self._get_headers())
-        # print("====================================")
-        
         try:
             url = f"{FIELD_API_URL}/plots/{plot_id}/compute-et/"
             body = {
                 "plot_name": plot_id,
-                "start_date": start_date,
-                "end_date": today,
+                "start_date": _days_ago(7),
+                "end_date": today(),
             }
-            response = await self.client.post(
+            response = await self._request(
+                "POST",
                 url,
                 json=body,
                 headers=self._get_headers()
             )
             response.raise_for_status()
-            data = response.json()
-            # # # data["_source"] = "api"
-
-            redis_manager.set(cache_key, data, ttl=43200)
-            return data
+            return response.json()
 
         except httpx.HTTPError as e:
             return {"error": f"ET fetch failed: {str(e)}"}
         
     # ----------------------------------------------------------------
 
+    @cached_upstream("current_weather_{plot_id}", ttl=7200)
     async def get_current_weather(self, plot_id: str, lat: float, lon: float) -> Dict[str, Any]:
         """
         Get current weather for marquee & irrigation cards
         API: GET /current-weather?plot_id=
         """
-        cache_key = f"current_weather_{plot_id}"
-
-        cached = redis_manager.get(cache_key)
-        if cached:
-            print(f"[CURRENT WEATHER] Returning cached data for {plot_id}")
-            return cached
-
         try:
             url = f"{WEATHER_API_URL}/current-weather"
             params = {
@@ -629,32 +682,26 @@ class APIService:
                 "lon": lon, 
             }
 
-            response = await self.client.get(
+            response = await self._request(
+                "GET",
                 url,
+                hedge="weather:current",
                 params=params,
                 headers=self._get_headers()
             )
             response.raise_for_status()
-            data = response.json()
-            # # # data["_source"] = "api"
-            redis_manager.set(cache_key, data, ttl=7200)
-            return data
+            return response.json()
 
         except httpx.HTTPError as e:
             return {"error": f"Failed to fetch current weather: {str(e)}"}
 
     # ----------------------------------------------------------------
+    @cached_upstream("weather_forecast_{plot_id}", ttl=7200)
     async def get_weather_forecast(self, plot_id: str, lat: float, lon: float) -> Dict[str, Any]:
         """
         Get 7-day weather forecast (starts from tomorrow)
         API: GET /forecast?plot_id=
         """
-        cache_key = f"weather_forecast_{plot_id}"
-
-        cached = redis_manager.get(cache_key)
-        if cached:
-            return cached
-
         try:
             url = f"{WEATHER_API_URL}/forecast"
             params = {
@@ -663,38 +710,31 @@ class APIService:
                 "lon": lon
             }
 
-            response = await self.client.get(
+            response = await self._request(
+                "GET",
                 url,
+                hedge="weather:forecast",
                 params=params,
                 headers=self._get_headers()
             )
             response.raise_for_status()
-            data = response.json()
-            # # # data["_source"] = "api"
-            redis_manager.set(cache_key, data, ttl=7200)
-            return data
+            return response.json()
 
         except httpx.HTTPError as e:
             return {"error": f"Failed to fetch weather forecast: {str(e)}"}
 
     # ----------------------------------------------------------------
 
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
-
 
 
-# Global API service instance (will be initialized with auth token when available)
-api_service: Optional[APIService] = None
+# Anonymous instance shared by background jobs and token-less requests
+api_service = APIService()
 
 def get_api_service(auth_token: Optional[str] = None) -> APIService:
-    """Get or create API service instance"""
-    global api_service
-    if api_service is None or (auth_token and api_service.auth_token != auth_token):
-        if api_service:
-            # Close existing client
-            import asyncio
-            asyncio.create_task(api_service.close())
-        api_service = APIService(auth_token=auth_token)
-    return api_service
+    """
+    API service for auth_token. The shared HTTP client outlives every
+    instance, so switching tokens never closes a client in use.
+    """
+    if not auth_token:
+        return api_service
+    return APIService(auth_token=auth_token)
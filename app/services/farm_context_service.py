@@ -5,9 +5,12 @@ Farm Context Service
 Extracts and manages farm context (plot, crop, plantation date, etc.)
 """
 
+import os
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
+from cachetools import TTLCache
 from app.services.api_service import get_api_service
+from app.services.plot_index import get_plot_entry
 import json
 from pathlib import Path
 
@@ -18,6 +21,17 @@ if BUD_PATH.exists():
 else:
     raise ValueError("bud.json not found — KC calculation cannot run")
 
+# stage → kc, first match in schedule order (same lookup get_kc used to walk)
+KC_BY_STAGE: Dict[str, float] = {}
+for _method in BUD_DATA.get("fertilizer_schedule", []):
+    for _st in _method.get("stages", []):
+        KC_BY_STAGE.setdefault(_st["stage"], float(_st["kc"]))
+
+# farm context only changes with the date, so one build per plot per day
+# is shared by /chat and every agent of the turn
+FARM_CONTEXT_TTL = int(os.getenv("FARM_CONTEXT_TTL", 300))
+_context_cache: TTLCache = TTLCache(maxsize=1000, ttl=FARM_CONTEXT_TTL)
+
 def get_stage(days):
     if days > 210:
         return "Maturity & Ripening"
@@ -28,10 +42,8 @@ def get_stage(days):
     return "Germination"
 
 def get_kc(stage):
-    for method in BUD_DATA.get("fertilizer_schedule", []):
-        for st in method.get("stages", []):
-            if st["stage"] == stage:
-                return float(st["kc"])
+    if stage in KC_BY_STAGE:
+        return KC_BY_STAGE[stage]
     raise ValueError(f"KC not found in bud.json for stage {stage}")
 
 
@@ -88,67 +100,26 @@ async def get_farm_context(
     # if not auth_token:
     #     return {"error": "Authentication required"}
 
+    cache_key = (str(plot_name), datetime.now().strftime("%Y-%m-%d"))
+    cached = _context_cache.get(cache_key)
+    if cached:
+        return dict(cached)
+
     api_service = get_api_service(auth_token)
     # profile_data = await api_service.get_farmer_profile(user_id)
-    profile_data = await api_service.get_public_plots()
-
-    if "error" in profile_data:
-        return {"error": profile_data["error"]}
-
-    # farms = profile_data.get("results", [])
-
-    # if not farms:
-    #     return {"error": "No farms found"}
-
-    # # print("\n===== FULL FARMS DATA =====")
-    # # print(farms)
-
-    # selected_farm = None
-
-    # for farm in farms:
-
-    #     plot = farm.get("plot", {})
-
-    #     plot_id = f"{plot.get('gat_number')}_{plot.get('plot_number')}"
-
-    #     if str(plot_id) == str(plot_name):
-    #         selected_farm = farm
-    #         break
-
-    # if not selected_farm:
-    #     return {"error": f"Plot {plot_name} not found"}
-
-    plots = profile_data.get("results", [])
 
-    selected_plot = None
+    # single keyed read instead of scanning the public plots payload
+    plot = await get_plot_entry(api_service, plot_name)
 
-    for plot in plots:
-        pid = plot.get("fastapi_plot_id")
-
-        if str(pid) == str(plot_name):
-            selected_plot = plot
-            break
-
-    if not selected_plot:
+    if not plot:
         return {"error": f"Plot {plot_name} not found"}
 
-
-    # ✅ plantation date is directly here
-    # plantation_date = selected_farm.get("plantation_date")
-    # crop_data = selected_farm.get("crop_type", {})
-    # plantation_type = crop_data.get("plantation_type_display") or crop_data.get("plantation_type")
-    # planting_method = crop_data.get("planting_method_display") or crop_data.get("planting_method")
-
-
-    farms = selected_plot.get("farms", [])
-
-    if not farms:
+    if not plot.get("has_farm"):
         return {"error": "No farm data found for this plot"}
 
-    farm = farms[0]
-    plantation_date = farm.get("plantation_date")
-    plantation_type = farm.get("plantation_type")
-    planting_method = farm.get("planting_method")
+    plantation_date = plot.get("plantation_date")
+    plantation_type = plot.get("plantation_type")
+    planting_method = plot.get("planting_method")
 
 
     print("PLANTATION DATE =", plantation_date)
@@ -165,15 +136,10 @@ async def get_farm_context(
 
 
 
-    # plot = selected_farm.get("plot", {})
-    # location = plot.get("location", {}).get("coordinates", [])
-
-    location = selected_plot.get("location", {}).get("coordinates", [])
+    lat = plot.get("lat")
+    lon = plot.get("lon")
 
-    lon = location[0] if len(location) >= 2 else None
-    lat = location[1] if len(location) >= 2 else None
-
-    return {
+    context = {
         "plot_id": plot_name,
         "plantation_date": plantation_date,
         "crop_stage": crop_stage_info["stage"],
@@ -185,3 +151,25 @@ async def get_farm_context(
         "lon": lon,
         "error": None
     }
+
+    _context_cache[cache_key] = context
+    return dict(context)
+
+
+async def resolve_farm_context(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Farm context of the current turn.
+    Reuses the one the entrypoint put in GraphState, building (and
+    storing) it only when the turn started without one.
+    """
+    farm_context = state.get("farm_context")
+    if farm_context and not farm_context.get("error"):
+        return farm_context
+
+    context = state.get("context") or {}
+    farm_context = await get_farm_context(
+        plot_name=context.get("plot_id"),
+        auth_token=context.get("auth_token")
+    )
+    state["farm_context"] = farm_context
+    return farm_context
@@ -0,0 +1,82 @@
+# app/services/http_client.py
+
+"""
+Shared HTTP client for upstream APIs.
+One long-lived httpx.AsyncClient per worker, opened on app startup and
+closed on shutdown. Each upstream host gets its own connection pool
+(keep-alive, HTTP/2 when `h2` is installed), so a slow host cannot
+exhaust the connections of the others. Credentials are never set on
+the client; callers pass headers per request.
+"""
+
+import logging
+import os
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger("http_client")
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 30))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", 20))
+HTTP_MAX_KEEPALIVE_PER_HOST = int(os.getenv("HTTP_MAX_KEEPALIVE_PER_HOST", 10))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _transport() -> httpx.AsyncHTTPTransport:
+    """One pool, used for a single host"""
+    return httpx.AsyncHTTPTransport(
+        http2=HTTP2_ENABLED and _HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_PER_HOST,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        retries=1,
+    )
+
+
+def _build_client(upstream_urls: Iterable[str]) -> httpx.AsyncClient:
+    mounts = {_origin(url): _transport() for url in upstream_urls if url}
+
+    if HTTP2_ENABLED and not _HTTP2_AVAILABLE:
+        logger.warning("h2 not installed; upstream client falls back to HTTP/1.1")
+
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        follow_redirects=True,
+        mounts=mounts,
+        # hosts outside the known upstreams share one default pool
+        transport=_transport(),
+    )
+
+
+def get_http_client(upstream_urls: Iterable[str] = ()) -> httpx.AsyncClient:
+    """Shared client; created on first use (e.g. scripts without a lifespan)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client(upstream_urls)
+    return _client
+
+
+async def close_http_client():
+    global _client
+    client, _client = _client, None
+    if client and not client.is_closed:
+        await client.aclose()
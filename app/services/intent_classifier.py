@@ -0,0 +1,524 @@
+# app/services/intent_classifier.py
+
+"""
+Fast-path intent classifier, run before the LLM intent analyzer.
+
+Two local stages, tried in order:
+1. keyword / regex rules (English, Hindi, Marathi) for short, routine
+   messages ("weather", "show soil moisture map", "पाऊस पडेल का?")
+2. similarity to example phrases with a small multilingual sentence
+   embedding model (CPU, loaded lazily; opt-in, it pulls in torch)
+
+A result is only returned when it is unambiguous; everything else goes
+to the LLM, and so do short or anaphoric follow-ups ("and next week?")
+whose meaning depends on the conversation history. A sample of fast-path answers is re-checked by the LLM in
+the background so the agreement between the two can be tracked.
+"""
+
+import asyncio
+import importlib.util
+import os
+import random
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.utils.lazy import LazyResource, timed_import
+
+INTENT_FAST_PATH_ENABLED = os.getenv("INTENT_FAST_PATH_ENABLED", "true").lower() == "true"
+# longer messages usually carry more than one question: left to the LLM
+INTENT_FAST_PATH_MAX_WORDS = int(os.getenv("INTENT_FAST_PATH_MAX_WORDS", 12))
+
+# follow-ups this short are read against the history by the LLM
+INTENT_FOLLOWUP_MAX_WORDS = int(os.getenv("INTENT_FOLLOWUP_MAX_WORDS", 3))
+
+INTENT_EMBEDDINGS_ENABLED = os.getenv("INTENT_EMBEDDINGS_ENABLED", "false").lower() == "true"
+INTENT_EMBEDDING_MODEL = os.getenv("INTENT_EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2")
+INTENT_EMBEDDING_THRESHOLD = float(os.getenv("INTENT_EMBEDDING_THRESHOLD", 0.80))
+# best label must beat the runner-up by this much
+INTENT_EMBEDDING_MARGIN = float(os.getenv("INTENT_EMBEDDING_MARGIN", 0.05))
+
+# share of fast-path answers re-checked by the LLM in the background
+INTENT_SHADOW_RATE = float(os.getenv("INTENT_SHADOW_RATE", 0.05))
+
+
+# --------------------------------
+# Rules
+# --------------------------------
+# Devanagari words are matched as substrings: Python's \b does not
+# treat vowel signs as word characters.
+
+def _any(*patterns: str) -> re.Pattern:
+    return re.compile("|".join(patterns), re.IGNORECASE)
+
+
+# intent, patterns, [(query_type, patterns)], default query_type,
+# intents this rule wins against when both match
+RULES: List[Dict[str, Any]] = [
+    {
+        "intent": "map_view",
+        "match": _any(r"\bmaps?\b", "नकाशा", "नक्शा", "मॅप", "मैप"),
+        "query_types": [
+            ("soil_moisture_map", _any(r"\bmoisture\b", r"\bwet", r"\bdry\b", "ओलावा", "ओलसर", "नमी")),
+            ("water_uptake_map", _any(r"\buptake\b", "शोषण", "अवशोषण")),
+            ("growth_map", _any(r"\bgrowth\b", r"\bgrow", "वाढ", "विकास", "वृद्धि")),
+            ("pest_map", _any(r"\bpests?\b", r"\bstress", r"\bdisease", "कीड", "किड", "कीट", "रोग")),
+        ],
+        "require_query_type": True,
+        "beats": {"soil_moisture", "pest_risk", "dashboard_summary", "irrigation_advice"},
+    },
+    {
+        "intent": "irrigation_schedule",
+        "match": re.compile(
+            r"(?=.*(\birrigat|\bwater\b|पाणी|पानी|सिंचाई))"
+            r"(?=.*(\bschedule\b|\bplan\b|\b7[ -]?days?\b|\bseven days?\b|\bweek|\bnext\b|"
+            r"वेळापत्रक|नियोजन|पुढील|पुढच्या|अगले|अगल|हफ्ते|सप्ताह|आठवड|७ दिवस|7 दिवस))",
+            re.IGNORECASE | re.DOTALL,
+        ),
+        "query_types": [],
+        "default_query_type": "7_day_schedule",
+        "beats": {"irrigation_advice", "weather_forecast", "soil_moisture"},
+    },
+    {
+        "intent": "irrigation_advice",
+        "match": _any(
+            r"\birrigat", r"\bpump\b", r"\bwater (my|the) (crop|field|farm)",
+            "सिंचाई", "पाणी द्या", "पाणी द्याव", "पाणी देऊ", "पाणी सोड", "पानी दे", "पानी डाल", "पंप",
+        ),
+        "query_types": [
+            ("water_required", _any(r"\bhow much\b", r"\bhow long\b", r"\bquantity\b", r"\bliters?\b",
+                                    "किती", "कितना", "कितनी", "कितने")),
+        ],
+        "default_query_type": "irrigate_today",
+        "beats": {"weather_forecast", "soil_moisture"},
+    },
+    {
+        "intent": "fertilizer_advice",
+        "match": _any(r"\bfertili[sz]", r"\burea\b", r"\bdap\b", r"\bpotash\b", "खत(?!र)", "खाद", "उर्वरक", "युरिया", "यूरिया"),
+        "query_types": [
+            ("video_resources", _any(r"\bvideos?\b", r"\byoutube\b", r"\btutorials?\b", "व्हिडिओ", "वीडियो", "विडियो")),
+            ("fertilizer_schedule", _any(r"\bschedule\b", r"\bplan\b", r"\bwhen\b", r"\bnext\b",
+                                         "वेळापत्रक", "कधी", "कब", "पुढील", "अगले")),
+        ],
+        "default_query_type": "fertilizer_soil_npk_requirements",
+        "beats": {"soil_analysis"},
+    },
+    {
+        "intent": "pest_risk",
+        "match": _any(r"\bpests?\b", r"\bdiseases?\b", r"\bweeds?\b", r"\binsects?\b", r"\binfest",
+                      "कीड", "किड", "कीट", "रोग", "खरपतवार", "बीमारी"),
+        "query_types": [],
+        "default_query_type": None,
+        "beats": set(),
+    },
+    {
+        "intent": "soil_moisture",
+        "match": _any(r"\bmoisture\b", r"\bwet\b", r"\bdry\b", "ओलावा", "ओलसर", "नमी", "गीली", "सूखी"),
+        "query_types": [
+            ("soil_moisture_trend", _any(r"\btrend", r"\bgraph\b", r"\bhistory\b", r"\bweekly\b", r"\blast week\b",
+                                         "ट्रेंड", "आलेख", "ग्राफ", "मागील", "पिछले")),
+        ],
+        "default_query_type": "soil_moisture_current",
+        "beats": {"soil_analysis", "weather_forecast"},
+    },
+    {
+        "intent": "soil_analysis",
+        "match": _any(r"\bsoil\b", r"\bnpk\b", r"\bph\b", r"\bnitrogen\b", r"\bphosphorus\b", r"\bpotassium\b",
+                      "माती", "मातीची", "मिट्टी", "नायट्रोजन", "नत्र", "स्फुरद", "पालाश"),
+        "query_types": [],
+        "default_query_type": None,
+        "beats": set(),
+    },
+    {
+        "intent": "weather_forecast",
+        "match": _any(r"\bweather\b", r"\bforecast\b", r"\brain", r"\btemperature\b", r"\bhumidity\b", r"\bwind\b",
+                      "मौसम", "बारिश", "तापमान", "हवामान", "पाऊस", "पाउस", "वारा", "हवा", "आर्द्रता"),
+        "query_types": [],
+        "default_query_type": None,
+        "beats": set(),
+    },
+    {
+        "intent": "dashboard_summary",
+        "match": _any(r"\bdashboard\b", r"\bsummary\b", r"\boverall\b", r"\bfarm (condition|status)\b",
+                      r"\byield\b", r"\bproduction\b", r"\bsugar\b", r"\bsweet", r"\bbrix\b", r"\bstress",
+                      r"\bharvest", r"\bbiomass\b", r"\bcrop (strength|growth)\b",
+                      "उत्पादन", "उत्पन्न", "पैदावार", "साखर", "चीनी", "शुगर", "ताण", "तनाव",
+                      "कापणी", "कटाई", "बायोमास", "शेताची स्थिती", "खेत की स्थिति"),
+        "query_types": [
+            ("yield_info", _any(r"\byield\b", r"\bproduction\b", "उत्पादन", "उत्पन्न", "पैदावार")),
+            ("sugar_content_check", _any(r"\bsugar\b", r"\bsweet", r"\bbrix\b", "साखर", "चीनी", "शुगर")),
+            ("stress_check", _any(r"\bstress", "ताण", "तनाव")),
+            ("crop_status_check", _any(r"\bharvest", r"\bready\b", "कापणी", "कटाई")),
+            ("biomass_check", _any(r"\bbiomass\b", r"\bcrop (strength|growth)\b", "बायोमास")),
+        ],
+        "default_query_type": None,
+        "beats": set(),
+    },
+]
+
+# whole message only: "hi", "thanks", "ok" ... anything longer may carry a question
+GREETING = re.compile(
+    r"^\s*(hi+|hello|hey|hii|thanks?|thank you|thanku|ok+|okay|bye|good (morning|evening|night)|"
+    r"नमस्ते|नमस्कार|राम राम|धन्यवाद|शुक्रिया|ठीक है|ठीक आहे|बरं)\s*[!.?।]*\s*$",
+    re.IGNORECASE,
+)
+
+# messages that lean on the previous turn: "and tomorrow?", "what about that?"
+ANAPHORIC = re.compile(
+    r"^\s*(and|also|what about|how about|then|same|but)\b"
+    r"|\b(that|those|them|same|there|then|again)\b"
+    r"|^\s*(और|फिर|तो|आणि|मग|पण|तर)(\s|$)"
+    r"|उसका|उसकी|उसके|वही|वहाँ|त्याचे|त्याची|त्याचा|तेच|तिथे",
+    re.IGNORECASE,
+)
+
+
+def is_followup(message: str, history: Optional[List[Dict[str, Any]]]) -> bool:
+    """True for a message whose intent may come from the conversation history"""
+    if not history:
+        return False
+    text = (message or "").strip()
+    if GREETING.match(text):
+        return False
+    return len(text.split()) <= INTENT_FOLLOWUP_MAX_WORDS or bool(ANAPHORIC.search(text))
+
+
+DATE_PATTERNS = [
+    ("day after tomorrow", _any(r"\bday after tomorrow\b", "परवा", "परसों")),
+    ("tomorrow", _any(r"\btomorrow\b", "उद्या", r"\bकल\b")),
+    ("today", _any(r"\btoday\b", "आज(?!ार)")),
+]
+
+PARAMETER_PATTERNS = [
+    ("pH", re.compile(r"\bph\b", re.IGNORECASE)),
+    ("nitrogen", _any(r"\bnitrogen\b", r"\bn\b", "नायट्रोजन", "नत्र")),
+    ("phosphorus", _any(r"\bphosphorus\b", r"\bp\b", "फॉस्फरस", "स्फुरद")),
+    ("potassium", _any(r"\bpotassium\b", r"\bk\b", "पोटॅशियम", "पोटेशियम", "पालाश")),
+]
+
+
+def _first_label(patterns, text: str) -> Optional[str]:
+    for label, pattern in patterns:
+        if pattern.search(text):
+            return label
+    return None
+
+
+def extract_entities(text: str, query_type: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "date": _first_label(DATE_PATTERNS, text),
+        "parameter": _first_label(PARAMETER_PATTERNS, text),
+        "query_type": query_type,
+    }
+
+
+def _match_rule(rule: Dict[str, Any], text: str):
+    """(matched, query_type, ambiguous)"""
+    if not rule["match"].search(text):
+        return False, None, False
+
+    query_types = [qt for qt, pattern in rule["query_types"] if pattern.search(text)]
+    if len(query_types) > 1:
+        return True, None, True
+    if query_types:
+        return True, query_types[0], False
+    if rule.get("require_query_type"):
+        return True, None, True
+    return True, rule.get("default_query_type"), False
+
+
+def classify_rules(message: str) -> Optional[Dict[str, Any]]:
+    """Intent + entities when exactly one rule applies; None otherwise"""
+    text = (message or "").strip()
+    if not text:
+        return None
+
+    if GREETING.match(text):
+        return {
+            "intent": "general_explanation",
+            "entities": {"date": None, "parameter": None, "query_type": None},
+        }
+
+    matches = []
+    for rule in RULES:
+        matched, query_type, ambiguous = _match_rule(rule, text)
+        if matched:
+            matches.append((rule, query_type, ambiguous))
+
+    # drop rules another matching rule wins against
+    winners = [
+        (rule, query_type, ambiguous)
+        for rule, query_type, ambiguous in matches
+        if not any(rule["intent"] in other["beats"] for other, _, _ in matches if other is not rule)
+    ]
+
+    if len(winners) != 1:
+        return None
+
+    rule, query_type, ambiguous = winners[0]
+    if ambiguous:
+        return None
+
+    return {"intent": rule["intent"], "entities": extract_entities(text, query_type)}
+
+
+# --------------------------------
+# Embedding similarity
+# --------------------------------
+
+EXAMPLES: Dict[tuple, List[str]] = {
+    ("map_view", "soil_moisture_map"): [
+        "Show soil moisture map", "Where is my field dry?", "मला माझ्या शेताचा ओलावा नकाशा दाखवा",
+        "खेत में नमी का नक्शा दिखाओ",
+    ],
+    ("map_view", "water_uptake_map"): [
+        "Show water uptake in my field", "पाणी शोषण नकाशा दाखवा", "पानी अवशोषण का नक्शा दिखाओ",
+    ],
+    ("map_view", "growth_map"): [
+        "Where is plant growth less?", "Show crop growth map", "पिकाची वाढ कुठे कमी आहे?",
+    ],
+    ("map_view", "pest_map"): [
+        "Which part of my farm is stressed?", "Show pest map of my field", "कीड कुठे आहे नकाशा दाखवा",
+    ],
+    ("soil_moisture", "soil_moisture_current"): [
+        "Is my soil wet?", "Current soil moisture level", "माझ्या शेतात माती ओलसर आहे का?",
+        "मिट्टी में कितनी नमी है?",
+    ],
+    ("soil_moisture", "soil_moisture_trend"): [
+        "Weekly soil moisture trend", "Show soil moisture graph", "मागील आठवड्यातील ओलावा कसा होता?",
+    ],
+    ("irrigation_advice", "irrigate_today"): [
+        "Should I irrigate today?", "When should I irrigate?", "मला आज पाणी द्यावे लागेल का?",
+        "क्या आज सिंचाई करनी चाहिए?",
+    ],
+    ("irrigation_advice", "water_required"): [
+        "How much water should I give?", "How long should I run the pump?", "किती पाणी द्यावे?",
+        "कितना पानी देना चाहिए?",
+    ],
+    ("irrigation_schedule", "7_day_schedule"): [
+        "7 day irrigation plan", "Irrigation schedule for this week", "Next week water requirement",
+        "पुढील ७ दिवस पाणी किती लागेल?", "अगले हफ्ते सिंचाई का प्लान",
+    ],
+    ("soil_analysis", None): [
+        "How is my soil?", "Tell me about my soil", "Is my soil good for crops?", "Soil NPK report",
+        "माझ्या मातीची स्थिती कशी आहे?", "मेरी मिट्टी कैसी है?",
+    ],
+    ("weather_forecast", None): [
+        "Will it rain tomorrow?", "Today's temperature", "7 day weather forecast",
+        "उद्या पाऊस पडेल का?", "कल बारिश होगी क्या?",
+    ],
+    ("fertilizer_advice", "fertilizer_soil_npk_requirements"): [
+        "Do I need fertilizer?", "What NPK should I apply?", "How much urea to apply", "मला खत लागेल का?",
+        "कितनी खाद डालनी है?",
+    ],
+    ("fertilizer_advice", "fertilizer_schedule"): [
+        "Fertilizer schedule", "When should I apply fertilizer next?", "खत वेळापत्रक सांगा",
+    ],
+    ("fertilizer_advice", "video_resources"): [
+        "Show fertilizer videos", "Fertilizer youtube videos", "खताबद्दल व्हिडिओ दाखवा", "How to apply fertilizer video",
+    ],
+    ("pest_risk", None): [
+        "Are there pests in my crop?", "Is there disease risk?", "पिकावर किडीचा धोका आहे का?",
+        "फसल में कीट का खतरा है क्या?",
+    ],
+    ("dashboard_summary", None): [
+        "How is my farm doing overall?", "Farm summary", "माझ्या शेताची एकूण स्थिती सांगा",
+    ],
+    ("dashboard_summary", "crop_status_check"): [
+        "Is my crop ready for harvest?", "When can I harvest?", "पीक कापणीसाठी तयार आहे का?",
+    ],
+    ("dashboard_summary", "yield_info"): [
+        "What is my expected yield?", "How much production will I get?", "माझे उत्पादन किती येईल?",
+    ],
+    ("dashboard_summary", "sugar_content_check"): [
+        "What is the sugar content?", "How sweet is my cane?", "उसात साखर किती आहे?",
+    ],
+    ("dashboard_summary", "stress_check"): [
+        "Is my crop under stress?", "पिकावर ताण आहे का?", "क्या फसल तनाव में है?",
+    ],
+    ("dashboard_summary", "biomass_check"): [
+        "How strong is my crop?", "Crop biomass", "पिकाची ताकद कशी आहे?",
+    ],
+    ("general_explanation", None): [
+        "Hello", "Thank you", "Who are you?", "What can you do?", "Help", "नमस्कार", "धन्यवाद",
+    ],
+}
+
+
+def embeddings_available() -> bool:
+    return INTENT_EMBEDDINGS_ENABLED and importlib.util.find_spec("sentence_transformers") is not None
+
+
+def _build_embedder():
+    """(model, example matrix, labels), or None when disabled / not installed"""
+    if not embeddings_available():
+        return None
+
+    sentence_transformers = timed_import("sentence_transformers")
+    model = sentence_transformers.SentenceTransformer(INTENT_EMBEDDING_MODEL, device="cpu")
+
+    labels, phrases = [], []
+    for label, examples in EXAMPLES.items():
+        for phrase in examples:
+            labels.append(label)
+            phrases.append(phrase)
+
+    matrix = model.encode(phrases, normalize_embeddings=True)
+    return model, matrix, labels
+
+
+embedder_resource = LazyResource("intent_embeddings", _build_embedder)
+
+
+def _classify_embedding(message: str) -> Optional[Dict[str, Any]]:
+    embedder = embedder_resource.get()
+    if embedder is None:
+        return None
+
+    model, matrix, labels = embedder
+    vector = model.encode([message], normalize_embeddings=True)[0]
+    scores = matrix @ vector
+
+    best: Dict[tuple, float] = {}
+    for label, score in zip(labels, scores):
+        if score > best.get(label, -1.0):
+            best[label] = float(score)
+
+    ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+    (label, score), runner_up = ranked[0], ranked[1][1] if len(ranked) > 1 else 0.0
+    intent, query_type = label
+
+    result = {
+        "intent": intent,
+        "entities": extract_entities(message, query_type),
+        "score": round(score, 3),
+        "confident": score >= INTENT_EMBEDDING_THRESHOLD and score - runner_up >= INTENT_EMBEDDING_MARGIN,
+    }
+    if intent == "general_explanation":
+        result["entities"] = {"date": None, "parameter": None, "query_type": None}
+    return result
+
+
+# --------------------------------
+# Entry point and stats
+# --------------------------------
+
+intent_stats = {
+    "messages": 0,
+    "rules": 0,
+    "embedding": 0,
+    "llm": 0,
+    # sent to the LLM because they depend on the conversation history
+    "followups": 0,
+    # sampled fast-path answers re-checked by the LLM
+    "shadow_checked": 0,
+    "shadow_intent_agreed": 0,
+    "shadow_exact_agreed": 0,
+    # low-confidence embedding guesses compared with the LLM answer
+    "guess_checked": 0,
+    "guess_intent_agreed": 0,
+}
+
+
+async def classify_intent(message: str, history: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    {"intent", "entities", "source"} with source "rules" / "embedding" when
+    the fast path is confident; source "llm" (and the best local guess, if
+    any, under "guess") when the LLM has to decide.
+    """
+    intent_stats["messages"] += 1
+
+    if is_followup(message, history):
+        intent_stats["followups"] += 1
+        intent_stats["llm"] += 1
+        return {"source": "llm", "guess": None}
+
+    if INTENT_FAST_PATH_ENABLED and len((message or "").split()) <= INTENT_FAST_PATH_MAX_WORDS:
+        result = classify_rules(message)
+        if result:
+            intent_stats["rules"] += 1
+            return {**result, "source": "rules"}
+
+        guess = None
+        if embeddings_available():
+            try:
+                await embedder_resource.warm()
+                guess = await asyncio.to_thread(_classify_embedding, message)
+            except Exception as e:
+                print(f"[INTENT] Embedding classifier failed: {e}")
+
+        if guess and guess["confident"]:
+            intent_stats["embedding"] += 1
+            return {"intent": guess["intent"], "entities": guess["entities"], "source": "embedding"}
+
+        intent_stats["llm"] += 1
+        return {"source": "llm", "guess": guess}
+
+    intent_stats["llm"] += 1
+    return {"source": "llm", "guess": None}
+
+
+def _agrees(fast: Dict[str, Any], intent: Optional[str], entities: Optional[Dict[str, Any]]):
+    """(same intent, same intent and query_type)"""
+    same_intent = fast.get("intent") == intent
+    fast_type = (fast.get("entities") or {}).get("query_type")
+    llm_type = ((entities or {}).get("query_type") or None)
+    if isinstance(llm_type, str):
+        llm_type = llm_type.strip() or None
+    return same_intent, same_intent and fast_type == llm_type
+
+
+def record_llm_answer(fast: Dict[str, Any], intent: Optional[str], entities: Optional[Dict[str, Any]]):
+    """Compare the LLM's answer with the local guess it overruled"""
+    guess = fast.get("guess")
+    if not guess or not intent:
+        return
+    same_intent, _ = _agrees(guess, intent, entities)
+    intent_stats["guess_checked"] += 1
+    intent_stats["guess_intent_agreed"] += int(same_intent)
+
+
+_shadow_tasks = set()
+
+
+def maybe_shadow_check(fast: Dict[str, Any], ask_llm: Callable[[], Awaitable[Optional[tuple]]]):
+    """
+    For a sample of fast-path answers, ask the LLM in the background
+    (ask_llm() → (intent, entities)) and record whether it agrees.
+    """
+    if INTENT_SHADOW_RATE <= 0 or random.random() >= INTENT_SHADOW_RATE:
+        return
+
+    async def check():
+        try:
+            answer = await ask_llm()
+        except Exception as e:
+            print(f"[INTENT] Shadow check failed: {e}")
+            return
+        if not answer or not answer[0]:
+            return
+        same_intent, exact = _agrees(fast, *answer)
+        intent_stats["shadow_checked"] += 1
+        intent_stats["shadow_intent_agreed"] += int(same_intent)
+        intent_stats["shadow_exact_agreed"] += int(exact)
+        if not same_intent:
+            print(f"[INTENT] Fast path ({fast['source']}) said {fast['intent']}, LLM said {answer[0]}")
+
+    task = asyncio.create_task(check())
+    _shadow_tasks.add(task)
+    task.add_done_callback(_shadow_tasks.discard)
+
+
+def _ratio(part: int, whole: int) -> Optional[float]:
+    return round(part / whole, 3) if whole else None
+
+
+def intent_stats_snapshot() -> Dict[str, Any]:
+    messages = intent_stats["messages"]
+    return {
+        **intent_stats,
+        "fast_path_hit_rate": _ratio(intent_stats["rules"] + intent_stats["embedding"], messages),
+        "shadow_intent_agreement": _ratio(intent_stats["shadow_intent_agreed"], intent_stats["shadow_checked"]),
+        "shadow_exact_agreement": _ratio(intent_stats["shadow_exact_agreed"], intent_stats["shadow_checked"]),
+        "guess_intent_agreement": _ratio(intent_stats["guess_intent_agreed"], intent_stats["guess_checked"]),
+        "embeddings": "loaded" if embedder_resource.loaded else ("available" if embeddings_available() else "off"),
+    }
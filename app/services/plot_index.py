@@ -0,0 +1,142 @@
+# app/services/plot_index.py
+
+"""
+Plot Index
+Keyed view of the public plot catalogue. Rebuilt whenever /plots/public/
+is (re)cached, so per-plot lookups never deserialize or scan the whole
+catalogue:
+- in-memory dict (per worker)
+- plot_index:{id} Redis hash (shared by every worker)
+Ids missing from a fresh catalogue are remembered for PLOT_INDEX_MISS_TTL
+seconds, and a miss rebuilds the index at most once per
+PLOT_INDEX_REBUILD_INTERVAL, so unknown plot ids cannot make every
+request re-read the catalogue.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+from app.memory.redis_manager import redis_manager
+
+PLOT_INDEX_TTL = int(os.getenv("PLOT_INDEX_TTL", 3600))
+PLOT_INDEX_MAXSIZE = int(os.getenv("PLOT_INDEX_MAXSIZE", 10000))
+PLOT_INDEX_MISS_TTL = int(os.getenv("PLOT_INDEX_MISS_TTL", 60))
+PLOT_INDEX_REBUILD_INTERVAL = int(os.getenv("PLOT_INDEX_REBUILD_INTERVAL", 60))
+
+_index: TTLCache = TTLCache(maxsize=PLOT_INDEX_MAXSIZE, ttl=PLOT_INDEX_TTL)
+# ids the latest catalogue does not contain
+_unknown: TTLCache = TTLCache(maxsize=PLOT_INDEX_MAXSIZE, ttl=PLOT_INDEX_MISS_TTL)
+
+_rebuild_task: Optional[asyncio.Task] = None
+_last_rebuild = 0.0
+
+
+def _location(plot: Dict[str, Any]):
+    """(lat, lon): GeoJSON coordinates first, then explicit lat/lon fields"""
+    location = plot.get("location") or {}
+
+    coordinates = location.get("coordinates") or []
+    if len(coordinates) >= 2:
+        return coordinates[1], coordinates[0]
+
+    return location.get("latitude"), location.get("longitude")
+
+
+def index_entry(plot: Dict[str, Any]) -> Dict[str, Any]:
+    lat, lon = _location(plot)
+
+    farms = plot.get("farms") or []
+    farm = farms[0] if farms else {}
+
+    return {
+        "lat": lat,
+        "lon": lon,
+        "has_farm": bool(farms),
+        "plantation_date": farm.get("plantation_date"),
+        "plantation_type": farm.get("plantation_type"),
+        "planting_method": farm.get("planting_method"),
+    }
+
+
+async def build_plot_index(public_plots: Dict[str, Any], ttl: int = PLOT_INDEX_TTL) -> int:
+    """Index every plot of a /plots/public/ payload; returns the plot count"""
+    entries = {}
+    for plot in (public_plots or {}).get("results", []):
+        pid = plot.get("fastapi_plot_id")
+        if pid is not None:
+            entries[str(pid)] = index_entry(plot)
+
+    if not entries:
+        return 0
+
+    await redis_manager.set_plot_index(entries, ttl)
+    _index.update(entries)
+    for pid in entries:
+        _unknown.pop(pid, None)
+
+    print(f"[PLOT INDEX] Indexed {len(entries)} public plots")
+    return len(entries)
+
+
+async def _rebuild_from_catalogue(api) -> bool:
+    """True if the index was rebuilt from a good catalogue"""
+    public_plots = await api.get_public_plots()
+    if "error" in public_plots:
+        return False
+    await build_plot_index(public_plots)
+    return True
+
+
+def _last_rebuild_ok() -> bool:
+    task = _rebuild_task
+    return bool(task and not task.cancelled() and not task.exception() and task.result())
+
+
+async def _rebuild_index(api) -> bool:
+    """
+    Rebuild after a miss, at most once per PLOT_INDEX_REBUILD_INTERVAL;
+    concurrent misses share the running rebuild. Within the interval the
+    outcome of the last rebuild is returned.
+    """
+    global _rebuild_task, _last_rebuild
+
+    if _rebuild_task is None or _rebuild_task.done():
+        if time.monotonic() - _last_rebuild < PLOT_INDEX_REBUILD_INTERVAL:
+            return _last_rebuild_ok()
+        _last_rebuild = time.monotonic()
+        _rebuild_task = asyncio.create_task(_rebuild_from_catalogue(api))
+
+    # shield: a caller that gives up must not cancel the shared rebuild
+    return await asyncio.shield(_rebuild_task)
+
+
+async def get_plot_entry(api, plot_id) -> Optional[Dict[str, Any]]:
+    """
+    Catalogue fields of one plot, or None if the plot is unknown.
+    Memory → Redis hash → rebuild from the public plots payload.
+    """
+    plot_id = str(plot_id)
+
+    if plot_id in _unknown:
+        return None
+
+    entry = _index.get(plot_id)
+    if entry is not None:
+        return entry
+
+    entry = await redis_manager.get_plot_index(plot_id)
+    if entry is not None:
+        _index[plot_id] = entry
+        return entry
+
+    rebuilt = await _rebuild_index(api)
+
+    entry = _index.get(plot_id)
+    # not in a catalogue read within the interval: unknown for a while
+    if entry is None and rebuilt:
+        _unknown[plot_id] = True
+    return entry
@@ -0,0 +1,293 @@
+# app/services/plot_init_service.py
+
+"""
+Plot Initialization Service
+Fetches every upstream source a plot needs and stores the aggregate in Redis
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.memory.redis_manager import redis_manager
+from app.services.api_service import current_rate_budget, get_api_service
+from app.services.plot_index import get_plot_entry
+from app.utils.fanout import run_fanout
+from app.utils.resilience import is_circuit_open_error
+from app.utils.upstream_cache import revalidate
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger("cropeye-chatbot")
+
+# Fan-out tuning
+INIT_MAX_CONCURRENCY = int(os.getenv("INIT_MAX_CONCURRENCY", 8))
+INIT_BACKGROUND_MAX_CONCURRENCY = int(os.getenv("INIT_BACKGROUND_MAX_CONCURRENCY", 4))
+INIT_MAX_ATTEMPTS = int(os.getenv("INIT_MAX_ATTEMPTS", 3))
+INIT_BACKOFF_BASE = float(os.getenv("INIT_BACKOFF_BASE", 0.5))
+INIT_BACKOFF_CAP = float(os.getenv("INIT_BACKOFF_CAP", 8.0))
+
+# Single-flight tuning
+INIT_LOCK_TTL = int(os.getenv("INIT_LOCK_TTL", 600))
+INIT_WAIT_TIMEOUT = float(os.getenv("INIT_WAIT_TIMEOUT", 120))
+
+# Global cap shared by every initialization running in this worker
+_init_semaphore = asyncio.Semaphore(INIT_MAX_CONCURRENCY)
+
+# Budgeted background fan-outs (warm-up, refresh) wait on their token
+# bucket while holding a slot; they get their own cap so that waiting
+# never takes slots away from interactive initializations
+_background_semaphore = asyncio.Semaphore(INIT_BACKGROUND_MAX_CONCURRENCY)
+
+# One initialization per plot, across requests and workers
+_init_flight = SingleFlight("plot_init", lock_ttl=INIT_LOCK_TTL)
+
+
+def build_plot_tasks(api, plot_id: str, lat, lon, today: str) -> Dict[str, Callable[[], Awaitable[Any]]]:
+    """Task factories for every cached key of a plot aggregate"""
+    return {
+        # ---------- SOIL ANALYSIS AGENT ----------
+        "soil_analysis": lambda: api.get_soil_analysis(plot_id, today),
+        "npk_requirements": lambda: api.get_npk_requirements(plot_id, today),
+
+        # ---------- PEST ----------
+        "pest_detection": lambda: api.get_pest_detection(plot_id, today),
+
+        # ---------- IRRIGATION ----------
+        "et": lambda: api.get_evapotranspiration(plot_id),
+        "soil_moisture_timeseries": lambda: api.get_soil_moisture_timeseries(plot_id),
+
+        # ---------- WEATHER ----------
+        "current_weather": lambda: api.get_current_weather(plot_id, lat, lon),
+        "weather_forecast": lambda: api.get_weather_forecast(plot_id, lat, lon),
+
+        # ---------- MAPS ----------
+        "growth_map": lambda: api.get_growth_map(plot_id, today),
+        "soil_moisture_map": lambda: api.get_soil_moisture_map(plot_id, today),
+        "water_uptake_map": lambda: api.get_water_uptake_map(plot_id, today),
+        "pest_map": lambda: api.get_pest_map(plot_id, today),
+
+        # ---------- DASHBOARD ----------
+        "agro": lambda: api.get_agro_stats(plot_id, today),
+        "harvest": lambda: api.get_harvest_status(plot_id),
+        "stress": lambda: api.get_stress_events(plot_id),
+    }
+
+
+# Every key written into the plot aggregate
+PLOT_KEYS = tuple(build_plot_tasks(None, None, None, None, None).keys())
+
+# Refresh cadence per key, matching the APIService cache TTL of its source
+PLOT_KEY_REFRESH_SECONDS = {
+    "soil_analysis": 43200,
+    "npk_requirements": 43200,
+    "pest_detection": 43200,
+    "et": 43200,
+    "soil_moisture_timeseries": 43200,
+    "current_weather": 7200,
+    "weather_forecast": 7200,
+    "growth_map": 43200,
+    "soil_moisture_map": 43200,
+    "water_uptake_map": 43200,
+    "pest_map": 43200,
+    "agro": 3600,
+    "harvest": 3600,
+    "stress": 3600,
+}
+
+
+async def find_plot_location(api, plot_id):
+    """(lat, lon) of a public plot, or (None, None)"""
+    entry = await get_plot_entry(api, plot_id)
+
+    if not entry:
+        return None, None
+
+    return entry.get("lat"), entry.get("lon")
+
+
+def fanout_semaphore() -> asyncio.Semaphore:
+    """Fan-out cap for the current task: background jobs run under a rate budget"""
+    return _background_semaphore if current_rate_budget() is not None else _init_semaphore
+
+
+async def fetch_plot_keys(api, plot_id, lat, lon, keys=None) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch `keys` (default: all) of a plot aggregate concurrently and write
+    each one into Redis as soon as it lands. Returns the per-task report.
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    tasks = build_plot_tasks(api, plot_id, lat, lon, today)
+    if keys is not None:
+        tasks = {k: v for k, v in tasks.items() if k in keys}
+
+    previous = await redis_manager.get_plot_keys(plot_id)
+
+    # publish every source as soon as it lands so /chat can
+    # answer questions whose dependencies are already in
+    async def store_result(name, data, record):
+        # on refresh, a failed fetch must not replace good data
+        if not record["ok"] and previous.get(name, {}).get("ok"):
+            return
+        await redis_manager.set_plot_field(plot_id, name, data)
+        await redis_manager.mark_plot_key(plot_id, name, record["ok"])
+
+    # -------------------------------
+    # CONCURRENT FAN-OUT WITH RETRIES
+    # -------------------------------
+    # the plot aggregate must hold current data: never take stale or
+    # negatively cached getter results here, fanout does its own retries
+    with revalidate():
+        _, report = await run_fanout(
+            tasks,
+            semaphore=fanout_semaphore(),
+            max_attempts=INIT_MAX_ATTEMPTS,
+            backoff_base=INIT_BACKOFF_BASE,
+            backoff_cap=INIT_BACKOFF_CAP,
+            on_result=store_result,
+            # an open breaker fails instantly; retrying it only burns backoff time
+            should_retry=lambda error: not is_circuit_open_error(error),
+        )
+    return report
+
+
+async def run_initialization(plot_id, token):
+
+    api = get_api_service(token)
+
+    try:
+        lat, lon = await find_plot_location(api, plot_id)
+
+        if lat is None or lon is None:
+            await redis_manager.set_plot_status(plot_id, "failed")
+            return {"status": "failed", "error": "Plot location missing"}
+
+        started = datetime.now()
+        report = await fetch_plot_keys(api, plot_id, lat, lon)
+
+        for name, record in report.items():
+            mark = "✅" if record["ok"] else "❌"
+            print(f"{mark} {name} finished in {record['latency_s']:.2f}s "
+                  f"after {record['attempts']} attempt(s)")
+
+        duration = (datetime.now() - started).total_seconds()
+
+        summary = {
+            "started_at": started.isoformat(),
+            "duration_s": round(duration, 3),
+            "tasks": report,
+        }
+        await redis_manager.set_plot_report(plot_id, summary)
+        print(f"\n🎉 ALL API DATA FETCHED FOR PLOT {plot_id} IN {duration:.2f}s "
+              f"AT {datetime.now().strftime('%H:%M:%S')}\n")
+        await redis_manager.set_plot_status(plot_id, "ready")
+
+        return {"status": "ready", **summary}
+
+    except Exception as e:
+        logger.exception("Initialization failed")
+        await redis_manager.set_plot_status(plot_id, "failed")
+        return {"status": "failed", "error": str(e)}
+
+
+# =========================================================
+# SINGLE-FLIGHT JOBS
+# =========================================================
+
+async def _run_job(plot_id, token, job):
+    result = {"status": "failed", "error": "Initialization crashed"}
+    try:
+        result = await run_initialization(plot_id, token)
+        return result
+    finally:
+        job.update({
+            "status": result.get("status"),
+            "finished_at": datetime.now().isoformat(),
+            "error": result.get("error"),
+        })
+        await redis_manager.set_plot_job(plot_id, job)
+
+
+async def start_initialization(plot_id, token) -> Dict[str, Any]:
+    """
+    Launch run_initialization for plot_id unless one is already running,
+    in which case the caller joins it. Returns the job record.
+    """
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "plot_id": plot_id,
+        "status": "running",
+        "started_at": datetime.now().isoformat(),
+        "started_ts": time.time(),
+        "total": len(PLOT_KEYS),
+    }
+
+    task, started = await _init_flight.start(plot_id, lambda: _run_job(plot_id, token, job))
+
+    if started:
+        await redis_manager.set_plot_status(plot_id, "processing")
+        await redis_manager.set_plot_job(plot_id, job)
+        return {**job, "joined": False}
+
+    return {**(await redis_manager.get_plot_job(plot_id) or {}), "joined": True}
+
+
+async def wait_for_initialization(plot_id, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Wait for the in-flight job of plot_id and return its result.
+    Jobs owned by another worker are followed through their Redis job record.
+    """
+    timeout = timeout or INIT_WAIT_TIMEOUT
+
+    task = _init_flight.inflight(plot_id)
+    if task:
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            return {"status": "processing", "error": "Timed out waiting for initialization"}
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = await redis_manager.get_plot_job(plot_id) or {}
+        if job.get("status") != "running" or not await _init_flight.is_locked(plot_id):
+            return {
+                "status": await redis_manager.get_plot_status(plot_id),
+                "report": await redis_manager.get_plot_report(plot_id),
+            }
+        await asyncio.sleep(1)
+
+    return {"status": "processing", "error": "Timed out waiting for initialization"}
+
+
+async def is_initializing(plot_id) -> bool:
+    """True while any worker runs a full initialization for plot_id"""
+    return await _init_flight.is_locked(plot_id)
+
+
+async def get_initialization_progress(plot_id) -> Dict[str, Any]:
+    """Job record plus how many plot keys the job has produced so far"""
+    job = await redis_manager.get_plot_job(plot_id) or {}
+    keys = await redis_manager.get_plot_keys(plot_id)
+    started_ts = job.get("started_ts", 0)
+
+    done = {
+        name: record.get("ok")
+        for name, record in keys.items()
+        if record.get("at", 0) >= started_ts
+    }
+
+    return {
+        "plot_id": plot_id,
+        "status": await redis_manager.get_plot_status(plot_id),
+        "job": job or None,
+        "in_flight": await _init_flight.is_locked(plot_id),
+        "progress": {
+            "completed": len(done),
+            "total": len(PLOT_KEYS),
+            "keys": done,
+            "pending": [k for k in PLOT_KEYS if k not in done],
+        },
+    }
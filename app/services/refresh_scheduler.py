@@ -0,0 +1,151 @@
+# app/services/refresh_scheduler.py
+
+"""
+Background Refresh Scheduler
+Keeps the aggregates of active plots fresh key by key (stale-while-revalidate):
+chat keeps reading the current value while a due key is re-fetched, and
+only that field of plot:{id} is rewritten.
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.memory.redis_manager import redis_manager
+from app.services.api_service import get_api_service, upstream_rate_budget
+from app.services.plot_init_service import (
+    PLOT_KEY_REFRESH_SECONDS,
+    fetch_plot_keys,
+    find_plot_location,
+    is_initializing,
+)
+from app.utils.rate_limit import UpstreamRateBudget
+
+REFRESH_SCHEDULER_ENABLED = os.getenv("REFRESH_SCHEDULER_ENABLED", "true").lower() == "true"
+REFRESH_TICK_SECONDS = int(os.getenv("REFRESH_TICK_SECONDS", 60))
+REFRESH_PARALLELISM = int(os.getenv("REFRESH_PARALLELISM", 2))
+# minimum gap before retrying a key whose last refresh failed
+REFRESH_RETRY_SECONDS = int(os.getenv("REFRESH_RETRY_SECONDS", 600))
+REFRESH_LOCK_TTL = int(os.getenv("REFRESH_LOCK_TTL", 300))
+REFRESH_UPSTREAM_RPS = float(os.getenv("REFRESH_UPSTREAM_RPS", 2))
+REFRESH_UPSTREAM_BURST = int(os.getenv("REFRESH_UPSTREAM_BURST", 4))
+
+_scheduler_task: Optional[asyncio.Task] = None
+
+# (plot_id, key) → monotonic time of the last refresh attempt in this worker
+_last_attempt: Dict[Tuple[str, str], float] = {}
+
+
+async def due_keys(plot_id: str, now: Optional[float] = None) -> List[str]:
+    """Keys of a plot aggregate whose refresh cadence has elapsed"""
+    now = now or time.time()
+    fetched = await redis_manager.get_plot_keys(plot_id)
+    due = []
+
+    for key, every in PLOT_KEY_REFRESH_SECONDS.items():
+        record = fetched.get(key)
+        if record and now - record.get("at", 0) < every:
+            continue
+
+        last = _last_attempt.get((plot_id, key))
+        if last and time.monotonic() - last < min(every, REFRESH_RETRY_SECONDS):
+            continue
+
+        due.append(key)
+
+    return due
+
+
+async def refresh_plot(plot_id: str) -> List[str]:
+    """Refresh the due keys of one plot; returns the keys attempted"""
+
+    if await redis_manager.get_plot_status(plot_id) != "ready" or await is_initializing(plot_id):
+        return []
+
+    lock_name = f"lock:plot_refresh:{plot_id}"
+    token = await redis_manager.acquire_lock(lock_name, REFRESH_LOCK_TTL)
+    if not token:
+        return []
+
+    try:
+        keys = await due_keys(plot_id)
+        if not keys:
+            return []
+
+        api = get_api_service(None)
+        lat, lon = await find_plot_location(api, plot_id)
+        if lat is None or lon is None:
+            return []
+
+        for key in keys:
+            _last_attempt[(plot_id, key)] = time.monotonic()
+
+        report = await fetch_plot_keys(api, plot_id, lat, lon, keys)
+
+        for key, record in report.items():
+            mark = "🔄" if record["ok"] else "⚠️"
+            print(f"{mark} refresh {plot_id}.{key} in {record['latency_s']:.2f}s")
+
+        return keys
+
+    finally:
+        await redis_manager.release_lock(lock_name, token)
+
+
+async def run_refresh_cycle() -> Dict[str, List[str]]:
+    """One pass over every active plot"""
+    semaphore = asyncio.Semaphore(REFRESH_PARALLELISM)
+    # plots chatted about or initialized within PLOT_ACTIVITY_TTL
+    plot_ids = await redis_manager.get_active_plot_ids()
+
+    async def guarded(plot_id):
+        async with semaphore:
+            return await refresh_plot(plot_id)
+
+    budget = UpstreamRateBudget(REFRESH_UPSTREAM_RPS, REFRESH_UPSTREAM_BURST)
+    with upstream_rate_budget(budget):
+        results = await asyncio.gather(
+            *(guarded(pid) for pid in plot_ids),
+            return_exceptions=True
+        )
+
+    refreshed = {}
+    for plot_id, result in zip(plot_ids, results):
+        if isinstance(result, Exception):
+            print(f"❌ refresh {plot_id} failed: {result}")
+        elif result:
+            refreshed[plot_id] = result
+
+    return refreshed
+
+
+async def _scheduler_loop():
+    print(f"⏱️ Refresh scheduler started (tick={REFRESH_TICK_SECONDS}s)")
+    while True:
+        try:
+            await run_refresh_cycle()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print("❌ Refresh cycle failed:", str(e))
+
+        await asyncio.sleep(REFRESH_TICK_SECONDS)
+
+
+def start_scheduler():
+    global _scheduler_task
+    if _scheduler_task and not _scheduler_task.done():
+        return
+    _scheduler_task = asyncio.create_task(_scheduler_loop())
+
+
+async def stop_scheduler():
+    global _scheduler_task
+    if _scheduler_task:
+        _scheduler_task.cancel()
+        try:
+            await _scheduler_task
+        except asyncio.CancelledError:
+            pass
+        _scheduler_task = None
@@ -3,14 +3,15 @@ CropEye VoiceBot: Speech-to-Text (STT) and Text-to-Speech (TTS).
 Treats transcribed text exactly as typed input; no modification of intent or meaning.
 """
 
+import asyncio
 import base64
 import io
 import os
 import tempfile
 import subprocess
-from gtts import gTTS
 from typing import Optional, Tuple
-from faster_whisper import WhisperModel
+
+from app.utils.lazy import LazyResource, timed_import
 
 # Language code mapping: chatbot user_language -> gTTS lang code ..
 USER_LANG_TO_GTTS = {
@@ -26,6 +27,21 @@ def debug(msg: str):
     print(f"[VOICE DEBUG] {msg}")
 
 
+# faster_whisper (ctranslate2) and gtts are only imported by workers that
+# actually handle voice; the Whisper model is loaded once and reused
+def _build_whisper_model():
+    faster_whisper = timed_import("faster_whisper")
+    return faster_whisper.WhisperModel(
+        os.getenv("WHISPER_MODEL", "base"),
+        device=os.getenv("WHISPER_DEVICE", "cpu"),
+        compute_type=os.getenv("WHISPER_COMPUTE_TYPE", "int8"),
+    )
+
+
+whisper_resource = LazyResource("whisper_model", _build_whisper_model)
+gtts_resource = LazyResource("gtts", lambda: timed_import("gtts").gTTS)
+
+
 def get_tts_lang(user_language: Optional[str]) -> str:
     """Resolve gTTS language code from chatbot user_language. Default to English."""
     if not user_language:
@@ -104,11 +120,7 @@ def transcribe_audio(audio_bytes: bytes, content_type: Optional[str] = None) ->
         # Convert to Whisper-safe WAV
         convert_to_wav(raw_path, wav_path)
 
-        model = WhisperModel(
-            os.getenv("WHISPER_MODEL", "base"),
-            device=os.getenv("WHISPER_DEVICE", "cpu"),
-            compute_type=os.getenv("WHISPER_COMPUTE_TYPE", "int8"),
-        )
+        model = whisper_resource.get()
 
         segments, info = model.transcribe(wav_path, beam_size=5)
 
@@ -150,6 +162,12 @@ def transcribe_audio_base64(audio_base64: str, content_type: Optional[str] = Non
         print("❌ Base64 decode error:", e)
         return "", None
 
+
+async def atranscribe_audio_base64(audio_base64: str, content_type: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """transcribe_audio_base64 for request handlers: model load, ffmpeg and Whisper run in worker threads"""
+    await whisper_resource.warm()
+    return await asyncio.to_thread(transcribe_audio_base64, audio_base64, content_type)
+
 # -----------------------------
 # Text → Speech (gTTS)
 # -----------------------------
@@ -167,12 +185,18 @@ def text_to_speech(text: str, lang: str = "en") -> Optional[bytes]:
     try:
         debug(f"Generating speech (lang={lang})")
         buf = io.BytesIO()
-        tts = gTTS(text=text.strip(), lang=lang, slow=False)
+        tts = gtts_resource.get()(text=text.strip(), lang=lang, slow=False)
         tts.write_to_fp(buf)
 
         debug("✅ TTS successful")
         return buf.getvalue()
 
-    except Exception:
+    except Exception as e:
         debug(f"❌ TTS failed: {e}")
         return None
+
+
+async def atext_to_speech(text: str, lang: str = "en") -> Optional[bytes]:
+    """text_to_speech for request handlers: gTTS import and synthesis run in worker threads"""
+    await gtts_resource.warm()
+    return await asyncio.to_thread(text_to_speech, text, lang)
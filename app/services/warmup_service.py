@@ -0,0 +1,130 @@
+# app/services/warmup_service.py
+
+"""
+Bulk Warm-up Service
+Initializes many public plots ahead of farmers' first visit,
+with bounded parallelism and a per-upstream rate budget
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.memory.redis_manager import redis_manager
+from app.services.api_service import get_api_service, upstream_rate_budget
+from app.services.plot_init_service import start_initialization, wait_for_initialization
+from app.utils.rate_limit import UpstreamRateBudget
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "false").lower() == "true"
+WARMUP_PARALLELISM = int(os.getenv("WARMUP_PARALLELISM", 3))
+WARMUP_LIMIT = int(os.getenv("WARMUP_LIMIT", 0)) or None
+# requests per second allowed against each upstream host during warm-up
+WARMUP_UPSTREAM_RPS = float(os.getenv("WARMUP_UPSTREAM_RPS", 2))
+WARMUP_UPSTREAM_BURST = int(os.getenv("WARMUP_UPSTREAM_BURST", 4))
+
+_warmup_task: Optional[asyncio.Task] = None
+
+
+def order_plot_ids(plot_ids: List[str], recent: List[str]) -> List[str]:
+    """Recently active plots first (in activity order), then the rest in catalogue order"""
+    known = set(plot_ids)
+    head = [pid for pid in recent if pid in known]
+    seen = set(head)
+    return head + [pid for pid in plot_ids if pid not in seen]
+
+
+async def _warm_one(plot_id: str, semaphore: asyncio.Semaphore, force: bool) -> Dict[str, Any]:
+    async with semaphore:
+        if not force and await redis_manager.get_plot_status(plot_id) == "ready":
+            return {"plot_id": plot_id, "status": "skipped"}
+
+        started = time.monotonic()
+        await start_initialization(plot_id, None)
+        result = await wait_for_initialization(plot_id)
+
+        return {
+            "plot_id": plot_id,
+            "status": result.get("status"),
+            "duration_s": round(time.monotonic() - started, 3),
+        }
+
+
+async def warm_up_plots(
+    limit: Optional[int] = None,
+    parallelism: Optional[int] = None,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """Walk the public plot list and initialize plots, most recently active first"""
+
+    limit = limit or WARMUP_LIMIT
+    parallelism = parallelism or WARMUP_PARALLELISM
+
+    api = get_api_service(None)
+    plots = await api.get_public_plots()
+
+    if "error" in plots:
+        return {"status": "failed", "error": plots["error"]}
+
+    plot_ids = [
+        str(p.get("fastapi_plot_id"))
+        for p in plots.get("results", [])
+        if p.get("fastapi_plot_id")
+    ]
+    ordered = order_plot_ids(plot_ids, await redis_manager.get_recent_plot_ids())
+    if limit:
+        ordered = ordered[:limit]
+
+    print(f"\n🔥 Warming up {len(ordered)} plots (parallelism={parallelism})\n")
+
+    started = datetime.now()
+    semaphore = asyncio.Semaphore(parallelism)
+    budget = UpstreamRateBudget(WARMUP_UPSTREAM_RPS, WARMUP_UPSTREAM_BURST)
+
+    # initialization tasks inherit the budget through the context and
+    # fan out under their own cap, off the interactive init slots
+    with upstream_rate_budget(budget):
+        results = await asyncio.gather(
+            *(_warm_one(pid, semaphore, force) for pid in ordered),
+            return_exceptions=True
+        )
+
+    plots_report = [
+        r if isinstance(r, dict) else {"plot_id": pid, "status": "failed", "error": str(r)}
+        for pid, r in zip(ordered, results)
+    ]
+
+    summary = {
+        "status": "done",
+        "started_at": started.isoformat(),
+        "duration_s": round((datetime.now() - started).total_seconds(), 3),
+        "total": len(plots_report),
+        "ready": sum(1 for r in plots_report if r.get("status") == "ready"),
+        "skipped": sum(1 for r in plots_report if r.get("status") == "skipped"),
+        "failed": sum(1 for r in plots_report if r.get("status") not in ("ready", "skipped")),
+        "plots": plots_report,
+    }
+    await redis_manager.set("warmup:last", summary, ttl=86400)
+
+    print(f"✅ Warm-up finished: {summary['ready']} ready, "
+          f"{summary['skipped']} skipped, {summary['failed']} failed")
+    return summary
+
+
+def start_warm_up(**kwargs) -> bool:
+    """Run warm_up_plots in background; False if one is already running in this worker"""
+    global _warmup_task
+
+    if _warmup_task and not _warmup_task.done():
+        return False
+
+    _warmup_task = asyncio.create_task(warm_up_plots(**kwargs))
+    return True
+
+
+async def get_warm_up_status() -> Dict[str, Any]:
+    return {
+        "running": bool(_warmup_task and not _warmup_task.done()),
+        "last": await redis_manager.get("warmup:last"),
+    }
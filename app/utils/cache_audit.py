@@ -0,0 +1,125 @@
+# app/utils/cache_audit.py
+
+"""
+Opt-in audit trail of cache writes.
+Disabled by default. When CACHE_AUDIT_ENABLED=true, every write is
+- kept in a bounded in-memory ring buffer (for /debug/cache-audit)
+- appended as one JSON line to a size-rotated file by a background thread,
+  so the Redis write path never touches the disk
+The write path only builds the key / size / ttl record; JSON encoding
+(and the value itself, with CACHE_AUDIT_VALUES) happens on the listener
+thread.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+CACHE_AUDIT_ENABLED = os.getenv("CACHE_AUDIT_ENABLED", "false").lower() == "true"
+CACHE_AUDIT_FILE = os.getenv("CACHE_AUDIT_FILE", "cache_audit.jsonl")
+CACHE_AUDIT_MAX_BYTES = int(os.getenv("CACHE_AUDIT_MAX_BYTES", 5 * 1024 * 1024))
+CACHE_AUDIT_BACKUPS = int(os.getenv("CACHE_AUDIT_BACKUPS", 3))
+CACHE_AUDIT_RING_SIZE = int(os.getenv("CACHE_AUDIT_RING_SIZE", 200))
+# values can be multi-megabyte map payloads; only log them when asked
+CACHE_AUDIT_VALUES = os.getenv("CACHE_AUDIT_VALUES", "false").lower() == "true"
+
+_ring: deque = deque(maxlen=CACHE_AUDIT_RING_SIZE)
+_audit_logger: Optional[logging.Logger] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_atexit_registered = False
+
+
+class _AuditFormatter(logging.Formatter):
+    """One JSON line per write, encoded on the listener thread"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = dict(getattr(record, "audit", None) or {})
+        if hasattr(record, "value"):
+            entry["value"] = record.value
+        try:
+            return json.dumps(entry, default=str)
+        except Exception as e:
+            # e.g. the value changed while it was being encoded
+            entry.pop("value", None)
+            entry["value_error"] = str(e)
+            return json.dumps(entry, default=str)
+
+
+def _get_audit_logger() -> logging.Logger:
+    """Queue-backed logger; the file handler runs on the listener thread"""
+    global _audit_logger, _listener, _queue_handler, _atexit_registered
+
+    if _audit_logger is None:
+        file_handler = logging.handlers.RotatingFileHandler(
+            CACHE_AUDIT_FILE,
+            maxBytes=CACHE_AUDIT_MAX_BYTES,
+            backupCount=CACHE_AUDIT_BACKUPS,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(_AuditFormatter())
+
+        records: queue.Queue = queue.Queue(-1)
+        _listener = logging.handlers.QueueListener(records, file_handler)
+        _listener.start()
+        if not _atexit_registered:
+            atexit.register(stop_cache_audit)
+            _atexit_registered = True
+
+        _queue_handler = logging.handlers.QueueHandler(records)
+        _audit_logger = logging.getLogger("cache-audit")
+        _audit_logger.setLevel(logging.INFO)
+        _audit_logger.propagate = False
+        _audit_logger.addHandler(_queue_handler)
+
+    return _audit_logger
+
+
+def record_cache_write(key: str, value: Any, ttl: Optional[int], size: int):
+    """Record one cache write; a no-op unless CACHE_AUDIT_ENABLED"""
+    if not CACHE_AUDIT_ENABLED:
+        return
+
+    record = {
+        "key": key,
+        "ttl": ttl,
+        "bytes": size,
+        "time": datetime.now().isoformat(),
+    }
+    _ring.append(record)
+
+    extra = {"audit": record}
+    if CACHE_AUDIT_VALUES:
+        extra["value"] = value
+
+    try:
+        _get_audit_logger().info("cache write", extra=extra)
+    except Exception:
+        pass
+
+
+def recent_cache_writes() -> List[Dict[str, Any]]:
+    return list(_ring)
+
+
+def stop_cache_audit():
+    """Flush and stop the listener; a later write starts a new one"""
+    global _audit_logger, _listener, _queue_handler
+
+    if _audit_logger and _queue_handler:
+        # nothing may keep filling a queue no thread drains
+        _audit_logger.removeHandler(_queue_handler)
+    _audit_logger = None
+    _queue_handler = None
+
+    if _listener:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
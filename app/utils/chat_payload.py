@@ -0,0 +1,38 @@
+# app/utils/chat_payload.py
+
+"""
+What /chat, /voice/chat and /chat/stream send back for a graph result.
+Lean by default: no graph context (cached_data holds every upstream
+payload of the plot) and an analysis without geometries or long lists.
+?debug=true / X-Debug: true returns both in full.
+"""
+
+from typing import Any, Dict, Optional
+
+from app.utils.prompt_budget import shrink
+
+
+def wants_debug(debug: bool, x_debug: Optional[str]) -> bool:
+    return debug or (x_debug or "").lower() in ("1", "true", "yes")
+
+
+def chat_payload(result: Dict[str, Any], debug: bool = False) -> Dict[str, Any]:
+    payload = {
+        "language": result.get("user_language"),
+        "intent": result.get("intent"),
+        "entities": result.get("entities"),
+        "analysis": result.get("analysis") if debug else shrink(result.get("analysis")),
+        "response": result.get("final_response"),
+    }
+    if debug:
+        context = dict(result.get("context") or {})
+        context.pop("auth_token", None)
+        payload["context"] = context
+    return payload
+
+
+def stream_metadata(result: Dict[str, Any], debug: bool = False) -> Dict[str, Any]:
+    """/chat/stream metadata event: the chat payload before the answer exists"""
+    payload = chat_payload(result, debug)
+    payload.pop("response", None)
+    return payload
@@ -0,0 +1,144 @@
+# app/utils/fanout.py
+
+"""
+Concurrent fan-out executor.
+Runs a set of named async tasks concurrently under a concurrency cap,
+retrying each task independently with jittered exponential backoff.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Called as on_result(name, data, record) the moment each task settles
+ResultCallback = Callable[[str, Any, Dict[str, Any]], Awaitable[None]]
+# Called with the error message of a failed attempt; False stops retrying
+RetryPredicate = Callable[[str], bool]
+
+
+class TaskFailed(Exception):
+    """Raised when a task returns an error payload instead of data"""
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2^attempt))"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+async def _run_one(
+    name: str,
+    factory: Callable[[], Awaitable[Any]],
+    semaphore: asyncio.Semaphore,
+    max_attempts: int,
+    backoff_base: float,
+    backoff_cap: float,
+    on_result: Optional[ResultCallback] = None,
+    should_retry: Optional[RetryPredicate] = None,
+) -> Tuple[Any, Dict[str, Any]]:
+
+    data, record = await _attempt(
+        factory, semaphore, max_attempts, backoff_base, backoff_cap, should_retry
+    )
+
+    if on_result:
+        try:
+            await on_result(name, data, record)
+        except Exception as e:
+            print(f"[FANOUT] on_result failed for {name}: {e}")
+
+    return data, record
+
+
+async def _attempt(
+    factory: Callable[[], Awaitable[Any]],
+    semaphore: asyncio.Semaphore,
+    max_attempts: int,
+    backoff_base: float,
+    backoff_cap: float,
+    should_retry: Optional[RetryPredicate] = None,
+) -> Tuple[Any, Dict[str, Any]]:
+
+    started = time.monotonic()
+    error = None
+    attempts = 0
+
+    for attempt in range(max_attempts):
+        attempts = attempt + 1
+        try:
+            # hold a slot only while the upstream call is in flight,
+            # never while sleeping between retries
+            async with semaphore:
+                data = await factory()
+
+            # treat API error response as failure
+            if isinstance(data, dict) and data.get("error"):
+                raise TaskFailed(data["error"])
+
+            latency = time.monotonic() - started
+            return data, {
+                "ok": True,
+                "attempts": attempt + 1,
+                "latency_s": round(latency, 3),
+                "error": None,
+            }
+
+        except Exception as e:
+            error = str(e)
+
+            if should_retry and not should_retry(error):
+                break
+
+            if attempt < max_attempts - 1:
+                await asyncio.sleep(backoff_delay(attempt, backoff_base, backoff_cap))
+
+    latency = time.monotonic() - started
+    return {"error": error}, {
+        "ok": False,
+        "attempts": attempts,
+        "latency_s": round(latency, 3),
+        "error": error,
+    }
+
+
+async def run_fanout(
+    tasks: Dict[str, Callable[[], Awaitable[Any]]],
+    semaphore: Optional[asyncio.Semaphore] = None,
+    max_concurrency: int = 8,
+    max_attempts: int = 3,
+    backoff_base: float = 0.5,
+    backoff_cap: float = 8.0,
+    on_result: Optional[ResultCallback] = None,
+    should_retry: Optional[RetryPredicate] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Run all task factories concurrently.
+
+    Returns (results, report):
+    - results[name] → task data, or {"error": ...} after the last failed attempt
+    - report[name]  → {"ok", "attempts", "latency_s", "error"}
+
+    Pass a shared `semaphore` to cap concurrency across several fan-outs,
+    otherwise a private one of size `max_concurrency` is used.
+    `on_result` is awaited as soon as each individual task settles.
+    `should_retry(error)` returning False gives up on a task early.
+    """
+    semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+
+    names = list(tasks.keys())
+    outcomes = await asyncio.gather(*(
+        _run_one(
+            name, tasks[name], semaphore,
+            max_attempts, backoff_base, backoff_cap, on_result, should_retry
+        )
+        for name in names
+    ))
+
+    results = {}
+    report = {}
+
+    for name, (data, record) in zip(names, outcomes):
+        results[name] = data
+        report[name] = record
+
+    return results, report
@@ -0,0 +1,131 @@
+# app/utils/hedging.py
+
+"""
+Hedged requests for idempotent upstream reads.
+If the first attempt has not answered within the endpoint's recent p95
+latency, a second identical attempt is started and the first one to
+finish wins; the other is cancelled. A global budget caps hedges to a
+fraction of all hedgeable calls so a slow upstream is never doubled.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+
+class LatencyTracker:
+    """Recent successful latencies per endpoint"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, endpoint: str, latency: float):
+        samples = self._samples.get(endpoint)
+        if samples is None:
+            samples = self._samples[endpoint] = deque(maxlen=self.window)
+        samples.append(latency)
+
+    def percentile(self, endpoint: str, pct: float = 0.95) -> Optional[float]:
+        """None until enough samples were seen to trust the estimate"""
+        samples = self._samples.get(endpoint)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            endpoint: {
+                "samples": len(samples),
+                "p95_s": round(self.percentile(endpoint) or 0, 3) or None,
+            }
+            for endpoint, samples in self._samples.items()
+        }
+
+
+class HedgeBudget:
+    """Hedges allowed: at most `ratio` of calls, plus a small burst"""
+
+    def __init__(self, ratio: float = 0.1, burst: int = 5):
+        self.ratio = ratio
+        self.burst = burst
+        self.calls = 0
+        self.hedges = 0
+
+    def record_call(self):
+        self.calls += 1
+
+    def try_spend(self) -> bool:
+        if self.hedges >= self.ratio * self.calls + self.burst:
+            return False
+        self.hedges += 1
+        return True
+
+
+class Hedger:
+
+    def __init__(
+        self,
+        tracker: LatencyTracker,
+        budget: HedgeBudget,
+        min_delay: float = 0.05
+    ):
+        self.tracker = tracker
+        self.budget = budget
+        self.min_delay = min_delay
+        self.stats = {"calls": 0, "hedged": 0, "hedge_won": 0, "over_budget": 0}
+
+    async def _timed(self, endpoint: str, send: Callable[[], Awaitable[Any]]):
+        started = time.monotonic()
+        result = await send()
+        self.tracker.record(endpoint, time.monotonic() - started)
+        return result
+
+    async def run(self, endpoint: str, send: Callable[[], Awaitable[Any]]):
+        """Await send(), hedging it once if it is slower than the endpoint's p95"""
+        self.stats["calls"] += 1
+        self.budget.record_call()
+
+        delay = self.tracker.percentile(endpoint)
+        if delay is None:
+            return await self._timed(endpoint, send)
+
+        primary = asyncio.create_task(self._timed(endpoint, send))
+        hedge = None
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=max(self.min_delay, delay))
+            if done:
+                return primary.result()
+
+            if not self.budget.try_spend():
+                self.stats["over_budget"] += 1
+                return await primary
+
+            self.stats["hedged"] += 1
+            hedge = asyncio.create_task(self._timed(endpoint, send))
+            pending = {primary, hedge}
+
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                winners = [task for task in done if task.exception() is None]
+                if winners:
+                    if hedge in winners:
+                        self.stats["hedge_won"] += 1
+                    return winners[0].result()
+
+                # a failed attempt only loses if the other one can still answer
+                if not pending:
+                    return done.pop().result()
+        finally:
+            # the loser (or everything, if our caller gave up) is cancelled
+            for task in (primary, hedge):
+                if task and not task.done():
+                    task.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "latency": self.tracker.snapshot()}
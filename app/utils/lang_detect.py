@@ -1,13 +1,27 @@
-from lingua import Language, LanguageDetectorBuilder
+from app.utils.lazy import LazyResource, timed_import
 
-languages = [
-    Language.ENGLISH,
-    Language.HINDI,
-    Language.MARATHI
-]
 
-detector = LanguageDetectorBuilder.from_languages(*languages).build()
+def _build_detector():
+    lingua = timed_import("lingua")
+    languages = [
+        lingua.Language.ENGLISH,
+        lingua.Language.HINDI,
+        lingua.Language.MARATHI
+    ]
+    return lingua.LanguageDetectorBuilder.from_languages(*languages).build()
+
+
+detector_resource = LazyResource("language_detector", _build_detector)
+
 
 def detect_lang(text: str) -> str:
-    lang = detector.detect_language_of(text)
-    return lang.iso_code_639_1.name.lower() if lang else "en"
\ No newline at end of file
+    """Builds the detector on first use: call off the event loop (or use adetect_lang)"""
+    lang = detector_resource.get().detect_language_of(text)
+    return lang.iso_code_639_1.name.lower() if lang else "en"
+
+
+async def adetect_lang(text: str) -> str:
+    # the detector is built (or its warm-up awaited) in a worker thread,
+    # never on the event loop
+    await detector_resource.warm()
+    return detect_lang(text)
@@ -0,0 +1,71 @@
+# app/utils/lazy.py
+
+"""
+Lazy loading of heavy dependencies.
+Voice, LLM, graph and vector-store stacks are imported and initialized
+on first use (or by a background warm-up) instead of at worker boot.
+Every lazy import and initialization is timed for the import-cost report.
+"""
+
+import asyncio
+import importlib
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# module/resource name → {"kind", "seconds", "at"}
+_costs: Dict[str, Dict[str, Any]] = {}
+
+
+def record_cost(name: str, kind: str, seconds: float):
+    _costs[name] = {"kind": kind, "seconds": round(seconds, 3), "at": time.time()}
+
+
+def timed_import(module_name: str):
+    """importlib.import_module, recording how long the first import took"""
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    if module_name not in _costs:
+        record_cost(module_name, "import", time.perf_counter() - started)
+    return module
+
+
+def import_cost_report() -> List[Dict[str, Any]]:
+    """Recorded costs, most expensive first"""
+    return sorted(
+        ({"name": name, **cost} for name, cost in _costs.items()),
+        key=lambda item: item["seconds"],
+        reverse=True,
+    )
+
+
+class LazyResource(Generic[T]):
+    """Built by `factory` on first get(); thread-safe, built at most once"""
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> T:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    started = time.perf_counter()
+                    self._value = self._factory()
+                    self._loaded = True
+                    record_cost(self.name, "resource", time.perf_counter() - started)
+        return self._value
+
+    async def warm(self):
+        """Build in a worker thread so the event loop keeps serving"""
+        if not self._loaded:
+            await asyncio.to_thread(self.get)
@@ -0,0 +1,112 @@
+# app/utils/prompt_budget.py
+
+"""
+What the response prompt is allowed to carry.
+- context: only whitelisted scalar farm fields; cached_data (every upstream
+  payload loaded for the plot, GeoJSON maps included), credentials and
+  bookkeeping keys never reach the LLM
+- analysis: compact JSON, shrunk to PROMPT_ANALYSIS_TOKEN_BUDGET by
+  dropping geometries, then shortening lists and long strings
+Prompt sizes are recorded per intent.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+PROMPT_ANALYSIS_TOKEN_BUDGET = int(os.getenv("PROMPT_ANALYSIS_TOKEN_BUDGET", 3000))
+PROMPT_TOKEN_WARNING = int(os.getenv("PROMPT_TOKEN_WARNING", 8000))
+
+# farm context fields an answer can refer to
+PROMPT_CONTEXT_FIELDS = (
+    "plot_id",
+    "plantation_date",
+    "plantation_type",
+    "planting_method",
+    "crop_stage",
+    "days_since_plantation",
+    "kc",
+)
+
+# coordinates carry no meaning for the answer and dominate map payloads
+GEOMETRY_KEYS = {"geometry", "coordinates", "bbox", "geojson", "polygon", "boundary"}
+
+# list length, string length; each step is tried until the analysis fits
+_SHRINK_STEPS = ((50, 1000), (20, 500), (10, 200), (5, 100), (3, 60))
+
+
+def compact_json(data: Any) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token); no tokenizer round trip"""
+    return len(text) // 4 + 1
+
+
+def project_context(context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Whitelisted scalar fields of the graph context"""
+    context = context or {}
+    return {
+        field: context[field]
+        for field in PROMPT_CONTEXT_FIELDS
+        if isinstance(context.get(field), (str, int, float, bool))
+    }
+
+
+def shrink(data: Any, max_items: Optional[int] = 20, max_chars: Optional[int] = 500) -> Any:
+    """Copy without geometry keys, with lists and strings cut to the given sizes"""
+    if isinstance(data, dict):
+        return {
+            k: shrink(v, max_items, max_chars)
+            for k, v in data.items()
+            if k not in GEOMETRY_KEYS
+        }
+    if isinstance(data, list):
+        items = data if max_items is None else data[:max_items]
+        shrunk = [shrink(item, max_items, max_chars) for item in items]
+        if max_items is not None and len(data) > max_items:
+            shrunk.append(f"... {len(data) - max_items} more")
+        return shrunk
+    if isinstance(data, str) and max_chars is not None and len(data) > max_chars:
+        return data[:max_chars] + "..."
+    return data
+
+
+def fit_analysis(analysis: Any, max_tokens: int = PROMPT_ANALYSIS_TOKEN_BUDGET):
+    """(compact JSON of the analysis within max_tokens, trimmed?)"""
+    text = compact_json(analysis)
+    if estimate_tokens(text) <= max_tokens:
+        return text, False
+
+    for max_items, max_chars in ((None, None),) + _SHRINK_STEPS:
+        text = compact_json(shrink(analysis, max_items, max_chars))
+        if estimate_tokens(text) <= max_tokens:
+            return text, True
+
+    # still too large: hard cut, the LLM is told the data is partial
+    return text[: max_tokens * 4] + "...(truncated)", True
+
+
+prompt_stats: Dict[str, Dict[str, Any]] = {}
+
+
+def record_prompt(intent: Optional[str], prompt: str, trimmed: bool):
+    tokens = estimate_tokens(prompt)
+    stats = prompt_stats.setdefault(intent or "none", {
+        "prompts": 0, "tokens_total": 0, "tokens_max": 0, "trimmed": 0,
+    })
+    stats["prompts"] += 1
+    stats["tokens_total"] += tokens
+    stats["tokens_max"] = max(stats["tokens_max"], tokens)
+    stats["trimmed"] += int(trimmed)
+
+    if tokens > PROMPT_TOKEN_WARNING:
+        print(f"[PROMPT] {intent}: ~{tokens} tokens exceeds {PROMPT_TOKEN_WARNING}")
+
+
+def prompt_stats_snapshot() -> Dict[str, Dict[str, Any]]:
+    return {
+        intent: {**stats, "tokens_avg": stats["tokens_total"] // stats["prompts"]}
+        for intent, stats in sorted(prompt_stats.items())
+    }
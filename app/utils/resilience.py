@@ -0,0 +1,208 @@
+# app/utils/resilience.py
+
+"""
+Circuit breakers and bulkheads per upstream host.
+- breaker: after `failure_threshold` consecutive failures the host is
+  skipped (calls fail immediately) for `recovery_timeout` seconds, then a
+  few probe calls decide whether it closes again
+- bulkhead: caps concurrent calls to one host, so a slow host holds at
+  most that many connections and waiting callers give up quickly
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Upstream skipped because its breaker is open"""
+
+    MARKER = "circuit open"
+
+    def __init__(self, host: str):
+        super().__init__(f"{self.MARKER} for {host}")
+
+
+class BulkheadFullError(httpx.HTTPError):
+    """No free call slot for the upstream within the wait budget"""
+
+    def __init__(self, host: str):
+        super().__init__(f"bulkhead full for {host}")
+
+
+def is_circuit_open_error(error: Any) -> bool:
+    """True for a CircuitOpenError or an error payload/message built from one"""
+    return CircuitOpenError.MARKER in str(error or "")
+
+
+class CircuitBreaker:
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probes = 0
+        self._probing_since: Optional[float] = None
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+
+        if self.state == OPEN:
+            if now - self.opened_at < self.recovery_timeout:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self._probes = 0
+            self._probing_since = now
+
+        if self.state == HALF_OPEN:
+            # a probe that never reported back (cancelled, rejected by the
+            # bulkhead) must not keep the breaker half-open forever
+            if now - self._probing_since >= self.recovery_timeout:
+                self._probes = 0
+                self._probing_since = now
+            if self._probes >= self.half_open_max_calls:
+                self.rejected += 1
+                return False
+            self._probes += 1
+
+        return True
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+            "retry_in_s": round(retry_in, 1) if retry_in is not None else None,
+        }
+
+
+class Bulkhead:
+
+    def __init__(self, max_concurrent: int = 10, max_wait: float = 5.0):
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self.active = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def acquire(self) -> bool:
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        self.active += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "max_concurrent": self.max_concurrent,
+            "rejected": self.rejected,
+        }
+
+
+class UpstreamGuard:
+    """One breaker and one bulkhead for every upstream host"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        max_concurrent: int = 10,
+        max_wait: float = 5.0
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._bulkheads: Dict[str, Bulkhead] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlsplit(url).netloc
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(
+                self.failure_threshold, self.recovery_timeout
+            )
+        return breaker
+
+    def _bulkhead(self, host: str) -> Bulkhead:
+        bulkhead = self._bulkheads.get(host)
+        if bulkhead is None:
+            bulkhead = self._bulkheads[host] = Bulkhead(self.max_concurrent, self.max_wait)
+        return bulkhead
+
+    @asynccontextmanager
+    async def guard(self, url: str):
+        """
+        Wraps one upstream call. Raises CircuitOpenError / BulkheadFullError
+        without calling the host; the body reports the outcome through the
+        yielded breaker (transport errors are recorded automatically).
+        """
+        host = self.host_of(url)
+        breaker = self._breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(host)
+
+        bulkhead = self._bulkhead(host)
+        if not await bulkhead.acquire():
+            raise BulkheadFullError(host)
+
+        try:
+            yield breaker
+        except (httpx.TransportError, asyncio.TimeoutError):
+            breaker.record_failure()
+            raise
+        finally:
+            bulkhead.release()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            host: {
+                "breaker": self._breaker(host).snapshot(),
+                "bulkhead": self._bulkhead(host).snapshot(),
+            }
+            for host in sorted(set(self._breakers) | set(self._bulkheads))
+        }
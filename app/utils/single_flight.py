@@ -0,0 +1,67 @@
+# app/utils/single_flight.py
+
+"""
+Single-flight execution keyed on a string.
+Concurrent callers for the same key share one running job:
+- inside a worker through an in-process task table
+- across workers through a Redis lock (SET NX EX)
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.memory.redis_manager import redis_manager
+
+
+class SingleFlight:
+
+    def __init__(self, namespace: str, lock_ttl: int = 600):
+        self.namespace = namespace
+        self.lock_ttl = lock_ttl
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # serializes check-then-lock so two local callers cannot both miss
+        self._start_lock = asyncio.Lock()
+
+    def _lock_name(self, key: str) -> str:
+        return f"lock:{self.namespace}:{key}"
+
+    def inflight(self, key: str) -> Optional[asyncio.Task]:
+        """Running task for key in this worker, if any"""
+        task = self._tasks.get(key)
+        return task if task and not task.done() else None
+
+    async def is_locked(self, key: str) -> bool:
+        """True while any worker holds the job for key"""
+        return await redis_manager.exists(self._lock_name(key))
+
+    async def start(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Optional[asyncio.Task], bool]:
+        """
+        Returns (task, started).
+        - (task, True)   → a new job was launched here
+        - (task, False)  → joined the job already running in this worker
+        - (None, False)  → another worker owns the job
+        """
+        async with self._start_lock:
+            task = self.inflight(key)
+            if task:
+                return task, False
+
+            lock_name = self._lock_name(key)
+            token = await redis_manager.acquire_lock(lock_name, self.lock_ttl)
+            if not token:
+                return None, False
+
+            async def runner():
+                try:
+                    return await factory()
+                finally:
+                    await redis_manager.release_lock(lock_name, token)
+                    self._tasks.pop(key, None)
+
+            task = asyncio.create_task(runner())
+            self._tasks[key] = task
+            return task, True
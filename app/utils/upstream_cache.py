@@ -0,0 +1,305 @@
+# app/utils/upstream_cache.py
+
+"""
+Redis caching for upstream getters (stale-while-revalidate).
+
+Each cached value is stored in an envelope with a soft expiry:
+- fresh (age < ttl)                 → served from cache
+- stale (ttl <= age < ttl + stale)  → served from cache, refreshed in the background
+- gone  (Redis TTL elapsed)         → caller waits for the upstream
+Error payloads ({"error": ...}) are cached for `error_ttl` only, so a
+failing endpoint is not hit on every request, and never replace a value
+that can still be served. Concurrent misses for the same key share one
+upstream call.
+
+Getters marked `conditional` (GET endpoints only) keep the upstream's
+ETag / Last-Modified next to the cached value and revalidate with
+If-None-Match / If-Modified-Since; a 304 renews the entry without
+downloading or parsing the body again.
+"""
+
+import asyncio
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from app.memory.redis_manager import redis_manager
+
+UPSTREAM_ERROR_TTL = int(os.getenv("UPSTREAM_ERROR_TTL", 60))
+# how long a satellite acquisition stays reusable once stored
+ACQUISITION_TTL = int(os.getenv("ACQUISITION_TTL", 7 * 86400))
+
+_ENVELOPE = "__swr__"
+_POINTER = "__latest__"
+
+# key → running upstream call, shared by every caller in this worker
+_inflight: Dict[str, asyncio.Task] = {}
+
+# Background jobs (init, refresh) have their own retries and want current
+# data: inside `revalidate()` stale and error entries are never served.
+_revalidate: ContextVar[bool] = ContextVar("upstream_cache_revalidate", default=False)
+
+
+@contextmanager
+def revalidate():
+    reset_token = _revalidate.set(True)
+    try:
+        yield
+    finally:
+        _revalidate.reset(reset_token)
+
+
+def today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+class NotModified(Exception):
+    """The upstream answered 304 to a conditional request"""
+
+
+CONDITIONAL_METHODS = ("GET", "HEAD")
+
+
+class ConditionalExchange:
+    """Validators sent with one upstream call, and the ones it returned"""
+
+    def __init__(self, validators: Optional[Dict[str, str]] = None):
+        self.validators = validators or {}
+        self.received: Dict[str, str] = {}
+
+    def request_headers(self, method: str = "GET") -> Dict[str, str]:
+        # on other methods the validators are preconditions (RFC 9110):
+        # the upstream answers 412, never 304
+        if method.upper() not in CONDITIONAL_METHODS:
+            return {}
+        headers = {}
+        if self.validators.get("etag"):
+            headers["If-None-Match"] = self.validators["etag"]
+        if self.validators.get("last_modified"):
+            headers["If-Modified-Since"] = self.validators["last_modified"]
+        return headers
+
+    def record(self, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag:
+            self.received["etag"] = etag
+        if last_modified:
+            self.received["last_modified"] = last_modified
+
+
+# Set by the decorator around a conditional getter; read by APIService._request
+_exchange: ContextVar[Optional[ConditionalExchange]] = ContextVar("conditional_exchange", default=None)
+
+conditional_stats = {"sent": 0, "not_modified": 0, "precondition_failed": 0}
+
+
+def current_exchange() -> Optional[ConditionalExchange]:
+    return _exchange.get()
+
+
+def _is_error(data: Any) -> bool:
+    return isinstance(data, dict) and bool(data.get("error"))
+
+
+def _is_pointer(data: Any) -> bool:
+    return isinstance(data, dict) and bool(data.get(_POINTER))
+
+
+def _wrap(data: Any, ttl: int, validators: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    entry = {_ENVELOPE: 1, "data": data, "fresh_until": time.time() + ttl}
+    if validators:
+        entry["validators"] = validators
+    return entry
+
+
+def _unwrap(entry: Any):
+    """(data, fresh) for an envelope; values written before it count as fresh"""
+    if isinstance(entry, dict) and entry.get(_ENVELOPE):
+        return entry.get("data"), time.time() < entry.get("fresh_until", 0)
+    return entry, True
+
+
+def _validators(entry: Any) -> Optional[Dict[str, str]]:
+    if isinstance(entry, dict) and entry.get(_ENVELOPE):
+        return entry.get("validators")
+    return None
+
+
+def _forget(cache_key: str, task: asyncio.Task):
+    if _inflight.get(cache_key) is task:
+        _inflight.pop(cache_key, None)
+    # background refreshes have no awaiting caller to surface errors to
+    if not task.cancelled() and task.exception():
+        print(f"[UPSTREAM CACHE] Refresh of {cache_key} failed: {task.exception()}")
+
+
+def cached_upstream(
+    key: Union[str, Callable[[Dict[str, Any]], str]],
+    ttl: int,
+    stale_ttl: Optional[int] = None,
+    error_ttl: int = UPSTREAM_ERROR_TTL,
+    date_args: tuple = (),
+    cache_if: Optional[Callable[[Any], bool]] = None,
+    annotate: Optional[Callable[[Any, str, bool], Any]] = None,
+    latest: Optional[str] = None,
+    acquired_at: Optional[Callable[[Any], Optional[str]]] = None,
+    conditional: bool = False,
+):
+    """
+    Decorate an async getter that calls the upstream and returns its data
+    (or an {"error": ...} payload).
+
+    - key:         str.format template over the call arguments, or a callable
+                   receiving the arguments dict
+    - ttl:         seconds a value is fresh; it stays servable (stale) for
+                   another `stale_ttl` seconds (default: ttl)
+    - date_args:   arguments that default to today's date when None
+    - cache_if:    only cache successful data this predicate accepts
+    - annotate:    annotate(data, key, from_cache) → value returned to caller
+    - latest:      template of a date-invariant key for products whose data
+                   only changes with a new acquisition (satellite scenes).
+                   Calls for today go through "{latest}:latest", a pointer to
+                   the value stored under "{latest}@{acquisition date}", so the
+                   cache survives midnight and an older scene never replaces
+                   a newer one. Calls for other dates use `key` as usual.
+    - acquired_at: acquisition date reported in the data (default: request date)
+    - conditional: revalidate with the upstream's ETag / Last-Modified
+                   (GET getters only; other methods are sent unconditionally)
+    """
+    stale_ttl = ttl if stale_ttl is None else stale_ttl
+
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            for name in date_args:
+                if bound.arguments.get(name) is None:
+                    bound.arguments[name] = today()
+
+            arguments = {k: v for k, v in bound.arguments.items() if k != "self"}
+
+            base = None
+            if latest and all(arguments.get(name) == today() for name in date_args):
+                base = latest.format(**arguments)
+
+            if base:
+                cache_key = f"{base}:latest"
+            else:
+                cache_key = key.format(**arguments) if isinstance(key, str) else key(arguments)
+
+            def result(data, from_cache):
+                return annotate(data, cache_key, from_cache) if annotate else data
+
+            # envelope behind the value served from cache, if any
+            cached = {"entry": None}
+
+            async def read():
+                """(data, fresh) of the cache entry; (None, False) on a miss"""
+                entry = await redis_manager.get(cache_key)
+                if entry is None:
+                    return None, False
+
+                data, fresh = _unwrap(entry)
+                if base and _is_pointer(data):
+                    data = await redis_manager.get(data["key"])
+                    if data is None:
+                        return None, False
+
+                cached["entry"] = entry
+                return data, fresh
+
+            async def renew(data, validators):
+                """304: the cached value is current again; only its envelope is rewritten"""
+                conditional_stats["not_modified"] += 1
+                print(f"[UPSTREAM CACHE] {cache_key} not modified, renewed")
+                kept, _ = _unwrap(cached["entry"])
+                await redis_manager.set(cache_key, _wrap(kept, ttl, validators), ttl=ttl + stale_ttl)
+                return data
+
+            async def store(data, validators=None):
+                """Cache successful data; returns the value to serve"""
+                if not base:
+                    await redis_manager.set(cache_key, _wrap(data, ttl, validators), ttl=ttl + stale_ttl)
+                    return data
+
+                acquired = (acquired_at(data) if acquired_at else None) or arguments[date_args[0]]
+
+                current, _ = _unwrap(await redis_manager.get(cache_key))
+                if _is_pointer(current) and current["acquired"] > acquired:
+                    newer = await redis_manager.get(current["key"])
+                    if newer is not None:
+                        print(f"[UPSTREAM CACHE] {cache_key}: keeping scene {current['acquired']} over {acquired}")
+                        await redis_manager.set(cache_key, _wrap(current, ttl), ttl=ttl + stale_ttl)
+                        return newer
+
+                data_key = f"{base}@{acquired}"
+                pointer = {_POINTER: 1, "acquired": acquired, "key": data_key}
+                await redis_manager.set(data_key, data, ttl=ACQUISITION_TTL)
+                await redis_manager.set(cache_key, _wrap(pointer, ttl, validators), ttl=ttl + stale_ttl)
+                return data
+
+            async def load(previous=None):
+                exchange = None
+                if conditional:
+                    exchange = ConditionalExchange(_validators(cached["entry"]) if previous is not None else None)
+                    if exchange.validators:
+                        conditional_stats["sent"] += 1
+
+                reset_token = _exchange.set(exchange)
+                try:
+                    data = await fn(*bound.args, **bound.kwargs)
+                except NotModified:
+                    return await renew(previous, exchange.received or exchange.validators)
+                finally:
+                    _exchange.reset(reset_token)
+
+                if _is_error(data):
+                    # keep serving a previous good value rather than the error
+                    previous, _ = await read()
+                    if previous is None or _is_error(previous):
+                        await redis_manager.set(cache_key, _wrap(data, error_ttl), ttl=error_ttl)
+                    return data
+
+                if cache_if is None or cache_if(data):
+                    return await store(data, exchange.received if exchange else None)
+
+                return data
+
+            def shared_load(previous=None) -> asyncio.Task:
+                task = _inflight.get(cache_key)
+                if task is None or task.done():
+                    task = asyncio.create_task(load(previous))
+                    _inflight[cache_key] = task
+                    task.add_done_callback(functools.partial(_forget, cache_key))
+                return task
+
+            data, fresh = await read()
+            if data is not None:
+                strict = _revalidate.get()
+
+                if fresh and not (strict and _is_error(data)):
+                    return result(data, True)
+
+                if not fresh and not strict and not _is_error(data):
+                    print(f"[UPSTREAM CACHE] Serving stale {cache_key}, refreshing in background")
+                    shared_load(data)
+                    return result(data, True)
+
+            # a stale value is revalidated conditionally (never an error payload)
+            previous = data if data is not None and not _is_error(data) else None
+
+            # shield: a caller that gives up must not cancel the shared call
+            return result(await asyncio.shield(shared_load(previous)), False)
+
+        return wrapper
+
+    return decorator
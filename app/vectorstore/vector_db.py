@@ -1,16 +1,25 @@
 # vector_db.py
-import chromadb
-import google.generativeai as genai
-from chromadb.config import Settings
 from dotenv import load_dotenv
 import os
 
+from app.utils.lazy import LazyResource, timed_import
+
 load_dotenv()
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+
+# chromadb and google.generativeai are heavy; both load on first FAQ access
+
+def _genai():
+    genai = timed_import("google.generativeai")
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai
+
+
+genai_resource = LazyResource("google_generativeai", _genai)
 
 
 def gemini_embedding(texts):
+    genai = genai_resource.get()
     embeddings = []
     for text in texts:
         result = genai.embed_content(
@@ -21,23 +30,30 @@ def gemini_embedding(texts):
     return embeddings
 
 
-# 🔹 ChromaDB setup (persistent)
-client = chromadb.Client(
-    Settings(
-        persist_directory="./chroma_db",
-        anonymized_telemetry=False
+def _build_collection():
+    chromadb = timed_import("chromadb")
+    settings = timed_import("chromadb.config")
+
+    # 🔹 ChromaDB setup (persistent)
+    client = chromadb.Client(
+        settings.Settings(
+            persist_directory="./chroma_db",
+            anonymized_telemetry=False
+        )
     )
-)
 
-collection = client.get_or_create_collection(
-    name="irrigation_faq_embed",
-    embedding_function=gemini_embedding
-)
+    return client.get_or_create_collection(
+        name="irrigation_faq_embed",
+        embedding_function=gemini_embedding
+    )
+
+
+collection_resource = LazyResource("faq_collection", _build_collection)
 
 
 # 🔹 Add documents (run once)
 def add_faqs(faq_list):
-    collection.add(
+    collection_resource.get().add(
         documents=faq_list,
         ids=[f"faq_{i}" for i in range(len(faq_list))]
     )
@@ -46,7 +62,7 @@ def add_faqs(faq_list):
 
 # 🔹 Search FAQ
 def search_faq(question):
-    result = collection.query(
+    result = collection_resource.get().query(
         query_texts=[question],
         n_results=1
     )
@@ -0,0 +1,4 @@
+import os
+
+# app.memory.redis_manager refuses to import without it; no test connects
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
@@ -0,0 +1,74 @@
+import json
+import logging
+import logging.handlers
+import threading
+
+import pytest
+
+from app.utils import cache_audit
+
+
+class _Value:
+    """Remembers which thread serialised it"""
+
+    def __init__(self):
+        self.encoded_on = None
+
+    def __str__(self):
+        self.encoded_on = threading.current_thread()
+        return "big-map-payload"
+
+
+@pytest.fixture
+def audit(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_audit, "CACHE_AUDIT_ENABLED", True)
+    monkeypatch.setattr(cache_audit, "CACHE_AUDIT_FILE", str(tmp_path / "audit.jsonl"))
+    yield tmp_path / "audit.jsonl"
+    cache_audit.stop_cache_audit()
+
+
+def _queue_handlers():
+    return [h for h in logging.getLogger("cache-audit").handlers if isinstance(h, logging.handlers.QueueHandler)]
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_value_is_serialised_on_the_listener_thread(audit, monkeypatch):
+    monkeypatch.setattr(cache_audit, "CACHE_AUDIT_VALUES", True)
+    value = _Value()
+
+    cache_audit.record_cache_write("plot:1", value, 60, 1234)
+    cache_audit.stop_cache_audit()
+
+    assert value.encoded_on is not None
+    assert value.encoded_on is not threading.current_thread()
+    assert _lines(audit)[0] == {
+        **cache_audit.recent_cache_writes()[-1], "value": "big-map-payload",
+    }
+
+
+def test_only_key_size_and_ttl_are_logged_by_default(audit):
+    value = _Value()
+
+    cache_audit.record_cache_write("plot:2", value, 30, 10)
+    cache_audit.stop_cache_audit()
+
+    line = _lines(audit)[0]
+    assert line["key"] == "plot:2" and line["ttl"] == 30 and line["bytes"] == 10
+    assert "value" not in line
+    assert value.encoded_on is None
+
+
+def test_stop_removes_the_queue_handler_and_later_writes_are_kept(audit):
+    cache_audit.record_cache_write("a", None, 1, 1)
+    cache_audit.stop_cache_audit()
+
+    assert not _queue_handlers()
+
+    cache_audit.record_cache_write("b", None, 1, 1)
+    cache_audit.stop_cache_audit()
+
+    assert [line["key"] for line in _lines(audit)] == ["a", "b"]
+    assert not _queue_handlers()
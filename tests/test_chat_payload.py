@@ -0,0 +1,49 @@
+import json
+
+from app.utils.chat_payload import chat_payload, stream_metadata
+
+
+def _map_result():
+    feature = {
+        "type": "Feature",
+        "geometry": {"type": "Polygon", "coordinates": [[[73.1, 18.2]] * 500]},
+        "properties": {"class": "dry", "area_pct": 12.5},
+    }
+    return {
+        "user_language": "en",
+        "intent": "map_view",
+        "entities": {"query_type": "soil_moisture_map"},
+        "analysis": {"map": {"soil_moisture": {"type": "FeatureCollection", "features": [feature] * 100}}},
+        "context": {"plot_id": "P1", "auth_token": "secret", "cached_data": {"growth_map": {"x": 1}}},
+        "final_response": "Your field is mostly moist.",
+    }
+
+
+def test_stream_metadata_has_no_geometry_by_default():
+    metadata = stream_metadata(_map_result())
+    text = json.dumps(metadata)
+
+    assert metadata["intent"] == "map_view"
+    assert "geometry" not in text
+    assert "coordinates" not in text
+    assert "context" not in metadata
+    assert "response" not in metadata
+    features = metadata["analysis"]["map"]["soil_moisture"]["features"]
+    assert features[0]["properties"] == {"class": "dry", "area_pct": 12.5}
+
+
+def test_stream_metadata_debug_keeps_full_analysis():
+    metadata = stream_metadata(_map_result(), debug=True)
+
+    assert "geometry" in json.dumps(metadata["analysis"])
+    assert len(metadata["analysis"]["map"]["soil_moisture"]["features"]) == 100
+    assert metadata["context"]["cached_data"]
+    assert "auth_token" not in metadata["context"]
+
+
+def test_chat_payload_is_lean_by_default():
+    payload = chat_payload(_map_result())
+
+    assert payload["response"] == "Your field is mostly moist."
+    assert "context" not in payload
+    assert "geometry" not in json.dumps(payload)
@@ -0,0 +1,76 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.api_service import APIService
+from app.utils import upstream_cache
+from app.utils.upstream_cache import ConditionalExchange, NotModified
+
+
+class _Recorder:
+    """Stands in for APIService._send: replies with the queued statuses"""
+
+    def __init__(self, *statuses, etag=None):
+        self.statuses = list(statuses)
+        self.etag = etag
+        self.calls = []
+
+    async def __call__(self, method, url, **kwargs):
+        self.calls.append({"method": method, "headers": dict(kwargs.get("headers") or {})})
+        headers = {"ETag": self.etag} if self.etag else {}
+        return httpx.Response(self.statuses.pop(0), headers=headers, json={"ok": True},
+                              request=httpx.Request(method, url))
+
+
+def _request(send, method, exchange):
+    service = APIService()
+    service._send = send
+
+    async def call():
+        token = upstream_cache._exchange.set(exchange)
+        try:
+            return await service._request(method, "https://example.test/x", headers={"Accept": "application/json"})
+        finally:
+            upstream_cache._exchange.reset(token)
+
+    return asyncio.run(call())
+
+
+def test_post_is_sent_without_validators():
+    send = _Recorder(200)
+    exchange = ConditionalExchange({"etag": '"v1"', "last_modified": "Tue, 01 Jul 2025 00:00:00 GMT"})
+
+    response = _request(send, "POST", exchange)
+
+    assert response.status_code == 200
+    headers = send.calls[0]["headers"]
+    assert "If-None-Match" not in headers
+    assert "If-Modified-Since" not in headers
+    assert headers["Accept"] == "application/json"
+
+
+def test_get_sends_validators_and_raises_not_modified_on_304():
+    send = _Recorder(304)
+    exchange = ConditionalExchange({"etag": '"v1"'})
+
+    with pytest.raises(NotModified):
+        _request(send, "GET", exchange)
+
+    assert send.calls[0]["headers"]["If-None-Match"] == '"v1"'
+
+
+def test_412_drops_validators_and_retries_unconditionally():
+    send = _Recorder(412, 200, etag='"v2"')
+    exchange = ConditionalExchange({"etag": '"v1"'})
+    failed_before = upstream_cache.conditional_stats["precondition_failed"]
+
+    response = _request(send, "GET", exchange)
+
+    assert response.status_code == 200
+    assert len(send.calls) == 2
+    assert send.calls[0]["headers"]["If-None-Match"] == '"v1"'
+    assert "If-None-Match" not in send.calls[1]["headers"]
+    assert exchange.validators == {}
+    assert exchange.received == {"etag": '"v2"'}
+    assert upstream_cache.conditional_stats["precondition_failed"] == failed_before + 1
@@ -0,0 +1,27 @@
+import asyncio
+
+from app.services import plot_init_service
+from app.services.api_service import upstream_rate_budget
+from app.utils.rate_limit import UpstreamRateBudget
+
+
+def test_interactive_init_uses_the_shared_cap():
+    assert plot_init_service.fanout_semaphore() is plot_init_service._init_semaphore
+
+
+def test_budgeted_fanout_runs_off_the_interactive_slots():
+    with upstream_rate_budget(UpstreamRateBudget(1, 1)):
+        assert plot_init_service.fanout_semaphore() is plot_init_service._background_semaphore
+
+
+def test_budget_reaches_spawned_init_tasks():
+    async def pick():
+        await asyncio.sleep(0)
+        return plot_init_service.fanout_semaphore()
+
+    async def spawn():
+        with upstream_rate_budget(UpstreamRateBudget(1, 1)):
+            task = asyncio.create_task(pick())
+        return await task
+
+    assert asyncio.run(spawn()) is plot_init_service._background_semaphore
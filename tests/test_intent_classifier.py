@@ -0,0 +1,36 @@
+import asyncio
+
+from app.services.intent_classifier import classify_intent, classify_rules, is_followup
+
+HISTORY = [
+    {"role": "user", "message": "Should I irrigate today?", "intent": "irrigation_advice"},
+    {"role": "assistant", "message": "Yes, give light irrigation today."},
+]
+
+
+def test_routine_messages_are_classified_by_rules():
+    assert classify_rules("show soil moisture map")["entities"]["query_type"] == "soil_moisture_map"
+    assert classify_rules("उद्या पाऊस पडेल का?")["intent"] == "weather_forecast"
+    assert classify_rules("मला खत लागेल का?")["intent"] == "fertilizer_advice"
+
+
+def test_fast_path_answers_without_history():
+    result = asyncio.run(classify_intent("and for next week water plan?"))
+
+    assert result["source"] == "rules"
+    assert result["intent"] == "irrigation_schedule"
+
+
+def test_followups_with_history_go_to_the_llm():
+    for message in ("and for next week water plan?", "weather", "what about that?", "आणि उद्या?", "मग पाऊस?"):
+        assert is_followup(message, HISTORY), message
+        assert asyncio.run(classify_intent(message, HISTORY))["source"] == "llm", message
+
+
+def test_standalone_questions_keep_the_fast_path_with_history():
+    message = "Will it rain in my village tomorrow?"
+
+    assert not is_followup(message, HISTORY)
+    assert asyncio.run(classify_intent(message, HISTORY))["source"] == "rules"
+    assert not is_followup("thanks", HISTORY)
+
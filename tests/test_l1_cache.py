@@ -0,0 +1,38 @@
+from app.memory.l1_cache import L1_ENTRY_OVERHEAD, L1Cache
+
+
+def _cache(**kwargs):
+    cache = L1Cache(**kwargs)
+    cache.active = True
+    return cache
+
+
+def test_oversized_values_are_left_to_redis():
+    cache = _cache(max_item_bytes=100)
+    cache.store("plot:1#small", {"v": 1}, 10)
+    cache.store("plot:1#growth_map", {"features": []}, 101)
+
+    assert cache.lookup("plot:1#small") == (True, {"v": 1})
+    assert cache.lookup("plot:1#growth_map") == (False, None)
+    assert cache.stats()["oversized"] == 1
+
+
+def test_oversized_write_drops_the_previous_value():
+    cache = _cache(max_item_bytes=100)
+    cache.store("plot:1#growth_map", {"old": True}, 50)
+    cache.store("plot:1#growth_map", {"new": True}, 500)
+
+    assert cache.lookup("plot:1#growth_map") == (False, None)
+
+
+def test_total_size_is_bounded_in_bytes():
+    entry = 1000 + L1_ENTRY_OVERHEAD
+    cache = _cache(max_bytes=3 * entry, max_item_bytes=1000)
+    for i in range(5):
+        cache.store(f"k{i}", i, 1000)
+
+    stats = cache.stats()
+    assert stats["size"] == 3
+    assert stats["bytes"] <= 3 * entry
+    assert cache.lookup("k0") == (False, None)
+    assert cache.lookup("k4") == (True, 4)
@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+from app.utils import lang_detect
+from app.utils.lazy import LazyResource
+
+
+class _Language:
+    class iso_code_639_1:
+        name = "MR"
+
+
+class _SlowDetector:
+    def detect_language_of(self, text):
+        return _Language()
+
+
+def _slow_build():
+    time.sleep(0.3)
+    return _SlowDetector()
+
+
+def test_adetect_lang_builds_detector_off_the_event_loop(monkeypatch):
+    monkeypatch.setattr(lang_detect, "detector_resource", LazyResource("language_detector", _slow_build))
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        lang = await lang_detect.adetect_lang("पाऊस पडेल का?")
+        task.cancel()
+        return lang, ticks
+
+    lang, ticks = asyncio.run(scenario())
+
+    assert lang == "mr"
+    # the loop kept running while the detector was being built
+    assert ticks >= 10
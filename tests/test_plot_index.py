@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from app.services import plot_index
+
+
+class _Api:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+
+    async def get_public_plots(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.payload
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    async def no_entry(plot_id):
+        return None
+
+    async def store(entries, ttl=None):
+        return None
+
+    monkeypatch.setattr(plot_index.redis_manager, "get_plot_index", no_entry)
+    monkeypatch.setattr(plot_index.redis_manager, "set_plot_index", store)
+    monkeypatch.setattr(plot_index, "_rebuild_task", None)
+    monkeypatch.setattr(plot_index, "_last_rebuild", 0.0)
+    plot_index._index.clear()
+    plot_index._unknown.clear()
+
+
+def _catalogue():
+    return {"results": [{"fastapi_plot_id": "P1", "location": {"coordinates": [73.1, 18.2]}, "farms": []}]}
+
+
+def test_unknown_plot_ids_do_not_refetch_the_catalogue():
+    api = _Api(_catalogue())
+
+    async def scenario():
+        first = await asyncio.gather(*(plot_index.get_plot_entry(api, "nope") for _ in range(10)))
+        again = await plot_index.get_plot_entry(api, "nope")
+        other = await plot_index.get_plot_entry(api, "also-missing")
+        return first, again, other
+
+    first, again, other = asyncio.run(scenario())
+
+    assert first == [None] * 10
+    assert again is None and other is None
+    # concurrent misses share one rebuild; later misses reuse it
+    assert api.calls == 1
+    assert "nope" in plot_index._unknown
+    assert "also-missing" in plot_index._unknown
+
+
+def test_known_plot_is_found_after_one_rebuild():
+    api = _Api(_catalogue())
+
+    entry = asyncio.run(plot_index.get_plot_entry(api, "P1"))
+
+    assert entry["lat"] == 18.2 and entry["lon"] == 73.1
+    assert api.calls == 1
+
+
+def test_failed_catalogue_does_not_mark_plots_unknown():
+    api = _Api({"error": "upstream down"})
+
+    async def scenario():
+        return [await plot_index.get_plot_entry(api, "P1") for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [None, None, None]
+    assert api.calls == 1
+    assert "P1" not in plot_index._unknown
@@ -0,0 +1,108 @@
+import asyncio
+
+import redis
+
+from app.memory.redis_manager import AsyncRedisManager
+
+
+class _WrongTypePipeline:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    async def execute(self):
+        raise redis.ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+
+
+def test_legacy_field_write_does_not_mutate_the_cached_aggregate(monkeypatch):
+    manager = AsyncRedisManager()
+    shared = {"soil_analysis": {"ph": 7}}
+    written = {}
+
+    async def get(key):
+        return shared
+
+    async def set_plot(plot_id, data, ttl=86400):
+        written.update(data)
+
+    monkeypatch.setattr(manager.client, "pipeline", lambda **kwargs: _WrongTypePipeline())
+    monkeypatch.setattr(manager, "get", get)
+    monkeypatch.setattr(manager, "set_plot", set_plot)
+
+    asyncio.run(manager.set_plot_field("1", "stress", {"events": []}))
+
+    assert shared == {"soil_analysis": {"ph": 7}}
+    assert written == {"soil_analysis": {"ph": 7}, "stress": {"events": []}}
+
+
+class _RecordingClient:
+    def __init__(self):
+        self.published = []
+
+    def ping(self):
+        return True
+
+    def pipeline(self, **kwargs):
+        return self
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    def execute(self):
+        return []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def test_sync_writes_invalidate_worker_l1(monkeypatch):
+    from app.memory import redis_manager as module
+
+    client = _RecordingClient()
+    monkeypatch.setattr(module.redis, "from_url", lambda *args, **kwargs: client)
+    manager = module.RedisManager()
+
+    manager.set("plot_status:1", "ready")
+    manager.set_plot("1", {"stress": {"events": []}})
+    manager.set_plot_field("1", "harvest", {"ready": False})
+    manager.delete("plot_report:1")
+
+    keys = [message.partition("|")[2] for channel, message in client.published]
+    assert {channel for channel, _ in client.published} == {module.L1_INVALIDATION_CHANNEL}
+    assert keys == ["plot_status:1", "plot:1", "plot:1#harvest", "plot_report:1"]
+
+
+def test_plot_activity_outlives_chat_memory(monkeypatch):
+    from app.memory import redis_manager as module
+
+    manager = AsyncRedisManager()
+    calls = []
+
+    class _Pipeline(_WrongTypePipeline):
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: calls.append((name, args))
+
+        async def execute(self):
+            return []
+
+    async def zrevrangebyscore(key, high, low, **kwargs):
+        calls.append(("zrevrangebyscore", (key, high, low, kwargs)))
+        return [b"7", b"3"]
+
+    monkeypatch.setattr(manager.client, "pipeline", lambda **kwargs: _Pipeline())
+    monkeypatch.setattr(manager.client, "zrevrangebyscore", zrevrangebyscore)
+
+    asyncio.run(manager.touch_plot_activity(7))
+    assert asyncio.run(manager.get_active_plot_ids(limit=2)) == ["7", "3"]
+
+    zadd = next(args for name, args in calls if name == "zadd")
+    expire = next(args for name, args in calls if name == "expire")
+    assert zadd[0] == "plot_activity" and list(zadd[1]) == ["7"]
+    assert expire == ("plot_activity", module.PLOT_ACTIVITY_TTL)
+    assert module.PLOT_ACTIVITY_TTL > module.CHAT_MEMORY_TTL
+    assert calls[-1][1][3] == {"start": 0, "num": 2}
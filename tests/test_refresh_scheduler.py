@@ -0,0 +1,26 @@
+import asyncio
+
+from app.services import refresh_scheduler
+from app.services.plot_init_service import PLOT_KEY_REFRESH_SECONDS
+from app.memory.redis_manager import PLOT_ACTIVITY_TTL
+
+
+def test_activity_window_covers_every_refresh_cadence():
+    assert PLOT_ACTIVITY_TTL >= max(PLOT_KEY_REFRESH_SECONDS.values())
+
+
+def test_refresh_cycle_covers_plots_active_without_chat_memory(monkeypatch):
+    async def active(limit=None):
+        return ["7"]
+
+    async def no_chat_memory(limit=None):
+        return []
+
+    async def refresh_plot(plot_id):
+        return ["agro"]
+
+    monkeypatch.setattr(refresh_scheduler.redis_manager, "get_active_plot_ids", active)
+    monkeypatch.setattr(refresh_scheduler.redis_manager, "get_recent_plot_ids", no_chat_memory)
+    monkeypatch.setattr(refresh_scheduler, "refresh_plot", refresh_plot)
+
+    assert asyncio.run(refresh_scheduler.run_refresh_cycle()) == {"7": ["agro"]}
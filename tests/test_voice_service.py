@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from app.services import voice_service
+from app.utils.lazy import LazyResource
+
+
+class _SlowTTS:
+    def __init__(self, text, lang, slow):
+        time.sleep(0.1)
+        self.text = text
+
+    def write_to_fp(self, fp):
+        fp.write(self.text.encode())
+
+
+def _slow_build():
+    time.sleep(0.2)
+    return _SlowTTS
+
+
+def _ticks_during(coro_factory):
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await coro_factory()
+        task.cancel()
+        return result, ticks
+
+    return asyncio.run(scenario())
+
+
+def test_tts_runs_off_the_event_loop(monkeypatch):
+    monkeypatch.setattr(voice_service, "gtts_resource", LazyResource("gtts", _slow_build))
+
+    audio, ticks = _ticks_during(lambda: voice_service.atext_to_speech("पाऊस", "mr"))
+
+    assert audio == "पाऊस".encode()
+    assert ticks >= 15
+
+
+def test_stt_runs_off_the_event_loop(monkeypatch):
+    def slow_transcribe(audio_base64, content_type=None):
+        time.sleep(0.2)
+        return "hello", "en"
+
+    monkeypatch.setattr(voice_service, "whisper_resource", LazyResource("whisper_model", lambda: None))
+    monkeypatch.setattr(voice_service, "transcribe_audio_base64", slow_transcribe)
+
+    result, ticks = _ticks_during(lambda: voice_service.atranscribe_audio_base64("aGVsbG8=", "audio/webm"))
+
+    assert result == ("hello", "en")
+    assert ticks >= 10